@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Read Pool Concurrency Benchmark
+
+Builds a temporary 1,000-country world with src/db.Database and runs the
+same read-only "commands" (a country's balance, then its structures list)
+from 1, 2, 4 and 8 threads at once, first with a single reader connection
+(every read queued on one connection, as with the old shared cursor), then
+with one pooled reader per thread.
+
+Every result is checked against the expected rows: the benchmark exits with
+code 1 if a command got another command's rows or failed. SQLite releases
+the GIL while it steps through a query, so the pooled readers scale with the
+number of CPU cores; on a single core both runs stay flat.
+
+Usage: python3 bench_read_pool.py [--commands 2000] [--threads 1,2,4,8]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+COUNTRIES = 1000
+REGIONS = 20000
+STRUCTURES = 50000
+
+
+def create_world(path):
+    """Schema plus a synthetic world, written before Database opens the file."""
+    from migrations import migrate
+
+    rnd = random.Random(42)
+    conn = sqlite3.connect(path)
+    migrate(conn)
+    cur = conn.cursor()
+    cur.executemany(
+        "INSERT INTO Countries (country_id, role_id, name, public_channel_id, secret_channel_id) VALUES (?, ?, ?, ?, ?)",
+        [(i, str(10**17 + i), f"Pays {i}", str(i), str(10**6 + i)) for i in range(1, COUNTRIES + 1)],
+    )
+    balances = {i: rnd.randint(0, 10**9) for i in range(1, COUNTRIES + 1)}
+    cur.executemany("INSERT INTO Inventory (country_id, balance) VALUES (?, ?)", balances.items())
+    # Debug off: a stored '0' reads as on and dumps the schemas into dbs_log.txt
+    cur.execute("INSERT INTO ServerSettings (key, value) VALUES ('debug', '')")
+    cur.executemany(
+        "INSERT INTO Regions (region_id, country_id, name, region_color_hex, population, continent) VALUES (?, ?, ?, ?, ?, 'Europe')",
+        [(i, rnd.randint(1, COUNTRIES), f"Region {i}", f"#{i:06x}", 1000) for i in range(1, REGIONS + 1)],
+    )
+    cur.executemany(
+        "INSERT INTO Structures (region_id, type, specialisation, level, capacity) VALUES (?, ?, 'NA', 1, 100)",
+        [(rnd.randint(1, REGIONS), rnd.choice(["Usine", "Base", "Ecole", "Logement"])) for _ in range(STRUCTURES)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def expected_results(path):
+    """country_id -> (balance, structure count), read once the world is settled."""
+    conn = sqlite3.connect(path)
+    balances = dict(conn.execute("SELECT country_id, balance FROM Inventory"))
+    structures = dict(
+        conn.execute(
+            "SELECT r.country_id, COUNT(*) FROM Structures s JOIN Regions r ON r.region_id = s.region_id GROUP BY r.country_id"
+        )
+    )
+    conn.close()
+    return {country_id: (str(balance), structures.get(country_id, 0)) for country_id, balance in balances.items()}
+
+
+def open_database(path, pool_size):
+    """Database on `path` with `pool_size` reader connections, output muted."""
+    # The schema files are read relative to the repository
+    os.chdir(ROOT)
+    from db import Database
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return Database(path, pool_size=pool_size)
+
+
+def run(db, expected, commands, threads):
+    """Run `commands` commands spread over `threads` threads. Returns (seconds, wrong)."""
+    wrong = []
+    lock = threading.Lock()
+    countries = list(expected)
+
+    def worker(seed):
+        rnd = random.Random(seed)
+        for _ in range(commands // threads):
+            country_id = rnd.choice(countries)
+            try:
+                result = (
+                    db.get_balance(country_id),
+                    len(db.get_structures_by_country(country_id)),
+                )
+            except Exception as e:
+                result = repr(e)
+            if result != expected[country_id]:
+                with lock:
+                    wrong.append((country_id, result))
+
+    workers = [threading.Thread(target=worker, args=(seed,)) for seed in range(threads)]
+    started = time.perf_counter()
+    for worker_thread in workers:
+        worker_thread.start()
+    for worker_thread in workers:
+        worker_thread.join()
+    return time.perf_counter() - started, wrong
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--commands", type=int, default=2000, help="commands per run")
+    parser.add_argument("--threads", default="1,2,4,8", help="comma-separated thread counts")
+    args = parser.parse_args()
+    thread_counts = [int(n) for n in args.threads.split(",")]
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rts.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_world(path)
+        # The first start settles the world (CSV import, test countries' regions)
+        db = open_database(path, 1)
+        db.ledger.close()
+        db.pool.close()
+        expected = expected_results(path)
+        print(
+            f"World: {COUNTRIES} countries, {REGIONS} regions, {STRUCTURES} structures; "
+            f"{os.cpu_count()} CPU core(s)."
+        )
+        print(f"{'threads':>7} | {'1 reader':>16} | {'pooled readers':>16}")
+        for threads in thread_counts:
+            rates = []
+            for pool_size in (1, threads):
+                db = open_database(path, pool_size)
+                try:
+                    elapsed, wrong = run(db, expected, args.commands, threads)
+                finally:
+                    db.ledger.close()
+                    db.pool.close()
+                failures += len(wrong)
+                rates.append(f"{args.commands // threads * threads / elapsed:8.0f} cmd/s")
+            print(f"{threads:>7} | {rates[0]:>16} | {rates[1]:>16}")
+
+    if failures:
+        print(f"❌ {failures} commands got wrong rows or failed.")
+        sys.exit(1)
+    print("✅ Every command got its own rows.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+CSV Import Failure Check
+
+Imports the game CSV files from datas/ into a temporary database with
+src/import_csv_data.import_all_datas, making the sync fail once a few files
+have already been applied. The failed import must be rolled back and report
+no change (Database.initialize_database relies on "changed" to decide whether
+regions and aggregates need repairing); the next import must then apply
+every file, and the one after that none.
+
+Exits with code 1 if a failed import reports changes or leaves rows behind.
+
+Usage: python3 check_csv_import.py
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import import_csv_data  # noqa: E402
+from migrations import migrate  # noqa: E402
+
+DATA_DIR = os.path.join(ROOT, "datas")
+# The sync fails on this call, after the first files were applied
+FAILING_SYNC = 3
+
+
+def import_datas(conn, fail=False):
+    """import_all_datas() through `conn`, output muted, the sync failing if `fail`."""
+    sync_rows = import_csv_data.sync_rows
+    calls = []
+
+    def failing_sync_rows(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == FAILING_SYNC:
+            raise sqlite3.OperationalError("simulated failure")
+        return sync_rows(*args, **kwargs)
+
+    if fail:
+        import_csv_data.sync_rows = failing_sync_rows
+    try:
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            return import_csv_data.import_all_datas(conn, data_dir=DATA_DIR)
+    finally:
+        import_csv_data.sync_rows = sync_rows
+
+
+def stored_state(conn):
+    """(reference rows, stored CSV hashes) currently committed."""
+    rows = conn.execute("SELECT COUNT(*) FROM StructuresDatas").fetchone()[0]
+    hashes = conn.execute("SELECT COUNT(*) FROM SchemaMeta WHERE key LIKE 'csv_hash:%'").fetchone()[0]
+    return rows, hashes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "rts.db"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            migrate(conn)
+
+        result = import_datas(conn, fail=True)
+        print(f"Failed import: success={result['success']}, changed={result['changed']}, counts={result['counts']}.")
+        if result["success"]:
+            failures.append("the failed import reported success")
+        if result["changed"] or result["counts"]:
+            failures.append("the failed import reported changes")
+        if stored_state(conn) != (0, 0):
+            failures.append(f"the failed import left rows or hashes behind: {stored_state(conn)}")
+
+        result = import_datas(conn)
+        print(f"Next import: success={result['success']}, changed={result['changed']}.")
+        if not result["success"] or len(result["changed"]) < FAILING_SYNC:
+            failures.append(f"the next import did not apply the files: {result['changed']}")
+
+        result = import_datas(conn)
+        print(f"Unchanged import: success={result['success']}, changed={result['changed']}.")
+        if not result["success"] or result["changed"]:
+            failures.append(f"the unchanged import re-applied files: {result['changed']}")
+        conn.close()
+
+    if failures:
+        print(f"❌ {len(failures)} import problems:")
+        for failure in failures:
+            print(f"- {failure}")
+        sys.exit(1)
+    print("✅ A failed import is rolled back and reports no change.")
+
+
+if __name__ == "__main__":
+    main()
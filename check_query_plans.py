@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Query Plan Regression Check
+
+Builds a synthetic 1,000-country world in a temporary database from the
+schemas in datas/db_schemas, then runs EXPLAIN QUERY PLAN on every SQL
+statement found in src/db.py and src/asyncdb.py.
+
+The check fails (exit code 1) when a statement filters or joins on one of
+the hot tables below but SQLite plans a full table scan on it.
+
+Usage: python3 check_query_plans.py [--verbose]
+"""
+
+import ast
+import os
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SCHEMAS_DIR = os.path.join(ROOT, "datas", "db_schemas")
+SOURCES = [os.path.join(ROOT, "src", "db.py"), os.path.join(ROOT, "src", "asyncdb.py")]
+
+COUNTRIES = 1000
+REGIONS_PER_COUNTRY = 8
+STRUCTURES_PER_REGION = 4
+
+# Tables that must never be fully scanned when a query filters on them
+HOT_TABLES = {
+    "Countries",
+    "Regions",
+    "Structures",
+    "Governments",
+    "Compte",
+    "InventoryUnits",
+    "StructureProduction",
+    "Dates",
+    "Technologies",
+    "PowerPlants",
+    "Infrastructure",
+    "TechnocentreDevelopment",
+    "TechnologyLicenses",
+    "TechnologyAttributes",
+    "Debts",
+}
+
+SQL_START = re.compile(r"^\s*(SELECT|INSERT|UPDATE|DELETE|WITH)\b", re.IGNORECASE)
+SCAN_LINE_ALIAS = re.compile(r"\bSCAN (\w+)")
+
+
+def create_schema(conn):
+    """Create every table, view and index from datas/db_schemas."""
+    for filename in sorted(os.listdir(SCHEMAS_DIR)):
+        if filename.endswith(".sql"):
+            with open(os.path.join(SCHEMAS_DIR, filename), "r", encoding="utf-8") as f:
+                conn.executescript(f.read())
+
+
+def populate_world(conn):
+    """Fill the database with a synthetic world of COUNTRIES countries."""
+    rnd = random.Random(42)
+    cur = conn.cursor()
+    continents = ["Europe", "Asie", "Afrique", "Amerique", "Oceanie", "Moyen-Orient"]
+    cur.executemany(
+        "INSERT INTO Countries (country_id, role_id, name, public_channel_id, secret_channel_id) VALUES (?, ?, ?, ?, ?)",
+        [(i, str(10**17 + i), f"Pays {i}", str(i), str(10**6 + i)) for i in range(1, COUNTRIES + 1)],
+    )
+    cur.executemany(
+        "INSERT INTO Inventory (country_id, balance, pol_points, diplo_points) VALUES (?, ?, ?, ?)",
+        [(i, rnd.randint(0, 10**9), rnd.randint(0, 500), rnd.randint(0, 500)) for i in range(1, COUNTRIES + 1)],
+    )
+    cur.executemany(
+        "INSERT INTO Stats (country_id, gdp) VALUES (?, ?)",
+        [(i, rnd.randint(0, 10**9)) for i in range(1, COUNTRIES + 1)],
+    )
+    cur.executemany(
+        "INSERT INTO Governments (country_id, slot, player_id) VALUES (?, ?, ?)",
+        [(i, s, str(10**15 + i * 10 + s)) for i in range(1, COUNTRIES + 1) for s in (1, 2)],
+    )
+    cur.executemany(
+        "INSERT INTO CountryTechnologies (country_id, tech_field, level) VALUES (?, ?, ?)",
+        [
+            (i, field, rnd.randint(1, 10))
+            for i in range(1, COUNTRIES + 1)
+            for field in ("Terrestre", "Aerospatial", "Maritime", "Global")
+        ],
+    )
+    cur.executemany(
+        "INSERT INTO GeographicalAreas (geographical_area_id, name) VALUES (?, ?)",
+        [(i, f"Zone {i}") for i in range(1, 201)],
+    )
+    regions = []
+    region_id = 0
+    for country_id in range(1, COUNTRIES + 1):
+        for _ in range(REGIONS_PER_COUNTRY):
+            region_id += 1
+            regions.append(
+                (
+                    region_id,
+                    country_id if rnd.random() > 0.1 else None,
+                    f"Region {region_id}",
+                    f"#{region_id:06x}",
+                    rnd.randint(0, 10**6),
+                    rnd.choice(continents),
+                    rnd.randint(1, 200),
+                )
+            )
+    cur.executemany(
+        "INSERT INTO Regions (region_id, country_id, name, region_color_hex, population, continent, geographical_area_id) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        regions,
+    )
+    structures = []
+    for region in regions:
+        for _ in range(STRUCTURES_PER_REGION):
+            structures.append(
+                (
+                    region[0],
+                    rnd.choice(["Usine", "Base", "Ecole", "Logement", "Technocentre"]),
+                    rnd.choice(["Terrestre", "Aerienne", "Navale", "NA"]),
+                    rnd.randint(1, 7),
+                    rnd.randint(0, 1000),
+                )
+            )
+    cur.executemany(
+        "INSERT INTO Structures (region_id, type, specialisation, level, capacity) VALUES (?, ?, ?, ?, ?)",
+        structures,
+    )
+    structure_count = len(structures)
+    cur.executemany(
+        "INSERT INTO PowerPlants (region_id, type, level) VALUES (?, ?, ?)",
+        [(rnd.randint(1, region_id), "Solaire", rnd.randint(1, 5)) for _ in range(region_id)],
+    )
+    cur.executemany(
+        "INSERT INTO Infrastructure (region_id, type, length_km, cost_per_km, total_cost) VALUES (?, ?, ?, ?, ?)",
+        [(rnd.randint(1, region_id), "Route", 10, 100, 1000) for _ in range(region_id)],
+    )
+    cur.executemany(
+        "INSERT INTO Technologies (tech_id, name, specialisation, original_name, technology_level, developed_by, type) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            (i, f"Tech {i}", rnd.choice(["Terrestre", "Aerienne", "Navale", "NA"]), f"Orig {i}", rnd.randint(1, 10), rnd.randint(1, COUNTRIES), "rifle")
+            for i in range(1, COUNTRIES * 5 + 1)
+        ],
+    )
+    cur.executemany(
+        "INSERT INTO TechnologyAttributes (tech_id, attribute_name, attribute_value) VALUES (?, ?, ?)",
+        [(i, f"attr_{a}", "1") for i in range(1, COUNTRIES * 5 + 1) for a in range(4)],
+    )
+    cur.executemany(
+        "INSERT OR IGNORE INTO StructureProduction (structure_id, tech_id, quantity, months_remaining) VALUES (?, ?, ?, ?)",
+        [(rnd.randint(1, structure_count), rnd.randint(1, COUNTRIES * 5), 10, rnd.randint(1, 12)) for _ in range(structure_count // 2)],
+    )
+    cur.executemany(
+        "INSERT INTO TechnologyLicenses (tech_id, country_id, license_type) VALUES (?, ?, 'commercial')",
+        [(rnd.randint(1, COUNTRIES * 5), rnd.randint(1, COUNTRIES)) for _ in range(COUNTRIES * 2)],
+    )
+    cur.executemany(
+        "INSERT OR IGNORE INTO InventoryUnits (country_id, unit_type, quantity) VALUES (?, ?, ?)",
+        [(i, f"unit_{u}", rnd.randint(1, 10**4)) for i in range(1, COUNTRIES + 1) for u in range(10)],
+    )
+    cur.executemany(
+        "INSERT INTO InventoryPricings (item, price, maintenance) VALUES (?, ?, ?)",
+        [(f"unit_{u}", 1000, 10) for u in range(10)],
+    )
+    cur.executemany(
+        "INSERT INTO Dates (year, month, playday, real_date) VALUES (?, ?, ?, ?)",
+        [(2023 + d // 24, d // 2 % 12 + 1, d % 2 + 1, f"2024-01-01T00:00:{d:06d}") for d in range(2000)],
+    )
+    cur.executemany(
+        "INSERT INTO Personne (id, nom_commun, gravite) VALUES (?, ?, ?)",
+        [(i, f"Personne {i}", rnd.randint(1, 3)) for i in range(1, 501)],
+    )
+    cur.executemany(
+        "INSERT INTO Compte (id_discord, username, id_personne) VALUES (?, ?, ?)",
+        [(10**16 + i, f"user{i}", rnd.randint(1, 500)) for i in range(1, 2001)],
+    )
+    cur.executemany(
+        "INSERT INTO Debts (debt_reference, country_id, original_amount, remaining_amount, interest_rate, max_years) VALUES (?, ?, ?, ?, ?, ?)",
+        [(f"{i}_REF", rnd.randint(1, COUNTRIES), 1000, 500, 0.05, 5) for i in range(COUNTRIES * 2)],
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+
+
+def extract_statements(path):
+    """Yield (line, sql) for every literal SQL string in a Python source file."""
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.JoinedStr):
+            # f-strings: substitute placeholders so the statement can still be planned
+            parts = []
+            for value in node.values:
+                if isinstance(value, ast.Constant):
+                    parts.append(str(value.value))
+                else:
+                    parts.append("{}")
+            sql = "".join(parts)
+            if SQL_START.match(sql):
+                yield node.lineno, sql, True
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            if SQL_START.match(node.value):
+                yield node.lineno, node.value, False
+
+
+def resolve_fstring(sql):
+    """Fill f-string placeholders with representative column names."""
+    sql = sql.replace("minimum_{}", "minimum_slots_taken").replace("maximum_{}", "maximum_slots_taken")
+    sql = re.sub(r"\{\}\s*=\s*1", "can_build = 1", sql)
+    sql = re.sub(r"IN \(\{\}\)", "IN (?)", sql)
+    sql = re.sub(r"\b(INSERT INTO Stats \(country_id, )\{\}", r"\1gdp", sql)
+    sql = re.sub(r"SET \{\} = \?", "SET gdp = ?", sql)
+    sql = sql.replace("{} = {} +", "pol_points = pol_points +").replace("{} = {} -", "pol_points = pol_points -")
+    sql = sql.replace("SELECT {} FROM", "SELECT pol_points FROM")
+    sql = sql.replace("(country_id, {})", "(country_id, pol_points)")
+    sql = sql.replace("SET {} =", "SET pol_points =")
+    sql = sql.replace("SET {}", "SET name = ?")
+    return sql
+
+
+def table_aliases(sql):
+    """Map alias -> table for every FROM/JOIN clause of a statement."""
+    aliases = {}
+    for table, alias in re.findall(
+        r"\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", sql, re.IGNORECASE
+    ):
+        aliases[table] = table
+        if alias and alias.upper() not in (
+            "WHERE", "JOIN", "LEFT", "INNER", "ON", "ORDER", "GROUP", "LIMIT", "SET", "VALUES", "SELECT",
+        ):
+            aliases[alias] = table
+    return aliases
+
+
+def is_filtered(sql, table, aliases):
+    """True when the statement has a WHERE predicate touching the given table.
+
+    Join conditions alone do not count: the outer table of a join is always
+    scanned when the statement intentionally reads every row.
+    """
+    names = [name for name, target in aliases.items() if target == table]
+    predicate = " ".join(
+        re.findall(
+            r"\bWHERE\b(.*?)(?=\bORDER\b|\bGROUP\b|\bLIMIT\b|$)",
+            sql,
+            re.IGNORECASE | re.DOTALL,
+        )
+    )
+    if not predicate:
+        return False
+    for name in names:
+        if re.search(rf"\b{name}\.\w+", predicate):
+            return True
+    # Single-table statement: any predicate applies to it
+    return len(set(aliases.values())) == 1
+
+
+def main():
+    verbose = "--verbose" in sys.argv
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "plans.db"))
+        create_schema(conn)
+        populate_world(conn)
+
+        checked = 0
+        failures = []
+        errors = []
+        for path in SOURCES:
+            for line, sql, is_fstring in extract_statements(path):
+                if is_fstring:
+                    sql = resolve_fstring(sql)
+                location = f"{os.path.relpath(path, ROOT)}:{line}"
+                try:
+                    plan = conn.execute(
+                        f"EXPLAIN QUERY PLAN {sql}", (None,) * sql.count("?")
+                    ).fetchall()
+                except sqlite3.Error as e:
+                    # Query fragments and dynamically built statements cannot be planned alone
+                    errors.append((location, str(e)))
+                    continue
+                checked += 1
+                aliases = table_aliases(sql)
+                for row in plan:
+                    detail = row[-1]
+                    match = SCAN_LINE_ALIAS.search(detail)
+                    if not match or "USING" in detail:
+                        continue
+                    scanned = aliases.get(match.group(1), match.group(1))
+                    if scanned in HOT_TABLES and is_filtered(sql, scanned, aliases):
+                        failures.append((location, detail, " ".join(sql.split())))
+                if verbose:
+                    print(f"{location}: " + " | ".join(r[-1] for r in plan))
+        conn.close()
+
+    print(f"Checked {checked} statements against a {COUNTRIES}-country world.")
+    if verbose:
+        for location, message in errors:
+            print(f"⚠️  {location}: could not plan statement ({message})")
+    elif errors:
+        print(f"⚠️  {len(errors)} statements skipped (fragments), use --verbose to list them.")
+    if failures:
+        print(f"❌ {len(failures)} hot queries fall back to a table scan:")
+        for location, detail, sql in failures:
+            print(f"- {location}: {detail}\n    {sql[:200]}")
+        sys.exit(1)
+    print("✅ No hot query regressed to a table scan.")
+
+
+if __name__ == "__main__":
+    main()
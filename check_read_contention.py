@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Read/Write Contention Check
+
+Builds a temporary game database with src/db.Database and checks that the
+read-only Database methods never wait behind, nor see, the writer's work:
+
+1. A writer keeps a transaction open with uncommitted orders (then rolls it
+   back); reads made meanwhile from another thread must return at once,
+   with the committed state only.
+2. The production tick queues and completes orders in one transaction, in a
+   loop, while reader threads hammer get_country_productions,
+   get_power_plants_by_country and get_structure_used_capacity. Every read
+   must see the whole committed production queue (never the tick's
+   intermediate rows); latencies are reported.
+
+Exits with code 1 on a blocked or inconsistent read.
+
+Usage: python3 check_read_contention.py [--seconds 5] [--readers 4]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+REGIONS = 300
+FACTORIES_PER_REGION = 3
+TECHNOLOGIES = 50
+# Orders the tick queues (and completes) per factory on every cycle
+TICK_ORDERS_PER_FACTORY = 5
+# A read of the writer's pending state must not take longer than this
+BLOCKED_READ_SECONDS = 0.5
+
+
+def open_database(path):
+    """Database on a fresh file holding the schema and one country, output muted."""
+    # The schema files are read relative to the repository
+    os.chdir(ROOT)
+    from db import Database
+    from migrations import migrate
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        conn = sqlite3.connect(path)
+        migrate(conn)
+        # An existing country: Database does not look for datas/init_data.sql
+        conn.execute(
+            "INSERT INTO Countries (country_id, role_id, name, public_channel_id, secret_channel_id) VALUES (1, '1', 'Pays 1', '1', '2')"
+        )
+        conn.execute("INSERT INTO Inventory (country_id, balance) VALUES (1, 0)")
+        # Debug off: a stored '0' reads as on and dumps the schemas into dbs_log.txt
+        conn.execute("INSERT INTO ServerSettings (key, value) VALUES ('debug', '')")
+        conn.commit()
+        conn.close()
+        return Database(path)
+
+
+def populate_world(db):
+    """One country with REGIONS regions of factories and a long-lived production queue."""
+    with db.transaction() as cur:
+        cur.executemany(
+            "INSERT INTO Regions (country_id, name, region_color_hex, population, continent) VALUES (1, ?, ?, 0, 'Europe')",
+            [(f"Region {i}", f"#c{i:05x}") for i in range(REGIONS)],
+        )
+        region_ids = [row[0] for row in cur.execute("SELECT region_id FROM Regions WHERE country_id = 1")]
+        cur.executemany(
+            "INSERT INTO Structures (region_id, type, specialisation, level, capacity, population) VALUES (?, 'Usine', 'Terrestre', 1, 10, 0)",
+            [(region_id,) for region_id in region_ids for _ in range(FACTORIES_PER_REGION)],
+        )
+        factory_ids = [row[0] for row in cur.execute("SELECT id FROM Structures WHERE type = 'Usine'")]
+        cur.executemany(
+            "INSERT INTO Technologies (name, specialisation, original_name, type) VALUES (?, 'Terrestre', ?, 'rifle')",
+            [(f"Tech {i}", f"Tech {i}") for i in range(TECHNOLOGIES)],
+        )
+        tech_ids = [row[0] for row in cur.execute("SELECT tech_id FROM Technologies")]
+        month = db.get_current_month_index()
+        # Displayed by the readers: due in a year, never completed by the tick
+        cur.executemany(
+            "INSERT INTO StructureProduction (structure_id, tech_id, quantity, months_remaining, completion_month) VALUES (?, ?, 1, 12, ?)",
+            [(factory_id, tech_ids[i % TECHNOLOGIES], month + 12) for i, factory_id in enumerate(factory_ids)],
+        )
+    return factory_ids, tech_ids, month
+
+
+def check_pending_writes(db, factory_ids, tech_ids, month):
+    """Phase 1: reads during an open write transaction. Returns the failures."""
+    failures = []
+    committed = len(factory_ids)
+    in_transaction = threading.Event()
+    release = threading.Event()
+
+    def writer():
+        try:
+            with db.transaction() as cur:
+                # A technology of its own, so every order is a new row
+                cur.execute(
+                    "INSERT INTO Technologies (name, specialisation, original_name, type) VALUES ('Pending', 'Terrestre', 'Pending', 'rifle')"
+                )
+                cur.executemany(
+                    "INSERT INTO StructureProduction (structure_id, tech_id, quantity, months_remaining, completion_month) VALUES (?, ?, 1, 0, ?)",
+                    [(factory_id, cur.lastrowid, month) for factory_id in factory_ids],
+                )
+                in_transaction.set()
+                release.wait(10)
+                # Never committed: the transaction is rolled back
+                raise InterruptedError
+        except InterruptedError:
+            pass
+        except Exception as e:
+            failures.append(f"the writer failed: {e!r}")
+        finally:
+            in_transaction.set()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    in_transaction.wait(10)
+    if failures:
+        thread.join()
+        return failures
+    try:
+        started = time.perf_counter()
+        rows = db.get_country_productions(1)
+        elapsed = time.perf_counter() - started
+        if elapsed > BLOCKED_READ_SECONDS:
+            failures.append(f"read blocked {elapsed * 1000:.0f} ms behind the open transaction")
+        if len(rows) != committed:
+            failures.append(f"read saw {len(rows)} productions during the transaction, {committed} committed")
+        print(f"Read during an open write transaction: {elapsed * 1000:.1f} ms, {len(rows)}/{committed} committed rows.")
+    finally:
+        release.set()
+        thread.join()
+    return failures
+
+
+def check_production_tick(db, factory_ids, tech_ids, month, seconds, readers):
+    """Phase 2: production tick in a loop against reader threads. Returns the failures."""
+    committed = len(factory_ids)
+    stop = threading.Event()
+    tick_times = []
+    latencies = []
+    inconsistent = []
+    errors = []
+    lock = threading.Lock()
+
+    def tick():
+        while not stop.is_set():
+            started = time.perf_counter()
+            with db.transaction() as cur:
+                # Orders due this month, then the tick completing them
+                cur.executemany(
+                    "INSERT OR IGNORE INTO StructureProduction (structure_id, tech_id, quantity, months_remaining, completion_month) VALUES (?, ?, 1, 0, ?)",
+                    [
+                        (factory_id, tech_id, month)
+                        for factory_id in factory_ids
+                        for tech_id in tech_ids[:TICK_ORDERS_PER_FACTORY]
+                    ],
+                )
+                db.process_production_cycle()
+            tick_times.append(time.perf_counter() - started)
+
+    def read():
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                rows = db.get_country_productions(1)
+                db.get_power_plants_by_country(1)
+                db.get_structure_used_capacity(factory_ids[0])
+            except Exception as e:
+                with lock:
+                    errors.append(repr(e))
+                continue
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                if len(rows) != committed:
+                    inconsistent.append(len(rows))
+
+    threads = [threading.Thread(target=tick)] + [threading.Thread(target=read) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+
+    def percentile(pct):
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(round(pct / 100 * (len(latencies) - 1))))] * 1000
+
+    orders = committed * TICK_ORDERS_PER_FACTORY
+    print(
+        f"Production tick: {len(tick_times)} cycles of {orders} orders "
+        f"(avg {statistics.mean(tick_times) * 1000 if tick_times else 0:.1f} ms)."
+    )
+    print(
+        f"Reads from {readers} threads: {len(latencies)} in {seconds:g} s, "
+        f"p50 {percentile(50):.1f} ms, p95 {percentile(95):.1f} ms, max {percentile(100):.1f} ms."
+    )
+    failures = []
+    if not tick_times:
+        failures.append("the production tick never completed a cycle")
+    if inconsistent:
+        failures.append(f"{len(inconsistent)} reads saw the tick's uncommitted rows")
+    if errors:
+        failures.append(f"{len(errors)} reads failed, first: {errors[0]}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--seconds", type=float, default=5.0, help="duration of the tick phase")
+    parser.add_argument("--readers", type=int, default=4, help="reader threads")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = open_database(os.path.join(tmp, "rts.db"))
+        try:
+            factory_ids, tech_ids, month = populate_world(db)
+            print(f"World: {len(factory_ids)} factories, {len(factory_ids)} queued productions.")
+            failures = check_pending_writes(db, factory_ids, tech_ids, month)
+            failures += check_production_tick(db, factory_ids, tech_ids, month, args.seconds, args.readers)
+        finally:
+            db.ledger.close()
+            db.pool.close()
+
+    if failures:
+        print(f"❌ {len(failures)} contention problems:")
+        for failure in failures:
+            print(f"- {failure}")
+        sys.exit(1)
+    print("✅ Reads never waited behind nor saw the writer's pending changes.")
+
+
+if __name__ == "__main__":
+    main()
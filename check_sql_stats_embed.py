@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+SQL Stats Embed Length Check
+
+Fills a src/sql_trace.SqlTracer with statements of various lengths, builds
+the `sql_stats` embed from its top 25 the way the admin cog does, and checks
+that the embed stays within Discord's limits (6000 characters in total, 1024
+per field value), that it still shows a full top when the statements are
+short, and that the footer counts the statements left to sql_stats.txt.
+
+Exits with code 1 if one of the embeds would be rejected by Discord.
+
+Usage: python3 check_sql_stats_embed.py
+"""
+
+import argparse
+import os
+import sys
+
+import discord
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from sql_trace import EMBED_MAX_LENGTH, SqlTracer, add_top_fields  # noqa: E402
+
+TOP = 25
+FIELD_VALUE_MAX_LENGTH = 1024
+
+
+def build_embed(tracer):
+    """The cog's embed: same title, description and footer, worst-case numbers."""
+    summary = tracer.get_summary()
+    statements = tracer.get_top(TOP)
+    embed = discord.Embed(
+        title="🐢 Requêtes SQL les plus coûteuses",
+        description=(
+            f"{summary['executions']} exécutions de {summary['statements']} requêtes, "
+            f"{summary['total_ms']:.0f} ms au total depuis <t:{int(summary['since'])}:R>.\n"
+            f"Requêtes lentes (≥ {summary['slow_threshold_ms']:.0f} ms) : {summary['slow_queries']}"
+        ),
+        color=discord.Color.blue(),
+    )
+    footer = f"{len(statements)} requêtes de plus dans sql_stats.txt"
+    shown = add_top_fields(embed, statements, reserve=len(footer))
+    if shown < len(statements):
+        embed.set_footer(text=f"{len(statements) - shown} requêtes de plus dans sql_stats.txt")
+    return embed, len(statements), shown
+
+
+def traced(sql_length):
+    """A tracer holding TOP distinct statements of `sql_length` characters."""
+    tracer = SqlTracer(slow_threshold_ms=10**9)
+    for index in range(TOP):
+        sql = f"SELECT {index} FROM Countries WHERE name = 'x'"
+        sql += " AND 1" * ((sql_length - len(sql)) // 6)
+        for _ in range(3):
+            tracer.record(sql, 12345.678, 10**9)
+    return tracer
+
+
+def check(label, sql_length, expect_all):
+    """Build the embed for `sql_length`-character statements. Returns the failures."""
+    embed, total, shown = build_embed(traced(sql_length))
+    failures = []
+    if len(embed) > EMBED_MAX_LENGTH:
+        failures.append(f"{label}: embed is {len(embed)} characters long")
+    for field in embed.fields:
+        if len(field.value) > FIELD_VALUE_MAX_LENGTH:
+            failures.append(f"{label}: field {field.name} is {len(field.value)} characters long")
+    if expect_all and shown != total:
+        failures.append(f"{label}: only {shown}/{total} statements shown")
+    if not shown:
+        failures.append(f"{label}: no statement shown")
+    left = embed.footer.text if embed.footer else None
+    if shown < total and left != f"{total - shown} requêtes de plus dans sql_stats.txt":
+        failures.append(f"{label}: footer {left!r} for {total - shown} statements left out")
+    print(f"{label}: {shown}/{total} statements shown, {len(embed)} characters.")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.parse_args()
+
+    failures = check("Short statements", 60, expect_all=True)
+    failures += check("300-character statements", 300, expect_all=False)
+    failures += check("5000-character statements", 5000, expect_all=False)
+
+    if failures:
+        print(f"❌ {len(failures)} embeds would be rejected:")
+        for failure in failures:
+            print(f"- {failure}")
+        sys.exit(1)
+    print("✅ The sql_stats embed stays within Discord's limits.")
+
+
+if __name__ == "__main__":
+    main()
@@ -40,4 +40,11 @@ CREATE TABLE IF NOT EXISTS CountryDoctrines (
     PRIMARY KEY (country_id, doctrine_id),
     FOREIGN KEY (country_id) REFERENCES Countries(country_id) ON DELETE CASCADE,
     FOREIGN KEY (doctrine_id) REFERENCES Doctrines(doctrine_id)
-);
\ No newline at end of file
+);
+
+-- Indexes
+CREATE INDEX IF NOT EXISTS idx_countries_role_id ON Countries(role_id);
+CREATE INDEX IF NOT EXISTS idx_countries_name ON Countries(name);
+CREATE INDEX IF NOT EXISTS idx_countries_secret_channel_id ON Countries(secret_channel_id);
+CREATE INDEX IF NOT EXISTS idx_governments_player_id ON Governments(player_id, country_id);
+CREATE INDEX IF NOT EXISTS idx_country_doctrines_doctrine_id ON CountryDoctrines(doctrine_id);
@@ -9,4 +9,7 @@ CREATE TABLE IF NOT EXISTS Dates (
 CREATE TABLE IF NOT EXISTS PlaydaysPerMonth (
     month_number SMALLINT PRIMARY KEY CHECK (month_number BETWEEN 1 AND 12),
     playdays INTEGER NOT NULL DEFAULT 1 CHECK (playdays >= 0)
-);
\ No newline at end of file
+);
+
+-- Index
+CREATE INDEX IF NOT EXISTS idx_dates_real_date ON Dates(real_date);
@@ -20,3 +20,8 @@ CREATE TABLE IF NOT EXISTS Sanctions (
     raison TEXT,
     FOREIGN KEY (id_personne) REFERENCES Personne(id) ON DELETE CASCADE
 );
+
+-- Indexes
+-- Compte.id_discord is already indexed by its UNIQUE constraint
+CREATE INDEX IF NOT EXISTS idx_compte_id_personne ON Compte(id_personne);
+CREATE INDEX IF NOT EXISTS idx_sanctions_id_personne ON Sanctions(id_personne);
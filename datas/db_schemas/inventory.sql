@@ -34,4 +34,14 @@ CREATE TABLE IF NOT EXISTS Debts (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (country_id) REFERENCES Countries(country_id)
         ON DELETE CASCADE
-);
\ No newline at end of file
+);
+
+-- Index
+-- InventoryUnits(country_id, ...) is already covered by its primary key
+-- Classements (lead / get_leads) : un index par critère, départage par country_id
+CREATE INDEX IF NOT EXISTS idx_inventory_lead_balance ON Inventory(balance DESC, country_id);
+CREATE INDEX IF NOT EXISTS idx_inventory_lead_pol ON Inventory(pol_points DESC, country_id);
+CREATE INDEX IF NOT EXISTS idx_inventory_lead_diplo ON Inventory(diplo_points DESC, country_id);
+CREATE INDEX IF NOT EXISTS idx_inventory_lead_score ON Inventory((balance * (pol_points + diplo_points)) DESC, country_id);
+CREATE INDEX IF NOT EXISTS idx_inventory_lead_total ON Inventory((balance + pol_points + diplo_points) DESC, country_id);
+CREATE INDEX IF NOT EXISTS idx_debts_country_id ON Debts(country_id);
@@ -0,0 +1,26 @@
+-- Journal économique append-only : chaque mouvement d'argent ou de points
+-- (give/take/set balance et points) y est inscrit comme un delta signé.
+-- Pas de clé étrangère vers Countries : l'historique survit à la suppression d'un pays.
+CREATE TABLE IF NOT EXISTS Ledger (
+    entry_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    country_id INTEGER NOT NULL,
+    kind TEXT NOT NULL CHECK (kind IN ('balance', 'pol_points', 'diplo_points')),
+    delta INTEGER NOT NULL,
+    reason TEXT, -- 'loan', 'maintenance', 'construction'...
+    created_at REAL NOT NULL -- Horodatage Unix du mouvement
+);
+
+-- Soldes périodiques : état d'un pays après l'entrée last_entry_id du Ledger
+CREATE TABLE IF NOT EXISTS BalanceSnapshots (
+    snapshot_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    country_id INTEGER NOT NULL,
+    balance INTEGER NOT NULL DEFAULT 0,
+    pol_points INTEGER NOT NULL DEFAULT 0,
+    diplo_points INTEGER NOT NULL DEFAULT 0,
+    last_entry_id INTEGER NOT NULL DEFAULT 0,
+    taken_at REAL NOT NULL
+);
+
+-- Indexes
+CREATE INDEX IF NOT EXISTS idx_ledger_country_entry ON Ledger(country_id, entry_id);
+CREATE INDEX IF NOT EXISTS idx_balance_snapshots_country_taken ON BalanceSnapshots(country_id, taken_at);
@@ -17,3 +17,9 @@ CREATE TABLE IF NOT EXISTS GeographicalAreas (
     geographical_area_id INTEGER PRIMARY KEY AUTOINCREMENT, -- Identifiant unique de la zone géographique
     name TEXT UNIQUE NOT NULL                                      -- Nom de la zone géographique
 );
+
+-- Indexes
+CREATE INDEX IF NOT EXISTS idx_regions_country_id ON Regions(country_id, population);
+CREATE INDEX IF NOT EXISTS idx_regions_continent ON Regions(continent, country_id);
+CREATE INDEX IF NOT EXISTS idx_regions_name ON Regions(name);
+CREATE INDEX IF NOT EXISTS idx_regions_geographical_area_id ON Regions(geographical_area_id);
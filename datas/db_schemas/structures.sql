@@ -10,6 +10,7 @@ CREATE TABLE IF NOT EXISTS Structures (
     level INTEGER NOT NULL DEFAULT 1,
     capacity INTEGER DEFAULT 0 NOT NULL,  -- Capacité utile pour les logements/ecoles/bases
     population INTEGER DEFAULT 0 NOT NULL,  -- nb personnes affectées pour logements, bases, écoles, usines
+    country_id INTEGER,  -- Copie de Regions.country_id, tenue à jour par les triggers plus bas
     FOREIGN KEY (region_id) REFERENCES Regions(region_id)
         ON DELETE CASCADE
 );
@@ -41,6 +42,7 @@ CREATE TABLE IF NOT EXISTS Infrastructure (
     length_km REAL NOT NULL DEFAULT 0,  -- Length in kilometers
     cost_per_km INTEGER NOT NULL,  -- Cost per kilometer
     total_cost INTEGER NOT NULL,  -- Total construction cost
+    country_id INTEGER,  -- Copie de Regions.country_id (triggers)
     FOREIGN KEY (region_id) REFERENCES Regions(region_id)
         ON DELETE CASCADE
 );
@@ -59,6 +61,7 @@ CREATE TABLE IF NOT EXISTS PowerPlants (
     type TEXT NOT NULL,
     level INTEGER NOT NULL,
     built_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    country_id INTEGER,  -- Copie de Regions.country_id (triggers)
     FOREIGN KEY (region_id) REFERENCES Regions(region_id)
         ON DELETE CASCADE
 );
@@ -91,3 +94,71 @@ CREATE TABLE IF NOT EXISTS HousingDatas (
 
 -- Remove the old StructuresRatios table as it's no longer needed
 DROP TABLE IF EXISTS StructuresRatios;
+
+-- Indexes
+CREATE INDEX IF NOT EXISTS idx_structures_region_id ON Structures(region_id, type);
+CREATE INDEX IF NOT EXISTS idx_infrastructure_region_id ON Infrastructure(region_id);
+CREATE INDEX IF NOT EXISTS idx_power_plants_region_id ON PowerPlants(region_id);
+-- capacity en fin d'index : les sommes de capacité par pays ne lisent que l'index
+CREATE INDEX IF NOT EXISTS idx_structures_country_id ON Structures(country_id, type, capacity);
+CREATE INDEX IF NOT EXISTS idx_infrastructure_country_id ON Infrastructure(country_id);
+CREATE INDEX IF NOT EXISTS idx_power_plants_country_id ON PowerPlants(country_id);
+
+-- Propriétaire dénormalisé : country_id suit la région, à la création, au
+-- déplacement et quand la région change de pays
+CREATE TRIGGER IF NOT EXISTS trg_structures_owner_insert
+AFTER INSERT ON Structures
+BEGIN
+    UPDATE Structures
+    SET country_id = (SELECT country_id FROM Regions WHERE region_id = NEW.region_id)
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_structures_owner_move
+AFTER UPDATE OF region_id ON Structures
+BEGIN
+    UPDATE Structures
+    SET country_id = (SELECT country_id FROM Regions WHERE region_id = NEW.region_id)
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_infrastructure_owner_insert
+AFTER INSERT ON Infrastructure
+BEGIN
+    UPDATE Infrastructure
+    SET country_id = (SELECT country_id FROM Regions WHERE region_id = NEW.region_id)
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_infrastructure_owner_move
+AFTER UPDATE OF region_id ON Infrastructure
+BEGIN
+    UPDATE Infrastructure
+    SET country_id = (SELECT country_id FROM Regions WHERE region_id = NEW.region_id)
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_power_plants_owner_insert
+AFTER INSERT ON PowerPlants
+BEGIN
+    UPDATE PowerPlants
+    SET country_id = (SELECT country_id FROM Regions WHERE region_id = NEW.region_id)
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_power_plants_owner_move
+AFTER UPDATE OF region_id ON PowerPlants
+BEGIN
+    UPDATE PowerPlants
+    SET country_id = (SELECT country_id FROM Regions WHERE region_id = NEW.region_id)
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_regions_owner_change
+AFTER UPDATE OF country_id ON Regions
+WHEN OLD.country_id IS NOT NEW.country_id
+BEGIN
+    UPDATE Structures SET country_id = NEW.country_id WHERE region_id = NEW.region_id;
+    UPDATE Infrastructure SET country_id = NEW.country_id WHERE region_id = NEW.region_id;
+    UPDATE PowerPlants SET country_id = NEW.country_id WHERE region_id = NEW.region_id;
+END;
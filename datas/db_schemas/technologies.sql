@@ -18,8 +18,9 @@ CREATE TABLE IF NOT EXISTS StructureProduction (
     structure_id INTEGER NOT NULL,
     tech_id INTEGER NOT NULL,
     quantity INTEGER NOT NULL,
-    months_remaining INTEGER NOT NULL,
+    months_remaining INTEGER NOT NULL, -- Durée de production demandée (en mois)
     started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    completion_month INTEGER, -- Mois de jeu absolu de fin (year * 12 + month - 1)
     PRIMARY KEY (structure_id, tech_id),
     FOREIGN KEY (structure_id) REFERENCES Structures(id) ON DELETE CASCADE,
     FOREIGN KEY (tech_id) REFERENCES Technologies(tech_id) ON DELETE CASCADE
@@ -126,3 +127,14 @@ CREATE TABLE IF NOT EXISTS TechnocentreDevelopment (
     FOREIGN KEY (tech_id) REFERENCES Technologies(tech_id) ON DELETE CASCADE,
     FOREIGN KEY (country_id) REFERENCES Countries(country_id) ON DELETE CASCADE
 );
+
+-- Indexes
+-- StructureProduction(structure_id, ...) is already covered by its primary key
+CREATE INDEX IF NOT EXISTS idx_structure_production_tech_id ON StructureProduction(tech_id);
+CREATE INDEX IF NOT EXISTS idx_structure_production_completion ON StructureProduction(completion_month);
+CREATE INDEX IF NOT EXISTS idx_technologies_name ON Technologies(name);
+CREATE INDEX IF NOT EXISTS idx_technologies_developed_by ON Technologies(developed_by);
+CREATE INDEX IF NOT EXISTS idx_technology_attributes_tech_id ON TechnologyAttributes(tech_id);
+CREATE INDEX IF NOT EXISTS idx_technology_licenses_tech_country ON TechnologyLicenses(tech_id, country_id);
+CREATE INDEX IF NOT EXISTS idx_technology_licenses_country_id ON TechnologyLicenses(country_id);
+CREATE INDEX IF NOT EXISTS idx_technocentre_development_country_id ON TechnocentreDevelopment(country_id);
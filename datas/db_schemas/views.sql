@@ -1,44 +1,217 @@
+-- Agrégats par pays, tenus à jour par les triggers ci-dessous à chaque écriture
+-- sur Regions, Structures et PowerPlants (Database.check_country_aggregates
+-- les recalcule et les répare si besoin)
+CREATE TABLE IF NOT EXISTS CountryAggregates (
+    country_id INTEGER PRIMARY KEY,
+    population INTEGER NOT NULL DEFAULT 0,
+    region_count INTEGER NOT NULL DEFAULT 0,
+    housing_capacity INTEGER NOT NULL DEFAULT 0,  -- Capacité des Logement
+    usine_count INTEGER NOT NULL DEFAULT 0,
+    base_count INTEGER NOT NULL DEFAULT 0,
+    ecole_count INTEGER NOT NULL DEFAULT 0,
+    logement_count INTEGER NOT NULL DEFAULT 0,
+    technocentre_count INTEGER NOT NULL DEFAULT 0,
+    power_plant_count INTEGER NOT NULL DEFAULT 0,
+    power_production INTEGER NOT NULL DEFAULT 0  -- Somme des PowerPlantsDatas.production_mwh
+);
+
+-- Régions : population et nombre de régions
+CREATE TRIGGER IF NOT EXISTS trg_aggregates_region_insert
+AFTER INSERT ON Regions
+WHEN NEW.country_id IS NOT NULL
+BEGIN
+    INSERT INTO CountryAggregates (country_id, population, region_count)
+    VALUES (NEW.country_id, NEW.population, 1)
+    ON CONFLICT(country_id) DO UPDATE SET
+        population = population + excluded.population,
+        region_count = region_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_aggregates_region_delete
+AFTER DELETE ON Regions
+WHEN OLD.country_id IS NOT NULL
+BEGIN
+    UPDATE CountryAggregates
+    SET population = population - OLD.population, region_count = region_count - 1
+    WHERE country_id = OLD.country_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_aggregates_region_update
+AFTER UPDATE OF country_id, population ON Regions
+WHEN OLD.country_id IS NOT NEW.country_id OR OLD.population != NEW.population
+BEGIN
+    UPDATE CountryAggregates
+    SET population = population - OLD.population, region_count = region_count - 1
+    WHERE country_id = OLD.country_id;
+    INSERT INTO CountryAggregates (country_id, population, region_count)
+    SELECT NEW.country_id, NEW.population, 1 WHERE NEW.country_id IS NOT NULL
+    ON CONFLICT(country_id) DO UPDATE SET
+        population = population + excluded.population,
+        region_count = region_count + 1;
+END;
+
+-- Structures : capacité des logements et nombre de bâtiments par type
+-- (country_id y est recopié depuis la région, voir structures.sql)
+CREATE TRIGGER IF NOT EXISTS trg_aggregates_structure_insert
+AFTER INSERT ON Structures
+WHEN NEW.country_id IS NOT NULL
+BEGIN
+    INSERT INTO CountryAggregates (
+        country_id, housing_capacity, usine_count, base_count, ecole_count,
+        logement_count, technocentre_count
+    )
+    VALUES (
+        NEW.country_id,
+        CASE WHEN NEW.type = 'Logement' THEN NEW.capacity ELSE 0 END,
+        NEW.type = 'Usine', NEW.type = 'Base', NEW.type = 'Ecole',
+        NEW.type = 'Logement', NEW.type = 'Technocentre'
+    )
+    ON CONFLICT(country_id) DO UPDATE SET
+        housing_capacity = housing_capacity + excluded.housing_capacity,
+        usine_count = usine_count + excluded.usine_count,
+        base_count = base_count + excluded.base_count,
+        ecole_count = ecole_count + excluded.ecole_count,
+        logement_count = logement_count + excluded.logement_count,
+        technocentre_count = technocentre_count + excluded.technocentre_count;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_aggregates_structure_delete
+AFTER DELETE ON Structures
+WHEN OLD.country_id IS NOT NULL
+BEGIN
+    UPDATE CountryAggregates SET
+        housing_capacity = housing_capacity - CASE WHEN OLD.type = 'Logement' THEN OLD.capacity ELSE 0 END,
+        usine_count = usine_count - (OLD.type = 'Usine'),
+        base_count = base_count - (OLD.type = 'Base'),
+        ecole_count = ecole_count - (OLD.type = 'Ecole'),
+        logement_count = logement_count - (OLD.type = 'Logement'),
+        technocentre_count = technocentre_count - (OLD.type = 'Technocentre')
+    WHERE country_id = OLD.country_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_aggregates_structure_update
+AFTER UPDATE OF country_id, type, capacity ON Structures
+WHEN OLD.country_id IS NOT NEW.country_id OR OLD.type != NEW.type OR OLD.capacity != NEW.capacity
+BEGIN
+    UPDATE CountryAggregates SET
+        housing_capacity = housing_capacity - CASE WHEN OLD.type = 'Logement' THEN OLD.capacity ELSE 0 END,
+        usine_count = usine_count - (OLD.type = 'Usine'),
+        base_count = base_count - (OLD.type = 'Base'),
+        ecole_count = ecole_count - (OLD.type = 'Ecole'),
+        logement_count = logement_count - (OLD.type = 'Logement'),
+        technocentre_count = technocentre_count - (OLD.type = 'Technocentre')
+    WHERE country_id = OLD.country_id;
+    INSERT INTO CountryAggregates (
+        country_id, housing_capacity, usine_count, base_count, ecole_count,
+        logement_count, technocentre_count
+    )
+    SELECT
+        NEW.country_id,
+        CASE WHEN NEW.type = 'Logement' THEN NEW.capacity ELSE 0 END,
+        NEW.type = 'Usine', NEW.type = 'Base', NEW.type = 'Ecole',
+        NEW.type = 'Logement', NEW.type = 'Technocentre'
+    WHERE NEW.country_id IS NOT NULL
+    ON CONFLICT(country_id) DO UPDATE SET
+        housing_capacity = housing_capacity + excluded.housing_capacity,
+        usine_count = usine_count + excluded.usine_count,
+        base_count = base_count + excluded.base_count,
+        ecole_count = ecole_count + excluded.ecole_count,
+        logement_count = logement_count + excluded.logement_count,
+        technocentre_count = technocentre_count + excluded.technocentre_count;
+END;
+
+-- Centrales : nombre et production (une modification de PowerPlantsDatas
+-- n'est pas suivie, check_country_aggregates(repair=True) la rattrape)
+CREATE TRIGGER IF NOT EXISTS trg_aggregates_power_plant_insert
+AFTER INSERT ON PowerPlants
+WHEN NEW.country_id IS NOT NULL
+BEGIN
+    INSERT INTO CountryAggregates (country_id, power_plant_count, power_production)
+    VALUES (
+        NEW.country_id, 1,
+        IFNULL((SELECT production_mwh FROM PowerPlantsDatas WHERE type = NEW.type AND level = NEW.level), 0)
+    )
+    ON CONFLICT(country_id) DO UPDATE SET
+        power_plant_count = power_plant_count + 1,
+        power_production = power_production + excluded.power_production;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_aggregates_power_plant_delete
+AFTER DELETE ON PowerPlants
+WHEN OLD.country_id IS NOT NULL
+BEGIN
+    UPDATE CountryAggregates SET
+        power_plant_count = power_plant_count - 1,
+        power_production = power_production - IFNULL((SELECT production_mwh FROM PowerPlantsDatas WHERE type = OLD.type AND level = OLD.level), 0)
+    WHERE country_id = OLD.country_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_aggregates_power_plant_update
+AFTER UPDATE OF country_id, type, level ON PowerPlants
+WHEN OLD.country_id IS NOT NEW.country_id OR OLD.type != NEW.type OR OLD.level != NEW.level
+BEGIN
+    UPDATE CountryAggregates SET
+        power_plant_count = power_plant_count - 1,
+        power_production = power_production - IFNULL((SELECT production_mwh FROM PowerPlantsDatas WHERE type = OLD.type AND level = OLD.level), 0)
+    WHERE country_id = OLD.country_id;
+    INSERT INTO CountryAggregates (country_id, power_plant_count, power_production)
+    SELECT
+        NEW.country_id, 1,
+        IFNULL((SELECT production_mwh FROM PowerPlantsDatas WHERE type = NEW.type AND level = NEW.level), 0)
+    WHERE NEW.country_id IS NOT NULL
+    ON CONFLICT(country_id) DO UPDATE SET
+        power_plant_count = power_plant_count + 1,
+        power_production = power_production + excluded.power_production;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_aggregates_country_delete
+AFTER DELETE ON Countries
+BEGIN
+    DELETE FROM CountryAggregates WHERE country_id = OLD.country_id;
+END;
+
 -- VIEW : Population totale par pays
+-- Les vues d'agrégats lisent CountryAggregates (recréées pour les bases qui
+-- ont encore les anciennes versions calculées à la volée)
+DROP VIEW IF EXISTS PopulationView;
 CREATE VIEW IF NOT EXISTS PopulationView AS
 SELECT
     country_id,
-    SUM(population) AS population
-FROM Regions
-GROUP BY country_id;
+    population
+FROM CountryAggregates;
 
+DROP VIEW IF EXISTS CountryNumberOfRegions;
 CREATE VIEW IF NOT EXISTS CountryNumberOfRegions AS
 SELECT
     country_id,
-    COUNT(region_id) AS number_of_regions
-FROM Regions
-GROUP BY country_id;
+    region_count AS number_of_regions
+FROM CountryAggregates;
 
 -- VIEW : Capacité d’accueil par pays
+DROP VIEW IF EXISTS PopulationCapacityView;
 CREATE VIEW IF NOT EXISTS PopulationCapacityView AS
 SELECT
-    r.country_id,
-    SUM(s.capacity) AS population_capacity
-FROM Structures s
-JOIN Regions r ON s.region_id = r.region_id
-WHERE s.type IN ('Logement')  -- tu peux changer selon le gameplay
-GROUP BY r.country_id;
+    country_id,
+    housing_capacity AS population_capacity
+FROM CountryAggregates;
 
 -- VIEW : Vue globale des stats
+DROP VIEW IF EXISTS StatsView;
 CREATE VIEW IF NOT EXISTS StatsView AS
 SELECT
     c.country_id,
     c.name,
-    IFNULL(p.population, 0) AS population,
-    IFNULL(pc.population_capacity, 0) AS population_capacity,
+    IFNULL(a.population, 0) AS population,
+    IFNULL(a.housing_capacity, 0) AS population_capacity,
     -- Tech levels are stored per-domain in CountryTechnologies (Terrestre, Aerienne, Navale, Global)
     -- The view should not assume a single tech_level column in Stats (it doesn't exist).
     -- Consumers should query CountryTechnologies for domain-specific levels.
     IFNULL(s.gdp, 0) AS gdp
 FROM Countries c
 LEFT JOIN Stats s ON c.country_id = s.country_id
-LEFT JOIN PopulationView p ON c.country_id = p.country_id
-LEFT JOIN PopulationCapacityView pc ON c.country_id = pc.country_id;
+LEFT JOIN CountryAggregates a ON c.country_id = a.country_id;
 
+DROP VIEW IF EXISTS CountryStructuresView;
 CREATE VIEW IF NOT EXISTS CountryStructuresView AS
 SELECT
     c.country_id,
@@ -53,7 +226,7 @@ SELECT
     s.population
 FROM Structures s
 JOIN Regions r ON s.region_id = r.region_id
-JOIN Countries c ON r.country_id = c.country_id;
+JOIN Countries c ON s.country_id = c.country_id;
 
 CREATE VIEW IF NOT EXISTS CountryProductionView AS
 SELECT
@@ -67,6 +240,7 @@ FROM CountryTechnologyProduction p
 JOIN Countries c ON p.country_id = c.country_id
 JOIN Technologies t ON p.tech_id = t.tech_id;
 
+DROP VIEW IF EXISTS StructureProductionView;
 CREATE VIEW IF NOT EXISTS StructureProductionView AS
 SELECT
     sp.structure_id,
@@ -86,10 +260,10 @@ FROM StructureProduction sp
 JOIN Structures s ON sp.structure_id = s.id
 JOIN StructuresDatas sd ON s.type = sd.type AND s.specialisation = sd.specialisation AND s.level = sd.level
 JOIN Technologies t ON sp.tech_id = t.tech_id
--- join country tech levels for the owning country of the structure
 LEFT JOIN Regions r ON s.region_id = r.region_id
-LEFT JOIN CountryTechnologies ct ON ct.country_id = r.country_id AND ct.tech_field = t.specialisation
-LEFT JOIN CountryTechnologies cg ON cg.country_id = r.country_id AND cg.tech_field = 'Global'
+-- join country tech levels for the owning country of the structure
+LEFT JOIN CountryTechnologies ct ON ct.country_id = s.country_id AND ct.tech_field = t.specialisation
+LEFT JOIN CountryTechnologies cg ON cg.country_id = s.country_id AND cg.tech_field = 'Global'
 GROUP BY sp.structure_id;
 
 CREATE VIEW IF NOT EXISTS StructureFreeCapacityView AS
@@ -0,0 +1,135 @@
+"""
+Pool of long-lived aiosqlite connections used by AsyncDatabase.
+Opening an aiosqlite connection starts a thread and re-applies the PRAGMAs;
+the pool opens at most `size` connections, lazily, configures them once and
+hands them out to concurrent coroutines. Idle connections are health-checked
+before reuse and broken ones are replaced.
+"""
+
+import asyncio
+import sqlite3
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+import aiosqlite
+
+
+class AsyncConnectionPool:
+    """Bounded set of read-only aiosqlite connections on the same SQLite file."""
+
+    def __init__(
+        self,
+        db_path: str = "datas/rts.db",
+        size: int = 4,
+        timeout: float = 30.0,
+        health_check_interval: float = 60.0,
+        connect_kwargs: dict = None,
+    ):
+        self.db_path = db_path
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self._connect_kwargs = connect_kwargs or {}
+        self._slots = asyncio.Semaphore(self.size)
+        self._idle = deque()  # (connection, last used at)
+        self._open = 0
+        self._closed = False
+        self.stats = {"connections": 0, "acquires": 0, "reconnects": 0}
+
+    async def _connect(self) -> aiosqlite.Connection:
+        conn = aiosqlite.connect(
+            self.db_path, timeout=self.timeout, **self._connect_kwargs
+        )
+        # aiosqlite runs each connection on its own thread; a pooled one must
+        # not keep the process alive if the pool is never closed
+        conn.daemon = True
+        await conn
+        try:
+            await conn.execute("PRAGMA journal_mode=WAL")
+            await conn.execute("PRAGMA synchronous=NORMAL")
+            # AsyncDatabase only reads: never take the write lock by accident
+            await conn.execute("PRAGMA query_only=ON")
+            conn.row_factory = aiosqlite.Row
+        except Exception:
+            await conn.close()
+            raise
+        self._open += 1
+        self.stats["connections"] += 1
+        return conn
+
+    async def _discard(self, conn: aiosqlite.Connection):
+        self._open -= 1
+        try:
+            await conn.close()
+        except Exception:
+            pass
+
+    async def _is_healthy(self, conn: aiosqlite.Connection) -> bool:
+        try:
+            async with conn.execute("SELECT 1") as cursor:
+                await cursor.fetchone()
+            return True
+        except (sqlite3.Error, ValueError):
+            return False
+
+    @asynccontextmanager
+    async def connection(self):
+        """Borrow a connection; at most `size` are in use at the same time."""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection pool is closed.")
+        await asyncio.wait_for(self._slots.acquire(), self.timeout)
+        conn = None
+        try:
+            if self._idle:
+                conn, last_used = self._idle.pop()
+                if time.monotonic() - last_used > self.health_check_interval:
+                    if not await self._is_healthy(conn):
+                        await self._discard(conn)
+                        self.stats["reconnects"] += 1
+                        conn = None
+            if conn is None:
+                conn = await self._connect()
+            self.stats["acquires"] += 1
+            try:
+                yield conn
+            except ValueError:
+                # aiosqlite raises ValueError once its connection thread is gone
+                await self._discard(conn)
+                conn = None
+                raise
+        finally:
+            if conn is not None:
+                if self._closed:
+                    await self._discard(conn)
+                else:
+                    self._idle.append((conn, time.monotonic()))
+            self._slots.release()
+
+    def get_stats(self) -> dict:
+        """Pool size and usage counters."""
+        return {
+            **self.stats,
+            "size": self.size,
+            "open": self._open,
+            "idle": len(self._idle),
+            "in_use": self._open - len(self._idle),
+        }
+
+    async def close(self, timeout: float = 10.0):
+        """Wait (up to `timeout`) for borrowed connections, then close them all."""
+        self._closed = True
+        acquired = 0
+        try:
+            for _ in range(self.size):
+                await asyncio.wait_for(self._slots.acquire(), timeout)
+                acquired += 1
+        except asyncio.TimeoutError:
+            print(
+                f"[AsyncDB] {self.size - acquired} connection(s) still in use at shutdown"
+            )
+        while self._idle:
+            conn, _ = self._idle.pop()
+            await self._discard(conn)
+        for _ in range(acquired):
+            self._slots.release()
@@ -3,39 +3,45 @@ Async database module for read-only operations to avoid SQLite cursor conflicts.
 Uses aiosqlite for async database operations with WAL mode for concurrent access.
 """
 
-import aiosqlite
 import asyncio
 from typing import Optional, List, Dict, Any
 import os
+from async_db_pool import AsyncConnectionPool
+from sql_trace import SqlTracer, get_tracer, connect_kwargs
 
 
 class AsyncDatabase:
     """Async database class for read-only operations to avoid cursor conflicts."""
 
-    def __init__(self, db_path: str = "datas/rts.db"):
+    def __init__(
+        self,
+        db_path: str = "datas/rts.db",
+        tracer: SqlTracer = None,
+        pool_size: int = 4,
+    ):
         self.db_path = db_path
+        # Long-lived connections, configured once (WAL, read-only, Row factory).
+        # Opt-in SQL tracing is shared with Database (see sql_trace.enable_tracing)
+        self.pool = AsyncConnectionPool(
+            db_path,
+            size=pool_size,
+            connect_kwargs=connect_kwargs(tracer or get_tracer()),
+        )
+
+    async def close(self):
+        """Close the pooled connections once the queries in flight are done."""
+        await self.pool.close()
 
     async def _execute_query(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
         """Execute a SELECT query and return results as list of dictionaries."""
-        async with aiosqlite.connect(self.db_path) as db:
-            # Enable WAL mode for concurrent access
-            await db.execute("PRAGMA journal_mode=WAL")
-            await db.execute("PRAGMA synchronous=NORMAL")
-            
-            # Enable row factory for dict-like access
-            db.row_factory = aiosqlite.Row
-            
+        async with self.pool.connection() as db:
             async with db.execute(query, params) as cursor:
                 rows = await cursor.fetchall()
                 return [dict(row) for row in rows]
 
     async def _execute_scalar(self, query: str, params: tuple = ()) -> Any:
         """Execute a query and return a single scalar value."""
-        async with aiosqlite.connect(self.db_path) as db:
-            # Enable WAL mode for concurrent access
-            await db.execute("PRAGMA journal_mode=WAL")
-            await db.execute("PRAGMA synchronous=NORMAL")
-            
+        async with self.pool.connection() as db:
             async with db.execute(query, params) as cursor:
                 row = await cursor.fetchone()
                 return row[0] if row else None
@@ -226,6 +232,86 @@ class AsyncDatabase:
                 "free_percentage": 0.0,
             }
 
+    @staticmethod
+    def _region_statistics(
+        total_regions: int, controlled_regions: int, played_countries: int, total_countries: int
+    ) -> Dict[str, Any]:
+        """Statistics dict shared by the continent and world variants."""
+        free_regions = total_regions - controlled_regions
+        return {
+            "total_regions": total_regions,
+            "controlled_regions": controlled_regions,
+            "free_regions": free_regions,
+            "total_countries": total_countries,
+            "played_countries": played_countries,
+            "unplayed_countries": max(0, total_countries - played_countries),
+            "control_percentage": (
+                (controlled_regions / total_regions * 100) if total_regions > 0 else 0
+            ),
+            "free_percentage": (
+                (free_regions / total_regions * 100) if total_regions > 0 else 0
+            ),
+        }
+
+    async def get_all_statistics_async(self, continents: List[str] = ()) -> Dict[str, Any]:
+        """Statistics of every continent and of the world from a single pass over Regions.
+
+        Returns {"world": {...}, "continents": {continent: {...}}} with the same
+        keys as get_continental_statistics_async / get_world_statistics_async.
+        `continents` lists continents to report even if they have no region.
+        """
+        # One row per continent, from a walk of idx_regions_continent
+        rows = await self._execute_query(
+            """
+            SELECT continent, COUNT(*) AS total_regions,
+                   COUNT(country_id) AS controlled_regions,
+                   group_concat(DISTINCT country_id) AS owners
+            FROM Regions
+            GROUP BY continent
+            """
+        )
+        total_countries = await self._execute_scalar("SELECT COUNT(*) FROM Countries") or 0
+
+        region_counts = {}  # continent -> (total regions, controlled regions)
+        owners = {}  # continent -> set of country ids
+        for row in rows:
+            region_counts[row["continent"]] = (
+                row["total_regions"],
+                row["controlled_regions"],
+            )
+            owners[row["continent"]] = (
+                set(row["owners"].split(",")) if row["owners"] else set()
+            )
+        all_owners = set().union(*owners.values())
+        # Like get_continental_statistics_async, a continent's country total
+        # also counts countries without any region (and owners of regions
+        # without a continent)
+        landless_countries = max(0, total_countries - len(all_owners))
+        unassigned_owners = owners.get(None, set())
+
+        continent_stats = {}
+        for continent in list(continents) + [c for c in region_counts if c is not None]:
+            if continent in continent_stats:
+                continue
+            total_regions, controlled_regions = region_counts.get(continent, (0, 0))
+            played = owners.get(continent, set())
+            continent_stats[continent] = self._region_statistics(
+                total_regions,
+                controlled_regions,
+                len(played),
+                max(len(played), len(played | unassigned_owners) + landless_countries),
+            )
+
+        return {
+            "world": self._region_statistics(
+                sum(counts[0] for counts in region_counts.values()),
+                sum(counts[1] for counts in region_counts.values()),
+                len(all_owners),
+                total_countries,
+            ),
+            "continents": continent_stats,
+        }
+
     async def get_continent_country_count_async(self, continent: str) -> int:
         """Get the number of countries in a specific continent - async version."""
         try:
@@ -0,0 +1,127 @@
+"""
+Online backups of the game database.
+Snapshots are taken with SQLite's backup API from a dedicated read-only
+connection, `pages_per_step` pages at a time with a short pause between steps,
+on a worker thread: the bot keeps writing (WAL) and the event loop keeps
+running while the copy progresses. The copy reads a single WAL snapshot, so
+it is consistent and the bot's commits never force it to start over. The copy
+is written to a temporary file, checked, then renamed into `backup_dir`, where
+only the `keep` most recent snapshots are kept.
+"""
+
+import asyncio
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+BACKUP_PREFIX = "rts-"
+BACKUP_SUFFIX = ".db"
+
+
+class BackupManager:
+    """Rotated online snapshots of one SQLite database."""
+
+    def __init__(
+        self,
+        db_path: str = "datas/rts.db",
+        backup_dir: str = "datas/backups",
+        keep: int = 7,
+        pages_per_step: int = 256,
+        step_pause: float = 0.005,
+    ):
+        self.db_path = db_path
+        self.backup_dir = backup_dir
+        self.keep = keep
+        self.pages_per_step = pages_per_step
+        self.step_pause = step_pause
+        self._lock = asyncio.Lock()
+        self.last_result = None
+
+    def _copy(self, dest_path: str) -> dict:
+        """Blocking stepped copy of the database into `dest_path`."""
+        steps = 0
+
+        def progress(status, remaining, total):
+            nonlocal steps
+            steps += 1
+            # Give the bot's threads the GIL and the disk between two steps
+            if remaining and self.step_pause:
+                time.sleep(self.step_pause)
+
+        source = sqlite3.connect(
+            f"file:{quote(self.db_path)}?mode=ro", uri=True, isolation_level=None
+        )
+        try:
+            # Pin one WAL snapshot for the whole copy: commits made meanwhile
+            # by the bot's connections would otherwise restart the backup
+            source.execute("BEGIN")
+            source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+            target = sqlite3.connect(dest_path)
+            try:
+                source.backup(target, pages=self.pages_per_step, progress=progress)
+                check = target.execute("PRAGMA quick_check").fetchone()[0]
+                pages = target.execute("PRAGMA page_count").fetchone()[0]
+            finally:
+                target.close()
+        finally:
+            source.close()
+        if check != "ok":
+            raise sqlite3.DatabaseError(f"Snapshot corrompu : {check}")
+        return {"pages": pages, "steps": steps}
+
+    def list_backups(self) -> list:
+        """Snapshot paths, newest first."""
+        if not os.path.isdir(self.backup_dir):
+            return []
+        return sorted(
+            (
+                os.path.join(self.backup_dir, name)
+                for name in os.listdir(self.backup_dir)
+                if name.startswith(BACKUP_PREFIX) and name.endswith(BACKUP_SUFFIX)
+            ),
+            reverse=True,
+        )
+
+    def _rotate(self) -> list:
+        removed = []
+        for path in self.list_backups()[max(1, self.keep) :]:
+            try:
+                os.remove(path)
+                removed.append(path)
+            except OSError as e:
+                print(f"Error removing old backup {path}: {e}")
+        return removed
+
+    def backup(self) -> dict:
+        """Take a snapshot now (blocking). Returns what was done."""
+        started = time.perf_counter()
+        os.makedirs(self.backup_dir, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(self.backup_dir, f"{BACKUP_PREFIX}{stamp}{BACKUP_SUFFIX}")
+        partial = path + ".partial"
+        try:
+            copied = self._copy(partial)
+            os.replace(partial, path)
+        except (sqlite3.Error, OSError) as e:
+            print(f"Error backing up {self.db_path}: {e}")
+            if os.path.exists(partial):
+                os.remove(partial)
+            result = {"success": False, "error": str(e)}
+        else:
+            result = {
+                "success": True,
+                "path": path,
+                "size": os.path.getsize(path),
+                **copied,
+                "duration_ms": (time.perf_counter() - started) * 1000,
+                "removed": self._rotate(),
+            }
+        self.last_result = result
+        return result
+
+    async def run(self) -> dict:
+        """Take a snapshot on a worker thread; concurrent calls wait their turn."""
+        async with self._lock:
+            return await asyncio.to_thread(self.backup)
@@ -9,18 +9,21 @@ import asyncio
 import aiohttp
 import contextlib
 import io
+import os
 import json
 from typing import Union
 from datetime import datetime, timedelta, timezone
 
 from shared_utils import (
     get_db,
+    get_db_executor,
     get_discord_utils,
     CountryEntity,
     CountryConverter,
     ERROR_COLOR_INT as error_color_int,
 )
 from text_formatting import convert_country_name_channel
+from sql_trace import add_top_fields, format_stats_line, get_tracer
 from removebg import RemoveBg
 from dotenv import dotenv_values
 from groq import Groq
@@ -791,6 +794,288 @@ class AdminUtilities(commands.Cog):
         except Exception as e:
             await ctx.send(f"❌ Erreur lors de la requête : {e}")
 
+    @commands.hybrid_command(
+        name="db_queue_stats",
+        brief="Affiche les métriques du thread de base de données.",
+        usage="db_queue_stats",
+        description="Affiche la profondeur de file et les temps d'attente des requêtes exécutées sur le thread DB.",
+        help="""Affiche les métriques de la file d'exécution de la base de données.
+
+        INFORMATIONS AFFICHÉES :
+        - Profondeur actuelle et maximale de la file
+        - Nombre de requêtes soumises, terminées et en erreur
+        - Temps d'attente moyen, p95 et max avant exécution
+        - Temps d'exécution moyen et p95
+
+        RESTRICTIONS :
+        - Réservé aux administrateurs uniquement
+
+        EXEMPLE :
+        - `db_queue_stats` : Affiche les métriques actuelles
+        """,
+        hidden=False,
+        enabled=True,
+        case_insensitive=True,
+    )
+    @commands.has_permissions(administrator=True)
+    async def db_queue_stats(self, ctx):
+        """Show database executor queue metrics (Admin only)."""
+        metrics = get_db_executor().get_metrics()
+        embed = discord.Embed(
+            title="📊 File d'exécution de la base de données",
+            color=discord.Color.blue(),
+        )
+        embed.add_field(
+            name="File",
+            value=f"Actuelle : {metrics['queue_depth']}\nMax : {metrics['max_queue_depth']}",
+        )
+        embed.add_field(
+            name="Requêtes",
+            value=(
+                f"Soumises : {metrics['submitted']}\n"
+                f"Terminées : {metrics['completed']}\n"
+                f"Erreurs : {metrics['failed']}"
+            ),
+        )
+        embed.add_field(
+            name="Attente (ms)",
+            value=(
+                f"Moy. : {metrics['wait_avg_ms']:.2f}\n"
+                f"p95 : {metrics['wait_p95_ms']:.2f}\n"
+                f"Max : {metrics['wait_max_ms']:.2f}"
+            ),
+        )
+        embed.add_field(
+            name="Exécution (ms)",
+            value=f"Moy. : {metrics['run_avg_ms']:.2f}\np95 : {metrics['run_p95_ms']:.2f}",
+        )
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(
+        name="sql_stats",
+        brief="Affiche les requêtes SQL les plus coûteuses.",
+        usage="sql_stats [top] [tri] [reset]",
+        description="Affiche le top des requêtes SQL tracées (nombre, temps total, p50/p95/p99, lignes).",
+        help="""Affiche les statistiques du traçage SQL (activé avec SQL_TRACE=1 dans le .env).
+
+        INFORMATIONS AFFICHÉES :
+        - Nombre d'exécutions et temps total par requête
+        - Latences p50, p95 et p99
+        - Nombre de lignes renvoyées ou modifiées
+        - Rapport complet joint en fichier texte
+
+        RESTRICTIONS :
+        - Réservé aux super-administrateurs uniquement
+
+        ARGUMENTS :
+        - `[top]` : Nombre de requêtes à afficher (défaut : 10, max : 25)
+        - `[tri]` : total, count, p95, max ou rows (défaut : total)
+        - `[reset]` : Remet les statistiques à zéro après l'affichage
+
+        EXEMPLE :
+        - `sql_stats 5 p95` : Les 5 requêtes avec le pire p95
+        """,
+        hidden=False,
+        enabled=True,
+        case_insensitive=True,
+    )
+    async def sql_stats(
+        self,
+        ctx,
+        top: int = commands.parameter(
+            default=10, description="Nombre de requêtes à afficher"
+        ),
+        order_by: str = commands.parameter(
+            default="total", description="Tri : total, count, p95, max ou rows"
+        ),
+        reset: bool = commands.parameter(
+            default=False, description="Remettre les statistiques à zéro"
+        ),
+    ):
+        """Dump the top-N traced SQL statements (Super admin only)."""
+        if ctx.author.id not in self.bi_admins_id:
+            embed = discord.Embed(
+                title="Vous n'êtes pas autorisé à effectuer cette commande.",
+                description=f"{self.Erreurs.get('Erreur ', '')}",
+                color=error_color_int,
+            )
+            await ctx.send(embed=embed)
+            return
+        tracer = get_tracer()
+        if tracer is None:
+            await ctx.send(
+                "Le traçage SQL est désactivé (ajoutez `SQL_TRACE=1` au .env et redémarrez le bot)."
+            )
+            return
+
+        summary = tracer.get_summary()
+        statements = tracer.get_top(max(1, min(top, 25)), order_by)
+        embed = discord.Embed(
+            title="🐢 Requêtes SQL les plus coûteuses",
+            description=(
+                f"{summary['executions']} exécutions de {summary['statements']} requêtes, "
+                f"{summary['total_ms']:.0f} ms au total depuis <t:{int(summary['since'])}:R>.\n"
+                f"Requêtes lentes (≥ {summary['slow_threshold_ms']:.0f} ms) : {summary['slow_queries']}"
+            ),
+            color=discord.Color.blue(),
+        )
+        # The whole list goes to sql_stats.txt; the embed keeps what fits
+        footer = f"{len(statements)} requêtes de plus dans sql_stats.txt"
+        shown = add_top_fields(embed, statements, reserve=len(footer))
+        if shown < len(statements):
+            embed.set_footer(
+                text=f"{len(statements) - shown} requêtes de plus dans sql_stats.txt"
+            )
+        report = io.StringIO()
+        for index, stat in enumerate(statements, 1):
+            report.write(f"#{index} {format_stats_line(stat)}\n{stat['sql']}\n\n")
+        report_file = discord.File(
+            io.BytesIO(report.getvalue().encode("utf-8")), filename="sql_stats.txt"
+        )
+        await ctx.send(embed=embed, file=report_file)
+        if reset:
+            tracer.reset()
+
+    @commands.hybrid_command(
+        name="backup_db",
+        brief="Sauvegarde la base de données à chaud.",
+        usage="backup_db",
+        description="Prend un snapshot de la base de données sans interrompre le bot.",
+        help="""Prend un snapshot de la base de données pendant que le bot tourne.
+
+        FONCTIONNALITÉ :
+        - Copie en ligne via l'API de sauvegarde SQLite, par petits blocs
+        - Le bot reste utilisable pendant la copie
+        - Vérification d'intégrité du snapshot avant de le conserver
+        - Seuls les derniers snapshots sont gardés (BACKUP_KEEP dans le .env)
+
+        RESTRICTIONS :
+        - Réservé aux super-administrateurs uniquement
+
+        EXEMPLE :
+        - `backup_db` : Sauvegarde la base maintenant
+        """,
+        hidden=False,
+        enabled=True,
+        case_insensitive=True,
+    )
+    async def backup_db(self, ctx):
+        """Take an online snapshot of the database (Super admin only)."""
+        if ctx.author.id not in self.bi_admins_id:
+            embed = discord.Embed(
+                title="Vous n'êtes pas autorisé à effectuer cette commande.",
+                description=f"{self.Erreurs.get('Erreur ', '')}",
+                color=error_color_int,
+            )
+            await ctx.send(embed=embed)
+            return
+
+        await ctx.defer()
+        result = await self.db.backups.run()
+        if not result["success"]:
+            embed = discord.Embed(
+                title="❌ Échec de la sauvegarde",
+                description=f"```{result['error']}```",
+                color=error_color_int,
+            )
+            await ctx.send(embed=embed)
+            return
+
+        kept = self.db.backups.list_backups()
+        embed = discord.Embed(
+            title="💾 Sauvegarde effectuée",
+            description=(
+                f"`{result['path']}` ({result['size'] / 1_000_000:.1f} Mo, "
+                f"{result['pages']} pages en {result['steps']} étapes) "
+                f"en {result['duration_ms'] / 1000:.1f} s."
+            ),
+            color=discord.Color.green(),
+        )
+        embed.add_field(
+            name=f"Snapshots conservés ({len(kept)})",
+            value="\n".join(f"`{os.path.basename(path)}`" for path in kept[:10]),
+            inline=False,
+        )
+        if result["removed"]:
+            embed.set_footer(text=f"{len(result['removed'])} ancien(s) snapshot(s) supprimé(s)")
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(
+        name="check_aggregates",
+        brief="Vérifie les agrégats par pays (population, bâtiments, électricité).",
+        usage="check_aggregates [repair]",
+        description="Recalcule CountryAggregates et le compare à la table tenue par les triggers.",
+        help="""Vérifie la table CountryAggregates en la recalculant entièrement.
+
+        FONCTIONNALITÉ :
+        - Recompte population, régions, capacité des logements, bâtiments par type et centrales
+        - Liste les pays dont les agrégats stockés sont faux
+        - Avec `repair`, réécrit la table à partir du recompte
+
+        RESTRICTIONS :
+        - Réservé aux super-administrateurs uniquement
+
+        EXEMPLE :
+        - `check_aggregates` : Vérifie sans rien modifier
+        - `check_aggregates True` : Vérifie et répare
+        """,
+        hidden=False,
+        enabled=True,
+        case_insensitive=True,
+    )
+    async def check_aggregates(
+        self,
+        ctx,
+        repair: bool = commands.parameter(
+            description="Réécrire la table si des écarts sont trouvés.", default=False
+        ),
+    ):
+        """Check (and optionally rebuild) CountryAggregates (Super admin only)."""
+        if ctx.author.id not in self.bi_admins_id:
+            embed = discord.Embed(
+                title="Vous n'êtes pas autorisé à effectuer cette commande.",
+                description=f"{self.Erreurs.get('Erreur ', '')}",
+                color=error_color_int,
+            )
+            await ctx.send(embed=embed)
+            return
+
+        await ctx.defer()
+        result = self.db.check_country_aggregates(repair=repair)
+        if not result["success"]:
+            embed = discord.Embed(
+                title="❌ Échec de la vérification",
+                description=f"```{result['error']}```",
+                color=error_color_int,
+            )
+            await ctx.send(embed=embed)
+            return
+
+        mismatches = result["mismatches"]
+        embed = discord.Embed(
+            title="📊 Agrégats par pays",
+            description=(
+                f"{result['countries']} pays recomptés, "
+                f"{len(mismatches)} écart(s) trouvé(s)"
+                + (" et corrigé(s)." if result["repaired"] else ".")
+            ),
+            color=discord.Color.orange() if mismatches else discord.Color.green(),
+        )
+        for mismatch in mismatches[:10]:
+            differences = [
+                f"{column} : {mismatch['stored'][column]} → {value}"
+                for column, value in mismatch["expected"].items()
+                if mismatch["stored"][column] != value
+            ]
+            embed.add_field(
+                name=f"Pays {mismatch['country_id']}",
+                value="\n".join(differences),
+                inline=False,
+            )
+        if len(mismatches) > 10:
+            embed.set_footer(text=f"... et {len(mismatches) - 10} autre(s) pays")
+        await ctx.send(embed=embed)
+
     @commands.hybrid_command(
         name="leak_inventory",
         brief="Affiche le contenu de la base de données d'inventaire.",
@@ -11,6 +11,7 @@ import random
 # Import centralized utilities
 from shared_utils import (
     get_db,
+    get_db_executor,
     get_discord_utils,
     CountryEntity,
     CountryConverter,
@@ -37,6 +38,7 @@ class Economy(commands.Cog):
 
         # Get utilities instances
         self.db = get_db()
+        self.adb = get_db_executor()
         self.dUtils = get_discord_utils(bot, self.db)
 
     @commands.hybrid_command(
@@ -192,7 +194,7 @@ class Economy(commands.Cog):
             )
             await ctx.send(embed=embed)
             return
-        sender_balance = self.db.get_balance(author.get("id"))
+        sender_balance = await self.adb.get_balance(author.get("id"))
         if sender_balance is None:
             sender_balance = 0
         payment_amount = amount_converter(amount, sender_balance)
@@ -204,7 +206,7 @@ class Economy(commands.Cog):
             )
             await ctx.send(embed=embed)
             return
-        if not self.db.has_enough_balance(author.get("id"), payment_amount):
+        if not await self.adb.has_enough_balance(author.get("id"), payment_amount):
             print(sender_balance, payment_amount)
             embed = discord.Embed(
                 title="Erreur de donation",
@@ -213,8 +215,12 @@ class Economy(commands.Cog):
             )
             await ctx.send(embed=embed)
             return
-        self.db.give_balance(country.get("id"), payment_amount)
-        self.db.take_balance(author.get("id"), payment_amount)
+        # Both sides of the transfer are committed together
+        def transfer():
+            self.db.give_balance(country.get("id"), payment_amount, reason="transfer")
+            self.db.take_balance(author.get("id"), payment_amount, reason="transfer")
+
+        await self.adb.run_in_transaction(transfer)
         transa_embed = discord.Embed(
             title="Opération réussie",
             description=f":moneybag: **{convert(str(payment_amount))}** ont été donnés à {country.get('role').mention}.",
@@ -290,7 +296,7 @@ class Economy(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        self.db.give_balance(country.get("id"), amount)
+        self.db.give_balance(country.get("id"), amount, reason="admin_add")
         embed = discord.Embed(
             title="Opération réussie",
             description=f":moneybag: **{convert(str(amount))}** ont été ajoutés à l'utilisateur {country.get('name')}.",
@@ -387,7 +393,7 @@ class Economy(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        self.db.take_balance(country.get("id"), payment_amount)
+        self.db.take_balance(country.get("id"), payment_amount, reason="admin_remove")
 
         embed = discord.Embed(
             title="Opération réussie",
@@ -459,7 +465,7 @@ class Economy(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        self.db.set_balance(country.get("id"), amount)
+        self.db.set_balance(country.get("id"), amount, reason="admin_set")
 
         embed = discord.Embed(
             title="Opération réussie",
@@ -534,7 +540,7 @@ class Economy(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        self.db.take_balance(country.get("id"), payment_amount)
+        self.db.take_balance(country.get("id"), payment_amount, reason="payment")
         embed = discord.Embed(
             title="Opération réussie",
             description=f":moneybag: **{convert(str(payment_amount))}** ont été payés au bot.",
@@ -708,7 +714,7 @@ class Economy(commands.Cog):
                 return await ctx.send(embed=embed)
 
             # Add money to country balance
-            self.db.give_balance(country_id, amount)
+            self.db.give_balance(country_id, amount, reason="loan")
 
             # Log the transaction
             await eco_logger(
@@ -972,12 +978,14 @@ class Economy(commands.Cog):
                 return await ctx.send(embed=embed)
 
             # Process repayment
-            self.db.take_balance(country_id, repayment_amount)
+            self.db.take_balance(country_id, repayment_amount, reason="loan_repayment")
             success = self.db.update_debt_amount(reference, repayment_amount)
 
             if not success:
                 # Refund the money if debt update failed
-                self.db.give_balance(country_id, repayment_amount)
+                self.db.give_balance(
+                    country_id, repayment_amount, reason="loan_repayment_refund"
+                )
                 embed = discord.Embed(
                     title="❌ Erreur",
                     description="Impossible de traiter le remboursement.",
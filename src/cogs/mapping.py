@@ -68,7 +68,7 @@ class MappingCog(commands.Cog):
             self.base_array = np.array(self.base_img)
             print("[MappingCog] Created fallback base image")
 
-    def cog_unload(self):
+    async def cog_unload(self):
         """Clean up resources when the cog is unloaded."""
         try:
             if hasattr(self, 'executor'):
@@ -76,6 +76,11 @@ class MappingCog(commands.Cog):
                 print("[MappingCog] Thread pool executor shut down")
         except Exception as e:
             print(f"[MappingCog] Error during cleanup: {e}")
+        try:
+            await self.async_db.close()
+            print("[MappingCog] Async database pool closed")
+        except Exception as e:
+            print(f"[MappingCog] Error closing async database pool: {e}")
 
     def _load_region_colors(self):
         """Load region colors from CSV for optimization."""
@@ -700,7 +705,7 @@ class MappingCog(commands.Cog):
     ) -> list:
         """Get regions data with optional filtering."""
         try:
-            cursor = self.db.cur
+            rows = []
 
             if filter_key == "All" or not filter_value:
                 # For "All" case, we return empty list to trigger CSV-based processing
@@ -712,7 +717,7 @@ class MappingCog(commands.Cog):
                     return []
 
                 # If filter_value is None but filter_key is not "All", get all regions
-                cursor.execute(
+                rows = self.db.fetch_all(
                     """
                     SELECT r.region_id, r.country_id, r.name, r.region_color_hex, 
                            r.continent, r.geographical_area_id, ga.name as geographical_area_name,
@@ -723,7 +728,7 @@ class MappingCog(commands.Cog):
                 """
                 )
             elif filter_key == "Continent":
-                cursor.execute(
+                rows = self.db.fetch_all(
                     """
                     SELECT r.region_id, r.country_id, r.name, r.region_color_hex, 
                            r.continent, r.geographical_area_id, ga.name as geographical_area_name,
@@ -736,7 +741,7 @@ class MappingCog(commands.Cog):
                     (filter_value,),
                 )
             elif filter_key == "GeographicAreas":
-                cursor.execute(
+                rows = self.db.fetch_all(
                     """
                     SELECT r.region_id, r.country_id, r.name, r.region_color_hex, 
                            r.continent, r.geographical_area_id, ga.name as geographical_area_name,
@@ -749,7 +754,7 @@ class MappingCog(commands.Cog):
                     (filter_value,),
                 )
             elif filter_key == "Countries":
-                cursor.execute(
+                rows = self.db.fetch_all(
                     """
                     SELECT r.region_id, r.country_id, r.name, r.region_color_hex, 
                            r.continent, r.geographical_area_id, ga.name as geographical_area_name,
@@ -762,7 +767,7 @@ class MappingCog(commands.Cog):
                     (filter_value,),
                 )
 
-            result = [dict(row) for row in cursor.fetchall()]
+            result = [dict(row) for row in rows]
             print(
                 f"[Mapping] Database query returned {len(result)} regions for filter {filter_key}={filter_value}"
             )
@@ -1041,8 +1046,7 @@ class MappingCog(commands.Cog):
 
     def get_all_regions(self):
         try: 
-            cursor = self.db.cur
-            cursor.execute(
+            rows = self.db.fetch_all(
                 """
                 SELECT r.region_id, r.country_id, r.name, r.region_color_hex, 
                     r.continent, r.geographical_area_id, ga.name as geographical_area_name,
@@ -1052,7 +1056,7 @@ class MappingCog(commands.Cog):
                 LEFT JOIN Countries c ON r.country_id = c.country_id
             """
             )
-            return  [dict(row) for row in cursor.fetchall()]
+            return  [dict(row) for row in rows]
         except Exception as e:
             print(f"[Mapping] Error fetching regions: {e}", flush=True)
             return []
@@ -1424,11 +1428,9 @@ class MappingCog(commands.Cog):
     ):
         """Autocomplete for country names."""
         try:
-            cursor = self.db.cur
-            cursor.execute(
+            countries = self.db.fetch_all(
                 "SELECT name FROM Countries WHERE name LIKE ?", (f"%{current}%",)
             )
-            countries = cursor.fetchall()
             return [
                 app_commands.Choice(name=country[0], value=country[0])
                 for country in countries[:25]  # Discord limit
@@ -1517,6 +1519,13 @@ class MappingCog(commands.Cog):
             
             print(f"[Map Update] Generating {len(continents)} continental maps and 1 world map in parallel...")
             
+            # Statistics of every map from a single pass over Regions
+            try:
+                all_stats = await self.async_db.get_all_statistics_async(continents)
+            except Exception as e:
+                print(f"[Map Update] Error gathering statistics, falling back to per-map queries: {e}")
+                all_stats = None
+            
             # Create semaphore to limit concurrent map generations and prevent memory overload
             semaphore = asyncio.Semaphore(3)  # Max 3 concurrent map generations
 
@@ -1529,7 +1538,10 @@ class MappingCog(commands.Cog):
                         # Pre-generation memory check
                         gc.collect()
                         
-                        result = await self._generate_continent_map_with_stats_safe(continent)
+                        result = await self._generate_continent_map_with_stats_safe(
+                            continent,
+                            all_stats["continents"].get(continent) if all_stats else None,
+                        )
                         
                         # Force garbage collection after each map generation
                         gc.collect()
@@ -1559,7 +1571,7 @@ class MappingCog(commands.Cog):
                         # Pre-generation memory check
                         gc.collect()
                         
-                        result = await self._generate_world_map_with_stats_safe(continents)
+                        result = await self._generate_world_map_with_stats_safe(continents, all_stats)
                         
                         # Force garbage collection after world map generation
                         gc.collect()
@@ -1717,24 +1729,28 @@ class MappingCog(commands.Cog):
             gc.collect()
             print("[Map Update] Memory cleanup completed")
 
-    async def _generate_continent_map_with_stats_safe(self, continent: str):
-        """Generate a single continent map with enhanced error handling and memory management."""
+    async def _generate_continent_map_with_stats_safe(self, continent: str, continental_stats: dict = None):
+        """Generate a single continent map with enhanced error handling and memory management.
+
+        `continental_stats` comes from get_all_statistics_async when the caller
+        already gathered it; otherwise it is queried here.
+        """
         try:
             print(f"[Map Update] Processing continent: {continent}")
             
             # Get continental statistics using async database with retry
             max_retries = 3
-            continental_stats = None
             
-            for attempt in range(max_retries):
-                try:
-                    continental_stats = await self.async_db.get_continental_statistics_async(continent)
-                    break
-                except Exception as e:
-                    print(f"[Map Update] Attempt {attempt + 1}/{max_retries} failed for {continent} stats: {e}")
-                    if attempt == max_retries - 1:
-                        raise e
-                    await asyncio.sleep(1)
+            if continental_stats is None:
+                for attempt in range(max_retries):
+                    try:
+                        continental_stats = await self.async_db.get_continental_statistics_async(continent)
+                        break
+                    except Exception as e:
+                        print(f"[Map Update] Attempt {attempt + 1}/{max_retries} failed for {continent} stats: {e}")
+                        if attempt == max_retries - 1:
+                            raise e
+                        await asyncio.sleep(1)
             
             if not continental_stats:
                 print(f"[Map Update] No statistics available for {continent}")
@@ -1866,24 +1882,29 @@ class MappingCog(commands.Cog):
             print(f"[Map Update] Error processing continent {continent}: {e}")
             raise e
 
-    async def _generate_world_map_with_stats_safe(self, continents: List[str]):
-        """Generate world map with enhanced error handling and memory management."""
+    async def _generate_world_map_with_stats_safe(self, continents: List[str], all_stats: dict = None):
+        """Generate world map with enhanced error handling and memory management.
+
+        `all_stats` comes from get_all_statistics_async when the caller already
+        gathered it; otherwise the world statistics are queried here.
+        """
         try:
             print(f"[Map Update] Processing world map...")
             
             # Get world statistics using async database with retry
             max_retries = 3
-            world_stats = None
+            world_stats = all_stats["world"] if all_stats else None
             
-            for attempt in range(max_retries):
-                try:
-                    world_stats = await self.async_db.get_world_statistics_async()
-                    break
-                except Exception as e:
-                    print(f"[Map Update] Attempt {attempt + 1}/{max_retries} failed for world stats: {e}")
-                    if attempt == max_retries - 1:
-                        raise e
-                    await asyncio.sleep(1)
+            if world_stats is None:
+                for attempt in range(max_retries):
+                    try:
+                        world_stats = await self.async_db.get_world_statistics_async()
+                        break
+                    except Exception as e:
+                        print(f"[Map Update] Attempt {attempt + 1}/{max_retries} failed for world stats: {e}")
+                        if attempt == max_retries - 1:
+                            raise e
+                        await asyncio.sleep(1)
             
             if not world_stats:
                 print(f"[Map Update] No world statistics available")
@@ -1941,7 +1962,10 @@ class MappingCog(commands.Cog):
                 continent_counts = []
                 for continent in continents:
                     try:
-                        count = await self.async_db.get_continent_country_count_async(continent)
+                        if all_stats:
+                            count = all_stats["continents"][continent]["played_countries"]
+                        else:
+                            count = await self.async_db.get_continent_country_count_async(continent)
                         continent_counts.append(count)
                     except Exception as e:
                         print(f"[Map Update] Error getting count for {continent}: {e}")
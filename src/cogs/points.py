@@ -85,7 +85,9 @@ class Points(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        self.db.take_points(target_id, payment_amount, point_type)
+        self.db.take_points(
+            target_id, payment_amount, point_type, reason="admin_remove"
+        )
 
         embed = discord.Embed(
             title="Opération réussie",
@@ -149,7 +151,7 @@ class Points(commands.Cog):
         target_obj = target["role"]
 
         # Définition des points
-        self.db.set_points(target_id, amount, point_type)
+        self.db.set_points(target_id, amount, point_type, reason="admin_set")
 
         # Création de l'embed de confirmation
         embed = discord.Embed(
@@ -181,7 +183,7 @@ class Points(commands.Cog):
         target_obj = target["role"]
 
         # On donne les points
-        self.db.give_points(target_id, amount, point_type)
+        self.db.give_points(target_id, amount, point_type, reason="admin_add")
 
         # Embed de confirmation
         embed = discord.Embed(
@@ -653,7 +655,7 @@ class Points(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        self.db.take_points(country["id"], payment_amount, 1)
+        self.db.take_points(country["id"], payment_amount, 1, reason="payment")
 
         embed = discord.Embed(
             title="Opération réussie",
@@ -741,7 +743,7 @@ class Points(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        self.db.take_points(country["id"], payment_amount, 2)
+        self.db.take_points(country["id"], payment_amount, 2, reason="payment")
 
         embed = discord.Embed(
             title="Opération réussie",
@@ -12,6 +12,7 @@ import json
 # Import centralized utilities
 from shared_utils import (
     get_db,
+    get_db_executor,
     get_discord_utils,
     CountryEntity,
     CountryConverter,
@@ -42,6 +43,7 @@ class Structures(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = get_db()
+        self.adb = get_db_executor()
         self.dUtils = get_discord_utils(bot, self.db)
 
         # Color constants
@@ -178,16 +180,12 @@ class Structures(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        # Perform construction
-        if self.db.construct_structure(
+        # Perform construction (debit and insertion in a single transaction)
+        result = self.db.construct_structures(
             country.get("id"),
-            structure_type,
-            specialisation,
-            level,
-            region_id,
-            amount,
-        ):
-            self.db.take_balance(country.get("id"), total_cost)
+            [(region_id, structure_type, specialisation, level, amount)],
+        )
+        if result["success"]:
             embed = discord.Embed(
                 title="🏗️ Construction réussie",
                 description=f"{amount} {structure_type}(s) {specialisation} niveau {level} construite(s) pour {convert(str(total_cost))}.",
@@ -274,7 +272,7 @@ class Structures(commands.Cog):
 
         # Remove structure and give money
         if self.db.remove_structure(structure_id):
-            self.db.give_balance(country.get("id"), sell_price)
+            self.db.give_balance(country.get("id"), sell_price, reason="sale")
             embed = discord.Embed(
                 title="💰 Vente réussie",
                 description=f"{structure_type} niveau {level} vendue pour {convert(str(sell_price))}.",
@@ -359,7 +357,7 @@ class Structures(commands.Cog):
 
         # Remove power plant and give money
         if self.db.remove_power_plant(plant_id):
-            self.db.give_balance(country.get("id"), sell_price)
+            self.db.give_balance(country.get("id"), sell_price, reason="sale")
             embed = discord.Embed(
                 title="⚡ Vente réussie",
                 description=f"Centrale {plant_type} niveau {level} vendue pour {convert(str(sell_price))}.",
@@ -447,7 +445,7 @@ class Structures(commands.Cog):
 
         # Remove infrastructure and give money
         if self.db.remove_infrastructure(infra_id):
-            self.db.give_balance(country.get("id"), sell_price)
+            self.db.give_balance(country.get("id"), sell_price, reason="sale")
             embed = discord.Embed(
                 title="🛣️ Vente réussie",
                 description=f"{infra_type} ({length_km}km) vendue pour {convert(str(sell_price))}.",
@@ -1600,8 +1598,7 @@ class Structures(commands.Cog):
         else:
             # Show all power plant types
             try:
-                cursor = self.db.cur
-                cursor.execute(
+                power_plants = self.db.fetch_all(
                     """
                     SELECT type, MIN(level) as min_level, MAX(level) as max_level 
                     FROM PowerPlantsDatas 
@@ -1610,7 +1607,6 @@ class Structures(commands.Cog):
                     ORDER BY type
                 """
                 )
-                power_plants = cursor.fetchall()
 
                 embed = discord.Embed(
                     title="⚡ Types de centrales électriques",
@@ -1967,9 +1963,9 @@ class Structures(commands.Cog):
                 return await ctx.send(embed=embed)
 
             # Get all data
-            structures = self.db.get_structures_by_country(country_id)
-            infrastructures = self.db.get_infrastructures_by_country(country_id)
-            power_plants = self.db.get_power_plants_by_country(country_id)
+            structures = await self.adb.get_structures_by_country(country_id)
+            infrastructures = await self.adb.get_infrastructures_by_country(country_id)
+            power_plants = await self.adb.get_power_plants_by_country(country_id)
             country_name = country_entity.to_dict()["name"]
 
             embed = discord.Embed(
@@ -1988,7 +1984,7 @@ class Structures(commands.Cog):
                     struct_type = structure.get("type", "Inconnu")
                     level = structure.get("level", 1)
                     capacity = structure.get("capacity", 0)
-                    cost = self.db.get_construction_cost(
+                    cost = await self.adb.get_construction_cost(
                         struct_type, level, structure.get("specialisation", "NA")
                     )
 
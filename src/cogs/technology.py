@@ -17,6 +17,7 @@ from io import BytesIO
 # Import centralized utilities
 from shared_utils import (
     get_db,
+    get_db_executor,
     get_discord_utils,
     CountryEntity,
     CountryConverter,
@@ -1058,7 +1059,7 @@ class FinalTechConfirmationView(discord.ui.View):
 
                     if dev_started:
                         # Debit development cost
-                        db.take_balance(country_id, dev_cost)
+                        db.take_balance(country_id, dev_cost, reason="development")
                         development_msg = f"\n🔬 **Développement automatiquement lancé** dans le technocentre {technocentre_id}!"
                     else:
                         development_msg = f"\n⚠️ Technologie créée mais impossible de lancer le développement dans le technocentre {technocentre_id}."
@@ -1126,6 +1127,7 @@ class Technology(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = get_db()
+        self.adb = get_db_executor()
         self.dUtils = get_discord_utils(bot, self.db)
 
         # Color constants
@@ -1575,7 +1577,7 @@ class Technology(commands.Cog):
         """Affiche les informations complètes d'une technologie."""
         try:
             # Get technology information
-            tech = self.db.get_tech(tech_id)
+            tech = await self.adb.get_tech(tech_id)
 
             if not tech:
                 embed = discord.Embed(
@@ -1642,7 +1644,7 @@ class Technology(commands.Cog):
             # Developer information
             if developed_by:
                 try:
-                    dev_country = self.db.get_country_datas(developed_by)
+                    dev_country = await self.adb.get_country_datas(developed_by)
                     dev_name = (
                         dev_country.get("name", "Pays inconnu")
                         if dev_country
@@ -1921,11 +1923,12 @@ class Technology(commands.Cog):
                 tech_name = prod.get("tech_name", "Technologie inconnue")
                 quantity = prod.get("quantity", 0)
                 months_remaining = prod.get("months_remaining", 0)
+                playdays_remaining = prod.get("playdays_remaining", 0)
                 structure_id = prod.get("structure_id", "N/A")
 
                 embed.add_field(
                     name=f"🏢 Usine #{structure_id}",
-                    value=f"**{tech_name}**\nQuantité: {quantity}\nTemps restant: {months_remaining} mois",
+                    value=f"**{tech_name}**\nQuantité: {quantity}\nTemps restant: {months_remaining} mois ({playdays_remaining} playdays)",
                     inline=True,
                 )
 
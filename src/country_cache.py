@@ -0,0 +1,109 @@
+"""
+In-process cache of the country identities.
+Almost every command resolves the author's country through CountryEntity:
+player -> country (Governments), role -> country and name -> country
+(Countries), then the Countries row itself. Both tables are small and only
+change when a country is created or deleted or a government changes, so they
+are loaded in one go and served from dictionaries. Database invalidates the
+cache on those writes; the next lookup reloads it.
+"""
+
+import threading
+from types import MappingProxyType
+
+
+class CountryIdentities:
+    """Immutable snapshot of the lookups; a new one is built on every reload."""
+
+    __slots__ = ("by_player", "by_role", "by_name", "rows")
+
+    def __init__(self, countries, governments):
+        # country_id -> Countries row (as returned by Database.get_country_datas)
+        self.rows = MappingProxyType(
+            {
+                row["country_id"]: MappingProxyType(
+                    {
+                        "country_id": row["country_id"],
+                        "name": row["name"],
+                        "role_id": row["role_id"],
+                        "public_channel_id": row["public_channel_id"],
+                        "secret_channel_id": row["secret_channel_id"],
+                        "last_bilan": row["last_bilan"],
+                    }
+                )
+                for row in countries
+            }
+        )
+        by_role, by_name = {}, {}
+        for row in countries:
+            by_role.setdefault(str(row["role_id"]), row["country_id"])
+            by_name.setdefault(row["name"], row["country_id"])
+        by_player = {}
+        for player_id, country_id in governments:
+            by_player.setdefault(str(player_id), country_id)
+        # Discord IDs are keyed as text, like the TEXT columns they come from
+        self.by_player = MappingProxyType(by_player)
+        self.by_role = MappingProxyType(by_role)
+        self.by_name = MappingProxyType(by_name)
+
+
+class CountryIdentityCache:
+    """Player/role/name -> country_id and country_id -> row, loaded lazily."""
+
+    def __init__(self, fetch_all, on_lookup=None):
+        # `fetch_all(query)` returns rows; `on_lookup()` runs before each lookup
+        # (external change detection, see SettingsCache.refresh_if_changed)
+        self._fetch_all = fetch_all
+        self._on_lookup = on_lookup
+        self._lock = threading.Lock()
+        self._identities = None
+        self._generation = 0
+        self.reloads = 0
+
+    def invalidate(self):
+        """Forget the snapshot; the next lookup reloads both tables."""
+        with self._lock:
+            self._generation += 1
+            self._identities = None
+
+    def _snapshot(self) -> CountryIdentities:
+        if self._on_lookup:
+            self._on_lookup()
+        identities = self._identities
+        if identities is not None:
+            return identities
+        with self._lock:
+            generation = self._generation
+        identities = CountryIdentities(
+            self._fetch_all("SELECT * FROM Countries ORDER BY country_id"),
+            self._fetch_all(
+                "SELECT player_id, country_id FROM Governments ORDER BY player_id, country_id"
+            ),
+        )
+        with self._lock:
+            # An invalidation during the load makes this snapshot stale: serve
+            # it to this caller only
+            if generation == self._generation:
+                self._identities = identities
+                self.reloads += 1
+        return identities
+
+    def country_of_player(self, player_id):
+        """country_id of the government a player belongs to, or None."""
+        return self._snapshot().by_player.get(str(player_id))
+
+    def country_of_role(self, role_id):
+        """country_id whose Discord role is `role_id`, or None."""
+        return self._snapshot().by_role.get(str(role_id))
+
+    def country_of_name(self, name: str):
+        """country_id of the country named exactly `name`, or None."""
+        return self._snapshot().by_name.get(name)
+
+    def country(self, country_id) -> dict:
+        """Copy of the Countries row of `country_id`, or None."""
+        try:
+            row = self._snapshot().rows.get(int(country_id))
+        except (TypeError, ValueError):
+            return None
+        return dict(row) if row is not None else None
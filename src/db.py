@@ -1,8 +1,23 @@
+import asyncio
+import functools
 import sqlite3
 import math
+import time
 import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timezone
+from backup import BackupManager
+from country_cache import CountryIdentityCache
+from game_clock import GameClock
 from import_csv_data import import_all_datas
+from ledger import Ledger
+from migrations import migrate, schema_files
+from db_pool import ConnectionPool
+from settings_cache import SettingsCache
+from reference_data import ReferenceData
+from sql_trace import SqlTracer, get_tracer, connect_kwargs
+from tech_levels import TechLevelCache, domain_for
 import discord
 import locale
 from currency import (
@@ -14,52 +29,315 @@ debug = False
 bat_types = {}
 bat_buffs = {}
 unit_types = {}
+unit_names = {}  # unit_id -> first unit name declared for it in unit_types
+# CountryAggregates columns besides country_id (see views.sql)
+AGGREGATE_COLUMNS = (
+    "population",
+    "region_count",
+    "housing_capacity",
+    "usine_count",
+    "base_count",
+    "ecole_count",
+    "logement_count",
+    "technocentre_count",
+    "power_plant_count",
+    "power_production",
+)
 
 
 class UsefulDatas:
     """Class to hold useful data for the bot."""
 
     def __init__(self, _bat_types, _bat_buffs, _unit_types):
-        global bat_types, bat_buffs, unit_types, debug
+        global bat_types, bat_buffs, unit_types, unit_names, debug
         bat_types = _bat_types
         bat_buffs = _bat_buffs
         unit_types = _unit_types
+        unit_names = {}
+        for name, unit_id in unit_types.items():
+            unit_names.setdefault(unit_id, name)
+
+
+def locked_write(method):
+    """Run a Database write method inside `Database.write_scope()`.
+
+    The writer connection is shared by the event loop, the DatabaseExecutor
+    thread and the background jobs: every method that writes holds the write
+    lock from its first statement to its commit, so no other thread can commit
+    or roll back its half-done changes.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.write_scope():
+            return method(self, *args, **kwargs)
+
+    return wrapper
 
 
 class Database:
     """Database class to handle database operations."""
 
-    def __init__(self, path="datas/rts.db", useful_datas: UsefulDatas = None):
-        self.conn, self.cur = self.initialize_database()
+    def __init__(
+        self,
+        path="datas/rts.db",
+        useful_datas: UsefulDatas = None,
+        pool_size: int = 4,
+        tracer: SqlTracer = None,
+        ledger_snapshot_interval: float = 3600.0,
+    ):
+        self.path = path
+        # Opt-in SQL tracing (see sql_trace.enable_tracing)
+        self.tracer = tracer or get_tracer()
+        # CSV sources live next to the database (datas/csvs, datas/mapping)
+        self.data_dir = os.path.dirname(path) or "."
+        self._local = threading.local()
+        # Thread running the current `transaction()` scope, if any
+        self._tx_owner = None
+        self.pool = ConnectionPool(
+            path, readers=pool_size, **connect_kwargs(self.tracer)
+        )
+        self.conn = self.pool.writer
+        # Money/points movements, committed with the balance they change
+        self.ledger = Ledger(
+            self.write_scope,
+            self.read_cursor,
+            snapshot_interval=ledger_snapshot_interval,
+        )
+        self.initialize_database()
+        # Checked under the write lock: never reads another thread's pending writes
+        self.settings = SettingsCache(self.conn, lock=self.pool.write_lock)
+        self.settings.load()
+        self._reference = ReferenceData.load(self.conn)
+        # Admin panel edits of the reference tables are caught by the same check
+        self.settings.add_listener(self.reload_reference_data)
+        # Fiche S: Discord ID -> gravité of the watched accounts
+        self.reload_watchlist()
+        self.settings.add_listener(self.reload_watchlist)
+        # Player/role/name -> country resolution used by CountryEntity
+        self.identities = CountryIdentityCache(
+            self.fetch_all, on_lookup=self.settings.refresh_if_changed
+        )
+        self.settings.add_listener(self.identities.invalidate)
+        # Country x domain technology levels and boosts (capacity math)
+        self.tech_levels = TechLevelCache(
+            self.fetch_all,
+            lambda: self.reference.tech_boosts,
+            on_lookup=self.settings.refresh_if_changed,
+        )
+        self.settings.add_listener(self.tech_levels.invalidate)
+        # Current RP date and PlaydaysPerMonth calendar (admin panel edits reload it)
+        self.clock = GameClock.load(self.conn)
+        self.settings.add_listener(self.reload_game_clock)
+        self.ledger.ensure_opening_snapshot()
+        # Rotated online snapshots (datas/backups), see backup.py
+        self.backups = BackupManager(
+            path, backup_dir=os.path.join(self.data_dir, "backups")
+        )
 
     def __del__(self):
-        if hasattr(self, "conn"):
-            self.conn.close()
+        if hasattr(self, "ledger"):
+            self.ledger.close()
+        if hasattr(self, "pool"):
+            self.pool.close()
+
+    @property
+    def cur(self) -> sqlite3.Cursor:
+        """Cursor on the writer connection, private to the calling thread."""
+        cur = getattr(self._local, "cur", None)
+        if cur is None:
+            cur = self.conn.cursor()
+            self._local.cur = cur
+        return cur
+
+    @contextmanager
+    def read_cursor(self):
+        """Yield a dedicated cursor for a read-only operation.
+
+        Reads go to a pooled read-only WAL connection and see the last
+        committed state, so they never wait behind the playday tick's writes.
+        Inside `transaction()` or `write_scope()`, the read is served by the
+        writer so it sees the scope's own pending changes.
+        """
+        if self._tx_owner == threading.get_ident():
+            cur = self.conn.cursor()
+            try:
+                yield cur
+            finally:
+                cur.close()
+            return
+        with self.pool.reader() as cur:
+            yield cur
+
+    @property
+    def reference(self) -> ReferenceData:
+        """Current snapshot of the reference tables (StructuresDatas, pricings...)."""
+        self.settings.refresh_if_changed()
+        return self._reference
+
+    def reload_reference_data(self):
+        """Rebuild the reference snapshot and swap it in atomically."""
+        # Committed state only: listeners can run while another thread writes
+        with self.read_cursor() as cur:
+            self._reference = ReferenceData.load(cur.connection)
+        # The boost coefficients come from TechnologyBoosts
+        if hasattr(self, "tech_levels"):
+            self.tech_levels.invalidate()
+
+    def reload_game_clock(self):
+        """Re-read the current date and PlaydaysPerMonth into the game clock."""
+        with self.read_cursor() as cur:
+            self.clock.reload(cur.connection)
+
+    def import_reference_data(self, force: bool = False) -> dict:
+        """Re-run the CSV import, then rebuild the reference snapshot."""
+        with self.write_scope():
+            result = import_all_datas(self.conn, data_dir=self.data_dir, force=force)
+        self.reload_reference_data()
+        return result
+
+    @contextmanager
+    def transaction(self):
+        """Group several writes into a single commit.
+
+        Nested scopes join the outermost one: the inner methods' commits are
+        deferred and only the outermost scope commits (or rolls back on error).
+
+            with db.transaction():
+                db.take_balance(buyer_id, price)
+                db.give_balance(seller_id, price)
+        """
+        with self.pool.write_lock:
+            depth = getattr(self._local, "tx_depth", 0)
+            self._local.tx_depth = depth + 1
+            # A transaction may run inside a `write_scope()` of the same thread
+            owner = self._tx_owner
+            if depth == 0:
+                self._tx_owner = threading.get_ident()
+                self._local.tx_failed = False
+                if owner is None:
+                    self._local.identities_stale = False
+            try:
+                yield self.cur
+            except BaseException:
+                if depth == 0:
+                    self.conn.rollback()
+                raise
+            else:
+                if depth == 0:
+                    if self._local.tx_failed:
+                        self.conn.rollback()
+                        raise sqlite3.DatabaseError(
+                            "Transaction annulée : une opération imbriquée a échoué."
+                        )
+                    self.conn.commit()
+            finally:
+                self._local.tx_depth = depth
+                if depth == 0:
+                    self._tx_owner = owner
+                    if owner is None:
+                        self._invalidate_stale_identities()
+
+    @contextmanager
+    def write_scope(self):
+        """Hold the write lock for a standalone write and its commit.
+
+        Every write path runs in one (see `locked_write`). The outermost scope
+        never leaves pending changes behind for another thread to commit: they
+        are rolled back if the body raises, committed otherwise. Inside
+        `transaction()` it only joins the enclosing scope.
+        """
+        with self.pool.write_lock:
+            if self._tx_owner == threading.get_ident():
+                yield self.cur
+                return
+            self._tx_owner = threading.get_ident()
+            self._local.identities_stale = False
+            try:
+                yield self.cur
+            except BaseException:
+                if self.conn.in_transaction:
+                    self.conn.rollback()
+                raise
+            else:
+                if self.conn.in_transaction:
+                    self.conn.commit()
+            finally:
+                self._tx_owner = None
+                self._invalidate_stale_identities()
+
+    def in_transaction_scope(self) -> bool:
+        """True when the calling thread is inside a `transaction()` block."""
+        return getattr(self._local, "tx_depth", 0) > 0
+
+    def _commit(self):
+        """Commit now, or let the enclosing `transaction()` commit later."""
+        if not self.in_transaction_scope():
+            self.conn.commit()
+
+    def _rollback(self):
+        """Roll back now, or make the enclosing `transaction()` roll back."""
+        if self.in_transaction_scope():
+            self._local.tx_failed = True
+        else:
+            self.conn.rollback()
+
+    def _invalidate_identities(self):
+        """Drop the country identity cache (again at the end of the write scope)."""
+        self.identities.invalidate()
+        if self._tx_owner == threading.get_ident():
+            self._local.identities_stale = True
+
+    def _invalidate_stale_identities(self):
+        # A reload during the scope may have seen the rows before its commit
+        if getattr(self._local, "identities_stale", False):
+            self.identities.invalidate()
+            self._local.identities_stale = False
+
+    def _record_ledger(self, country_id, kind: str, delta, reason: str = None):
+        """Journal a movement in the same commit as the balance change."""
+        self.ledger.record_many([(country_id, kind, delta, reason, time.time())])
+
+    def get_balance_as_of(self, country_id, when) -> dict:
+        """Balance and points of a country at `when` (datetime or Unix timestamp)."""
+        return self.ledger.balance_as_of(country_id, when)
+
+    def get_ledger_history(
+        self, country_id, kind: str = None, since=None, until=None, limit: int = 50
+    ) -> list:
+        """Latest money/points movements of a country, newest first."""
+        return self.ledger.history(country_id, kind, since, until, limit)
+
+    def fetch_one(self, query: str, params: tuple = ()):
+        """Run a read-only query on its own cursor and return the first row."""
+        with self.read_cursor() as cur:
+            cur.execute(query, params)
+            return cur.fetchone()
+
+    def fetch_all(self, query: str, params: tuple = ()) -> list:
+        """Run a read-only query on its own cursor and return every row."""
+        with self.read_cursor() as cur:
+            cur.execute(query, params)
+            return cur.fetchall()
 
     def initialize_database(self):
-        """Initialize the database self.connection and create tables if they don't exist."""
-        conn = sqlite3.connect("datas/rts.db", check_same_thread=False)
-        conn.row_factory = sqlite3.Row  # Enable row factory for dict-like access
-        cur = conn.cursor()
-        dbs_content = {}
-        for filename in sorted(os.listdir("datas/db_schemas")):
-            if not filename.endswith(".sql"):
-                continue
-            with open(f"datas/db_schemas/{filename}", "r", encoding="utf-8") as f:
-                content = f.read()
-                dbs_content[filename] = content
-                try:
-                    cur.executescript(content)
-                except Exception as e:
-                    print(f"Error executing {filename}: {e}")
-                    raise e
-        conn.commit()
+        """Initialize the database self.connection and create tables if they don't exist.
+
+        Schema files are only re-executed when they change (see migrations.py)
+        and only the CSV files that changed are re-imported, so a warm restart
+        is a handful of queries.
+        """
+        started = time.perf_counter()
+        conn = self.conn
+        cur = self.cur
+        status = migrate(conn)
         cur.execute(
             """
             SELECT country_id FROM Countries
         """
         )
-        if cur.fetchone() is None:
+        seeded = cur.fetchone() is None
+        if seeded:
             with open("datas/init_data.sql", "r", encoding="utf-8") as f:
                 init_data = f.read()
                 cur.executescript(init_data)
@@ -76,6 +354,10 @@ class Database:
             debug = True if res[0] else False
         print("Database initialized with debug mode:", debug, flush=True)
         if debug:
+            dbs_content = {}
+            for path in schema_files():
+                with open(path, "r", encoding="utf-8") as f:
+                    dbs_content[os.path.basename(path)] = f.read()
             with open("dbs_log.txt", "w", encoding="utf-8") as f:
                 for name, sql in dbs_content.items():
                     f.write(f"\n=== {name} ===\n")
@@ -83,23 +365,34 @@ class Database:
                     f.write("\n\n")
             for name, sql in dbs_content.items():
                 print(f"{name}:\n{sql}\n")
-        import_all_datas()
-        cur.executescript(
-            """
-                UPDATE Regions SET country_id = 1 WHERE region_id = 1; -- Assign Testland to Europe
-                UPDATE Regions SET country_id = 1 WHERE region_id = 2; -- Assign Testland to Europe
-                UPDATE Regions SET country_id = 2 WHERE region_id = 3; -- Assign Debuglia to Europe
+        imported = bool(import_all_datas(conn, data_dir=self.data_dir)["changed"])
+        # Test countries get their regions back once the regions exist
+        if seeded or imported:
+            cur.executescript(
                 """
+                    UPDATE Regions SET country_id = 1 WHERE region_id = 1; -- Assign Testland to Europe
+                    UPDATE Regions SET country_id = 1 WHERE region_id = 2; -- Assign Testland to Europe
+                    UPDATE Regions SET country_id = 2 WHERE region_id = 3; -- Assign Debuglia to Europe
+                    """
+            )
+        # A (re)created CountryAggregates table starts empty: recount it
+        if status["schema_applied"] or seeded or imported:
+            self.check_country_aggregates(repair=True)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(
+            f"Database initialized in {elapsed:.1f} ms "
+            f"(schema v{status['version']}, "
+            f"schema files {'applied' if status['schema_applied'] else 'unchanged'}, "
+            f"migrations {status['migrations'] or 'none'}, "
+            f"CSV import {'run' if imported else 'skipped'}).",
+            flush=True,
         )
-        print("Database initialized.", flush=True)
-        return conn, cur
 
     def get_balance(self, country_id):
         """Get the balance of a country from the database."""
-        self.cur.execute(
+        result = self.fetch_one(
             "SELECT balance FROM Inventory WHERE country_id = ?", (country_id,)
         )
-        result = self.cur.fetchone()
         if result is not None:
             return str(result[0])
         return 0
@@ -107,10 +400,9 @@ class Database:
     def get_points(self, country_id, type: int = 1):
         """Get the points of a player from the database."""
         column = "pol_points" if type == 1 else "diplo_points"
-        self.cur.execute(
+        result = self.fetch_one(
             f"SELECT {column} FROM Inventory WHERE country_id = ?", (country_id,)
         )
-        result = self.cur.fetchone()
         if result is not None:
             return result[0]
         else:
@@ -134,7 +426,8 @@ class Database:
             return False
         return result >= amount
 
-    def set_balance(self, country_id, amount):
+    @locked_write
+    def set_balance(self, country_id, amount, reason: str = None):
         """Set the balance of a country."""
         result = self.get_balance(country_id)
         if result is not None:
@@ -147,9 +440,13 @@ class Database:
                 "INSERT INTO Inventory (country_id, balance) VALUES (?, ?)",
                 (country_id, amount),
             )
-        self.conn.commit()
+        self._record_ledger(
+            country_id, "balance", int(amount) - int(result or 0), reason
+        )
+        self._commit()
 
-    def set_points(self, country_id, amount, type: int = 1):
+    @locked_write
+    def set_points(self, country_id, amount, type: int = 1, reason: str = None):
         """Set the points of a player."""
         result = self.get_points(country_id, type)
         column = "pol_points" if type == 1 else "diplo_points"
@@ -163,9 +460,11 @@ class Database:
                 f"INSERT INTO Inventory (country_id, {column}) VALUES (?, ?)",
                 (country_id, amount),
             )
-        self.conn.commit()
+        self._record_ledger(country_id, column, amount - (result or 0), reason)
+        self._commit()
 
-    def give_balance(self, country_id, amount):
+    @locked_write
+    def give_balance(self, country_id, amount, reason: str = None):
         """Give money to a country."""
         try:
             self.cur.execute(
@@ -173,11 +472,13 @@ class Database:
                 "ON CONFLICT(country_id) DO UPDATE SET balance = balance + ?",
                 (country_id, amount, amount),
             )
-            self.conn.commit()
+            self._record_ledger(country_id, "balance", amount, reason)
+            self._commit()
         except sqlite3.IntegrityError:
             raise (f"ERREUR : Le pays {country_id} n'existe pas dans Countries.")
 
-    def take_balance(self, country_id, amount):
+    @locked_write
+    def take_balance(self, country_id, amount, reason: str = None):
         """Take money from a country."""
         result = self.get_balance(country_id)
         if result is not None:
@@ -190,9 +491,13 @@ class Database:
                 "INSERT INTO Inventory (country_id, balance) VALUES (?, ?)",
                 (country_id, -amount),
             )
-        self.conn.commit()
+        self._record_ledger(country_id, "balance", -amount, reason)
+        self._commit()
 
-    def give_points(self, country_id: str, amount: int, type: int = 1):
+    @locked_write
+    def give_points(
+        self, country_id: str, amount: int, type: int = 1, reason: str = None
+    ):
         """Ajoute des points politiques (type=1) ou diplomatiques (type=2) à un pays."""
         column = "pol_points" if type == 1 else "diplo_points"
 
@@ -208,9 +513,11 @@ class Database:
                 f"INSERT INTO Inventory (country_id, {column}) VALUES (?, ?)",
                 (country_id, amount),
             )
-        self.conn.commit()
+        self._record_ledger(country_id, column, amount, reason)
+        self._commit()
 
-    def take_points(self, country_id, amount, type: int = 1):
+    @locked_write
+    def take_points(self, country_id, amount, type: int = 1, reason: str = None):
         """Take points from a country."""
         result = self.get_points(country_id, type)
         column = "pol_points" if type == 1 else "diplo_points"
@@ -225,7 +532,8 @@ class Database:
                 f"INSERT INTO Inventory (country_id, {column}) VALUES (?, ?)",
                 (country_id, -amount),
             )
-        self.conn.commit()
+        self._record_ledger(country_id, column, -amount, reason)
+        self._commit()
 
     # Structure-related database functions
     def get_structures_by_country(
@@ -235,7 +543,7 @@ class Database:
         if country_id is None:
             # Get all structures (for admin commands)
             if structure_type:
-                self.cur.execute(
+                rows = self.fetch_all(
                     """
                     SELECT s.id, s.type, s.specialisation, s.level, s.capacity, s.population,
                            s.region_id, r.name as region_name
@@ -247,7 +555,7 @@ class Database:
                     (structure_type,),
                 )
             else:
-                self.cur.execute(
+                rows = self.fetch_all(
                     """
                     SELECT s.id, s.type, s.specialisation, s.level, s.capacity, s.population,
                            s.region_id, r.name as region_name
@@ -259,69 +567,56 @@ class Database:
         else:
             # Get structures for specific country
             if structure_type:
-                self.cur.execute(
+                rows = self.fetch_all(
                     """
                     SELECT s.id, s.type, s.specialisation, s.level, s.capacity, s.population,
-                           r.region_id, r.name as region_name
+                           s.region_id, r.name as region_name
                     FROM Structures s
                     JOIN Regions r ON s.region_id = r.region_id
-                    WHERE r.country_id = ? AND s.type = ?
+                    WHERE s.country_id = ? AND s.type = ?
                     ORDER BY s.type, s.level DESC
                 """,
                     (country_id, structure_type),
                 )
             else:
-                self.cur.execute(
+                rows = self.fetch_all(
                     """
                     SELECT s.id, s.type, s.specialisation, s.level, s.capacity, s.population,
-                           r.region_id, r.name as region_name
+                           s.region_id, r.name as region_name
                     FROM Structures s
                     JOIN Regions r ON s.region_id = r.region_id
-                    WHERE r.country_id = ?
+                    WHERE s.country_id = ?
                     ORDER BY s.type, s.level DESC
                 """,
                     (country_id,),
                 )
-        return self.cur.fetchall()
+        return rows
 
     def get_structure_capacity(self, structure_id: int) -> int:
         """Get the effective capacity of a structure with technology boost."""
-        self.cur.execute(
+        structure_info = self.fetch_one(
             """
-            SELECT s.type, s.specialisation, s.level, r.country_id
-            FROM Structures s
-            JOIN Regions r ON s.region_id = r.region_id
-            WHERE s.id = ?
+            SELECT type, specialisation, level, country_id
+            FROM Structures
+            WHERE id = ?
         """,
             (structure_id,),
         )
-        structure_info = self.cur.fetchone()
         if not structure_info:
             return 0
 
         structure_type, specialisation, level, country_id = structure_info
 
-        # Get base capacity from new StructuresDatas table
-        self.cur.execute(
-            """
-            SELECT capacity FROM StructuresDatas 
-            WHERE type = ? AND specialisation = ? AND level = ?
-        """,
-            (structure_type, specialisation, level),
+        # Get base capacity from the StructuresDatas snapshot
+        structure_data = self.reference.get_structure(
+            structure_type, specialisation, level
         )
-        capacity_result = self.cur.fetchone()
-        base_capacity = capacity_result[0] if capacity_result else 0
+        base_capacity = structure_data["capacity"] if structure_data else 0
 
         # Apply technology boost for factories
         if structure_type == "Usine":
             # Use domain-specific tech level based on specialisation (Terrestre/Aerospatial/Maritime)
-            domain = {
-                "Terrestre": "Terrestre",
-                "Aerienne": "Aerospatial",  # Map Aerienne to Aerospatial
-                "Navale": "Maritime",  # Map Navale to Maritime
-            }.get(specialisation, "Global")
-            country_tech_level = self.get_country_technology_level(country_id, domain)
-            tech_boost = self.get_technology_boost(country_tech_level)
+            tech_boost = self.tech_levels.boost(country_id, domain_for(specialisation))
             return int(base_capacity * tech_boost)
 
         return base_capacity
@@ -330,33 +625,21 @@ class Database:
         """Get the currently used capacity of a structure."""
         # We need to compute used capacity using the technology's specialisation and
         # the owning country's domain-specific tech level (or Global fallback)
-        self.cur.execute(
+        rows = self.fetch_all(
             """
-            SELECT t.slots_taken, t.specialisation, sp.quantity, r.country_id
+            SELECT t.slots_taken, t.specialisation, sp.quantity, s.country_id
             FROM StructureProduction sp
             JOIN Technologies t ON sp.tech_id = t.tech_id
             JOIN Structures s ON sp.structure_id = s.id
-            JOIN Regions r ON s.region_id = r.region_id
             WHERE sp.structure_id = ?
         """,
             (structure_id,),
         )
-        rows = self.cur.fetchall()
         total = 0.0
-        for row in rows:
-            slots_taken = row[0]
-            tech_specialisation = row[1] or "NA"
-            quantity = row[2]
-            country_id = row[3]
-
-            # Map specialisation to domain
-            domain_mapping = {
-                "Terrestre": "Terrestre",
-                "Aerienne": "Aerospatial",
-                "Navale": "Maritime",
-            }
-            domain = domain_mapping.get(tech_specialisation, "Global")
-            tech_level = self.get_country_technology_level(country_id, domain)
+        for slots_taken, tech_specialisation, quantity, country_id in rows:
+            tech_level = self.tech_levels.level(
+                country_id, domain_for(tech_specialisation)
+            )
             total += slots_taken * (1 + tech_level / 10.0) * quantity
 
         return float(total)
@@ -371,69 +654,113 @@ class Database:
         amount: int = 1,
     ) -> bool:
         """Construct structures in a region using new data system."""
+        result = self.construct_structures(
+            country_id,
+            [(region_id, structure_type, specialisation, level, amount)],
+            charge=False,
+        )
+        return result["success"]
+
+    @locked_write
+    def construct_structures(
+        self, country_id: int, orders: list, charge: bool = True
+    ) -> dict:
+        """Construct several batches of structures, possibly in several regions.
+
+        `orders` is a list of (region_id, type, specialisation, level, amount).
+        Every order is validated first (region ownership in one query, data and
+        cost from the reference snapshot); then the country is debited once and
+        all structures are inserted with executemany, in a single transaction.
+        Nothing is built if any order is invalid.
+        """
         try:
-            # Verify region belongs to country
-            self.cur.execute(
-                """
-                SELECT region_id FROM Regions WHERE region_id = ? AND country_id = ?
-            """,
-                (region_id, country_id),
-            )
-            if not self.cur.fetchone():
-                return False
+            if not orders:
+                return {"success": False, "error": "No construction order"}
+
+            region_ids = {order[0] for order in orders}
+            placeholders = ", ".join("?" for _ in region_ids)
+            owned_regions = {
+                row[0]
+                for row in self.fetch_all(
+                    f"SELECT region_id FROM Regions WHERE country_id = ? AND region_id IN ({placeholders})",
+                    (country_id, *region_ids),
+                )
+            }
 
-            # Get structure data from new StructuresDatas table
-            self.cur.execute(
-                """
-                SELECT capacity, population, cout_construction
-                FROM StructuresDatas 
-                WHERE type = ? AND specialisation = ? AND level = ?
-            """,
-                (structure_type, specialisation, level),
-            )
-            structure_data = self.cur.fetchone()
-            if not structure_data:
-                return False
+            rows = []
+            total_cost = 0
+            for region_id, structure_type, specialisation, level, amount in orders:
+                if region_id not in owned_regions:
+                    return {
+                        "success": False,
+                        "error": f"Region {region_id} does not belong to country {country_id}",
+                    }
+                if amount <= 0:
+                    return {"success": False, "error": f"Invalid amount: {amount}"}
+                structure_data = self.reference.get_structure(
+                    structure_type, specialisation, level
+                )
+                if not structure_data:
+                    return {
+                        "success": False,
+                        "error": f"Unknown structure: {structure_type} {specialisation} {level}",
+                    }
+                total_cost += structure_data["construction_cost"] * amount
+                rows.extend(
+                    [
+                        (
+                            region_id,
+                            structure_type,
+                            specialisation,
+                            level,
+                            structure_data["capacity"],
+                        )
+                    ]
+                    * amount
+                )
 
-            capacity, required_population, construction_cost = structure_data
+            if charge and not self.has_enough_balance(country_id, total_cost):
+                return {
+                    "success": False,
+                    "error": f"Insufficient balance. Need: {total_cost:,}",
+                    "total_cost": total_cost,
+                }
 
-            # Insert structures
-            for _ in range(amount):
-                self.cur.execute(
+            with self.transaction():
+                if charge:
+                    self.take_balance(country_id, total_cost, reason="construction")
+                self.cur.executemany(
                     """
                     INSERT INTO Structures (region_id, type, specialisation, level, capacity, population)
                     VALUES (?, ?, ?, ?, ?, 0)
                 """,
-                    (region_id, structure_type, specialisation, level, capacity),
+                    rows,
                 )
-
-            self.conn.commit()
-            return True
+            return {
+                "success": True,
+                "built": len(rows),
+                "total_cost": total_cost if charge else 0,
+            }
         except Exception as e:
             print(f"Error constructing structure: {e}")
-            self.conn.rollback()
-            return False
+            # Inside a caller's transaction(): make it roll back too, so the
+            # debit is never committed without the structures
+            self._rollback()
+            return {"success": False, "error": f"Database error: {str(e)}"}
 
     def get_construction_cost(
         self, structure_type: str, level: int, specialisation: str = "NA"
     ) -> int:
         """Get construction cost for a structure type, level, and specialisation using new data system."""
-        self.cur.execute(
-            """
-            SELECT cout_construction
-            FROM StructuresDatas 
-            WHERE type = ? AND level = ? AND specialisation = ?
-        """,
-            (structure_type, level, specialisation),
-        )
-        result = self.cur.fetchone()
-        return int(result[0]) if result else 0
+        result = self.reference.get_structure(structure_type, specialisation, level)
+        return int(result["construction_cost"]) if result else 0
 
+    @locked_write
     def remove_structure(self, structure_id: int) -> bool:
         """Remove a structure by ID."""
         try:
             self.cur.execute("DELETE FROM Structures WHERE id = ?", (structure_id,))
-            self.conn.commit()
+            self._commit()
             return self.cur.rowcount > 0
         except Exception as e:
             print(f"Error removing structure: {e}")
@@ -441,8 +768,7 @@ class Database:
 
     def get_available_structure_types(self) -> list:
         """Get all available structure types."""
-        self.cur.execute("SELECT DISTINCT type FROM StructuresDatas")
-        return [row[0] for row in self.cur.fetchall()]
+        return list(dict.fromkeys(key[0] for key in self.reference.structures))
 
     def get_structure_production_slots(self, structure_id: int) -> dict:
         """Get production slot information for a structure."""
@@ -455,16 +781,64 @@ class Database:
             "remaining_capacity": effective_cost - used_capacity,
         }
 
+    def get_country_production_slots(self, country_id: int) -> dict:
+        """Production slot information of every factory of a country, by structure id.
+
+        A single query for all the factories and their productions (one
+        snapshot: a factory built meanwhile is either fully in or out), the
+        technology levels coming from the cached matrix.
+        """
+        slots = {}
+        for (
+            structure_id,
+            specialisation,
+            level,
+            tech_specialisation,
+            used_slots,
+        ) in self.fetch_all(
+            """
+            SELECT s.id, s.specialisation, s.level, t.specialisation,
+                   SUM(t.slots_taken * sp.quantity)
+            FROM Structures s
+            LEFT JOIN StructureProduction sp ON sp.structure_id = s.id
+            LEFT JOIN Technologies t ON sp.tech_id = t.tech_id
+            WHERE s.country_id = ? AND s.type = 'Usine'
+            GROUP BY s.id, t.specialisation
+            """,
+            (country_id,),
+        ):
+            info = slots.get(structure_id)
+            if info is None:
+                structure_data = self.reference.get_structure(
+                    "Usine", specialisation, level
+                )
+                base_capacity = structure_data["capacity"] if structure_data else 0
+                tech_boost = self.tech_levels.boost(
+                    country_id, domain_for(specialisation)
+                )
+                info = slots[structure_id] = {
+                    "effective_cost": int(base_capacity * tech_boost),
+                    "used_capacity": 0.0,
+                }
+            if used_slots is None:
+                continue
+            tech_level = self.tech_levels.level(
+                country_id, domain_for(tech_specialisation)
+            )
+            info["used_capacity"] += used_slots * (1 + tech_level / 10.0)
+        for info in slots.values():
+            info["remaining_capacity"] = info["effective_cost"] - info["used_capacity"]
+        return slots
+
     def list_bats(self, country_id, bat_type: str = "all"):
         """Retourne la liste des bâtiments d’un type donné pour un pays."""
-        # Query Structures joined with Regions to get country ownership
+        # Structures.country_id is kept in sync with the region's owner (triggers)
         if bat_type.lower() == "all":
             self.cur.execute(
                 """
-                SELECT s.* FROM Structures s
-                JOIN Regions r ON s.region_id = r.region_id
-                WHERE r.country_id = ?
-                ORDER BY s.type, s.level DESC
+                SELECT * FROM Structures
+                WHERE country_id = ?
+                ORDER BY type, level DESC
                 """,
                 (country_id,),
             )
@@ -478,15 +852,15 @@ class Database:
                 raise ValueError(f"Type de bâtiment inconnu : {bat_type}")
             self.cur.execute(
                 """
-                SELECT s.* FROM Structures s
-                JOIN Regions r ON s.region_id = r.region_id
-                WHERE r.country_id = ? AND s.type = ?
-                ORDER BY s.type, s.level DESC
+                SELECT * FROM Structures
+                WHERE country_id = ? AND type = ?
+                ORDER BY type, level DESC
                 """,
                 (country_id, matched),
             )
         return self.cur.fetchall()
 
+    @locked_write
     def give_bat(
         self, country_id, level: int, bat_type: int, specialisation: str, region_id: str
     ):
@@ -507,8 +881,9 @@ class Database:
             """,
             (region_id, type_name, specialisation, level, capacity, 0),
         )
-        self.conn.commit()
+        self._commit()
 
+    @locked_write
     def remove_bat(self, bat_id: int):
         """Remove buildings from a player."""
         self.cur.execute("SELECT * FROM Structures WHERE id = ?", (bat_id,))
@@ -522,8 +897,9 @@ class Database:
             """,
             (bat_id,),
         )
-        self.conn.commit()
+        self._commit()
 
+    @locked_write
     def edit_bat(self, bat_id: int, level: int = None, specialisation: str = None):
         """Modifie le niveau ou la spécialisation d’un bâtiment."""
         # On récupère l’ancien bâtiment
@@ -558,16 +934,13 @@ class Database:
             query = f"UPDATE Structures SET {', '.join(updates)} WHERE id = ?"
             params.append(bat_id)
             self.cur.execute(query, tuple(params))
-            self.conn.commit()
+            self._commit()
 
     def get_pricings(self, item: str):
         """Get the pricing for a specific item."""
-        self.cur.execute(
-            "SELECT price, maintenance FROM InventoryPricings WHERE item = ?", (item,)
-        )
-        result = self.cur.fetchone()
+        result = self.reference.pricings.get(item)
         if result:
-            return {"price": result[0], "maintenance": result[1]}
+            return dict(result)
         return None
 
     def upgrade_bat(self, country_id, bat_id: int):
@@ -596,110 +969,114 @@ class Database:
             return "Solde insuffisant."
 
         # Paiement et mise à jour
-        self.take_balance(country_id, cost)
+        self.take_balance(country_id, cost, reason="upgrade")
         self.edit_bats(bat_id, level=new_level)
         return f"{bat_type_name} amélioré au niveau {new_level}."
 
+    # Expressions de classement, identiques à celles des index idx_inventory_lead_*
+    LEAD_SCORES = {
+        1: "balance",
+        2: "pol_points",
+        3: "diplo_points",
+        4: "balance * (pol_points + diplo_points)",
+    }
+    LEAD_TOTAL = "balance + pol_points + diplo_points"
+
     def get_leads(self, lead_type: int, user_id: str):
-        if lead_type == 1:
-            self.cur.execute("SELECT country_id FROM Inventory ORDER BY balance DESC")
-        elif lead_type == 2:
-            self.cur.execute(
-                "SELECT country_id FROM Inventory ORDER BY pol_points DESC"
-            )
-        elif lead_type == 3:
-            self.cur.execute(
-                "SELECT country_id FROM Inventory ORDER BY diplo_points DESC"
-            )
-        elif lead_type == 4:
-            self.cur.execute(
-                "SELECT country_id FROM Inventory ORDER BY (balance * (pol_points + diplo_points)) DESC"
-            )
-        leaderboard = self.cur.fetchall()
-        leaderboard = [
-            str(row[0]) for row in leaderboard
-        ]  # Extraire uniquement les `country_id` dans une liste
-        return (
-            leaderboard.index(str(user_id)) + 1 if str(user_id) in leaderboard else -1
+        """Rang d'un pays dans un classement (-1 s'il n'y figure pas).
+
+        Le rang est calculé en comptant les pays mieux classés sur l'index du
+        critère (égalités départagées par country_id), sans charger la table.
+        """
+        score = self.LEAD_SCORES.get(lead_type)
+        if score is None:
+            return -1
+        row = self.fetch_one(
+            f"SELECT {score} AS score FROM Inventory WHERE country_id = ?",
+            (user_id,),
+        )
+        if not row:
+            return -1
+        rank = self.fetch_one(
+            f"""
+            SELECT (SELECT COUNT(*) FROM Inventory WHERE {score} > ?)
+                 + (SELECT COUNT(*) FROM Inventory WHERE {score} = ? AND country_id < ?)
+            """,
+            (row["score"], row["score"], user_id),
         )
+        return rank[0] + 1
 
-    def lead_economy(self, size: int = 10):
-        """Get the leaderboard of players based on their balance."""
+    def _lead(self, score: str, size: int) -> list:
+        """(country_id, score) pairs ordered by a ranking expression."""
+        query = f"SELECT country_id, {score} AS score FROM Inventory ORDER BY {score} DESC, country_id"
         if size <= 0:
-            self.cur.execute(
-                "SELECT country_id, balance FROM Inventory ORDER BY balance DESC"
-            )
+            rows = self.fetch_all(query)
         else:
-            self.cur.execute(
-                "SELECT country_id, balance FROM Inventory ORDER BY balance DESC LIMIT ?",
-                (size,),
-            )
-        leaderboard = self.cur.fetchall()
-        leaderboard = [(str(row[0]), int(row[1])) for row in leaderboard]
-        return leaderboard
+            rows = self.fetch_all(query + " LIMIT ?", (size,))
+        return [(str(row[0]), int(row[1])) for row in rows]
+
+    def lead_economy(self, size: int = 10):
+        """Get the leaderboard of players based on their balance."""
+        return self._lead(self.LEAD_SCORES[1], size)
 
     def lead_pol(self, size: int = 10):
         """Get the leaderboard of players based on their political points."""
-        if size <= 0:
-            self.cur.execute(
-                "SELECT country_id, pol_points FROM Inventory ORDER BY pol_points DESC"
-            )
-        else:
-            self.cur.execute(
-                "SELECT country_id, pol_points FROM Inventory ORDER BY pol_points DESC LIMIT ?",
-                (size,),
-            )
-        leaderboard = self.cur.fetchall()
-        leaderboard = [(str(row[0]), int(row[1])) for row in leaderboard]
-        return leaderboard
+        return self._lead(self.LEAD_SCORES[2], size)
 
     def lead_diplo(self, size: int = 10):
         """Get the leaderboard of players based on their diplomatic points."""
-        if size <= 0:
-            self.cur.execute(
-                "SELECT country_id, diplo_points FROM Inventory ORDER BY diplo_points DESC"
-            )
-        else:
-            self.cur.execute(
-                "SELECT country_id, diplo_points FROM Inventory ORDER BY diplo_points DESC LIMIT ?",
-                (size,),
-            )
-        leaderboard = self.cur.fetchall()
-        leaderboard = [(str(row[0]), int(row[1])) for row in leaderboard]
-        return leaderboard
+        return self._lead(self.LEAD_SCORES[3], size)
 
     def lead_all(self, size: int = 10):
         """Get the leaderboard of players based on their total points (balance + political points + diplomatic points)."""
-        if size <= 0:
-            self.cur.execute(
-                "SELECT country_id, (balance + pol_points + diplo_points) as total FROM Inventory ORDER BY total DESC"
-            )
-        else:
-            self.cur.execute(
-                "SELECT country_id, (balance + pol_points + diplo_points) as total FROM Inventory ORDER BY total DESC LIMIT ?",
-                (size,),
-            )
-        leaderboard = self.cur.fetchall()
-        leaderboard = [(str(row[0]), int(row[1])) for row in leaderboard]
-        return leaderboard
+        return self._lead(self.LEAD_TOTAL, size)
 
-    async def get_leaderboard(self, offset=0, limit=10):
+    async def get_leaderboard(self, offset=0, limit=10, after=None, before=None):
         """
         Récupère le classement des pays basé sur le total points :
         balance * (pol_points + diplo_points)
         Retourne aussi le rôle (role_id) pour affichage.
+
+        Pagination par clé : `after` / `before` sont le couple (score, country_id)
+        de la dernière / première ligne de la page affichée. Sans clé, `offset`
+        est utilisé comme avant.
         """
-        self.cur.execute(
-            """
-            SELECT Countries.role_id, Inventory.balance, Inventory.pol_points, Inventory.diplo_points
+        score = self.LEAD_SCORES[4]
+        columns = f"""
+            SELECT Countries.role_id, Inventory.balance, Inventory.pol_points, Inventory.diplo_points,
+                   Inventory.country_id, {score} AS score
             FROM Inventory
             JOIN Countries ON Inventory.country_id = Countries.country_id
-            ORDER BY (Inventory.balance * (Inventory.pol_points + Inventory.diplo_points)) DESC
+        """
+        if after is not None:
+            return self.fetch_all(
+                columns
+                + f"""
+                WHERE {score} <= ? AND ({score} < ? OR Inventory.country_id > ?)
+                ORDER BY {score} DESC, Inventory.country_id
+                LIMIT ?
+            """,
+                (after[0], after[0], after[1], limit),
+            )
+        if before is not None:
+            rows = self.fetch_all(
+                columns
+                + f"""
+                WHERE {score} >= ? AND ({score} > ? OR Inventory.country_id < ?)
+                ORDER BY {score} ASC, Inventory.country_id DESC
+                LIMIT ?
+            """,
+                (before[0], before[0], before[1], limit),
+            )
+            return rows[::-1]
+        return self.fetch_all(
+            columns
+            + f"""
+            ORDER BY {score} DESC, Inventory.country_id
             LIMIT ? OFFSET ?
         """,
             (limit, offset),
         )
-        return self.cur.fetchall()
 
     # Fonction pour calculer le temps de production
     def calculer_temps_production(
@@ -761,15 +1138,16 @@ class Database:
         return columns, rows
 
     def has_permission(self, country_id: str, player_id: str, permission: str) -> bool:
-        self.cur.execute(
+        result = self.fetch_one(
             f"""
             SELECT 1 FROM Governments
             WHERE country_id = ? AND player_id = ? AND {permission} = 1
         """,
             (country_id, player_id),
         )
-        return self.cur.fetchone() is not None
+        return result is not None
 
+    @locked_write
     def add_region_to_country(
         self,
         country_id: str,
@@ -807,9 +1185,10 @@ class Database:
                 ),
             )
             region_id = self.cur.lastrowid
-        self.conn.commit()
+        self._commit()
         return region_id
 
+    @locked_write
     def add_geographical_area(
         self, name: str, x_start: int, x_end: int, y_start: int, y_end: int
     ) -> int:
@@ -822,15 +1201,14 @@ class Database:
             (name, x_start, x_end, y_start, y_end),
         )
         area_id = self.cur.lastrowid
-        self.conn.commit()
+        self._commit()
         return area_id
 
     def get_geographical_area(self, area_id: int) -> dict:
         """Récupère les informations d'une zone géographique."""
-        self.cur.execute(
+        result = self.fetch_one(
             "SELECT * FROM GeographicalAreas WHERE geographical_area_id = ?", (area_id,)
         )
-        result = self.cur.fetchone()
         if result:
             return {
                 "geographical_area_id": result["geographical_area_id"],
@@ -840,12 +1218,12 @@ class Database:
 
     def get_all_geographical_areas(self) -> list:
         """Récupère toutes les zones géographiques."""
-        self.cur.execute("SELECT DISTINCT * FROM GeographicalAreas ORDER BY name")
-        return [dict(row) for row in self.cur.fetchall()]
+        rows = self.fetch_all("SELECT DISTINCT * FROM GeographicalAreas ORDER BY name")
+        return [dict(row) for row in rows]
 
     def get_regions_in_geographical_area(self, area_id: int) -> list:
         """Récupère toutes les régions dans une zone géographique donnée."""
-        self.cur.execute(
+        rows = self.fetch_all(
             """
             SELECT r.*, c.name as country_name 
             FROM Regions r 
@@ -855,8 +1233,9 @@ class Database:
             """,
             (area_id,),
         )
-        return [dict(row) for row in self.cur.fetchall()]
+        return [dict(row) for row in rows]
 
+    @locked_write
     def update_region_geographical_area(
         self, region_id: int, area_id: int = None
     ) -> bool:
@@ -866,7 +1245,7 @@ class Database:
                 "UPDATE Regions SET geographical_area_id = ? WHERE region_id = ?",
                 (area_id, region_id),
             )
-            self.conn.commit()
+            self._commit()
             return True
         except Exception as e:
             print(f"Error updating region geographical area: {e}")
@@ -874,22 +1253,25 @@ class Database:
 
     def get_region_by_id(self, region_id: int) -> dict:
         """Récupère une région par son ID."""
-        self.cur.execute("SELECT * FROM Regions WHERE region_id = ?", (region_id,))
-        result = self.cur.fetchone()
+        result = self.fetch_one(
+            "SELECT * FROM Regions WHERE region_id = ?", (region_id,)
+        )
         if result:
             return dict(result)
         return None
 
+    @locked_write
     def remove_region(self, region_id: int) -> bool:
         """Supprime une région."""
         try:
             self.cur.execute("DELETE FROM Regions WHERE region_id = ?", (region_id,))
-            self.conn.commit()
+            self._commit()
             return True
         except Exception as e:
             print(f"Error removing region: {e}")
             return False
 
+    @locked_write
     def update_region_data(self, region_id: int, **kwargs) -> bool:
         """Met à jour les données d'une région."""
         if not kwargs:
@@ -918,12 +1300,13 @@ class Database:
             query = f"UPDATE Regions SET {', '.join(updates)} WHERE region_id = ?"
             values.append(region_id)
             self.cur.execute(query, values)
-            self.conn.commit()
+            self._commit()
             return True
         except Exception as e:
             print(f"Error updating region data: {e}")
             return False
 
+    @locked_write
     def transfer_region_ownership(self, region_id: int, new_country_id: int) -> bool:
         """Transfère la propriété d'une région vers un autre pays."""
         try:
@@ -931,12 +1314,13 @@ class Database:
                 "UPDATE Regions SET country_id = ? WHERE region_id = ?",
                 (new_country_id, region_id),
             )
-            self.conn.commit()
+            self._commit()
             return True
         except Exception as e:
             print(f"Error transferring region ownership: {e}")
             return False
 
+    @locked_write
     def add_player_to_government(self, country_id: int, player_id: str) -> int:
         """Ajoute un joueur au gouvernement d'un pays. Retourne le slot assigné ou None."""
         # Find available slot
@@ -962,12 +1346,14 @@ class Database:
                    VALUES (?, ?, ?, ?, ?, ?)""",
                 (country_id, available_slot, player_id, True, True, True),
             )
-            self.conn.commit()
+            self._commit()
+            self._invalidate_identities()
             return available_slot
         except Exception as e:
             print(f"Error adding player to government: {e}")
             return None
 
+    @locked_write
     def remove_player_from_government(self, country_id: int, player_id: str) -> int:
         """Retire un joueur du gouvernement d'un pays. Retourne le slot libéré ou None."""
         # Get the slot first
@@ -987,7 +1373,8 @@ class Database:
                 "DELETE FROM Governments WHERE country_id = ? AND player_id = ?",
                 (country_id, player_id),
             )
-            self.conn.commit()
+            self._commit()
+            self._invalidate_identities()
             return slot_number
         except Exception as e:
             print(f"Error removing player from government: {e}")
@@ -995,19 +1382,19 @@ class Database:
 
     def get_government_by_country(self, country_id: int) -> list:
         """Récupère tous les membres du gouvernement d'un pays."""
-        self.cur.execute(
+        rows = self.fetch_all(
             "SELECT * FROM Governments WHERE country_id = ? ORDER BY slot",
             (country_id,),
         )
-        return [dict(row) for row in self.cur.fetchall()]
+        return [dict(row) for row in rows]
 
     def is_player_in_government(self, country_id: int, player_id: str) -> bool:
         """Vérifie si un joueur fait partie du gouvernement d'un pays."""
-        self.cur.execute(
+        result = self.fetch_one(
             "SELECT 1 FROM Governments WHERE country_id = ? AND player_id = ?",
             (country_id, player_id),
         )
-        return self.cur.fetchone() is not None
+        return result is not None
 
     async def get_tech_datas(self, tech_type: str, tech_level: int, key: str):
         """Récupère les données d'une technologie spécifique."""
@@ -1027,7 +1414,7 @@ class Database:
 
     def get_tech(self, tech_id: int):
         """Récupère les données d'une technologie par son ID."""
-        self.cur.execute(
+        result = self.fetch_one(
             """
             SELECT t.*, c.name as country_name 
             FROM Technologies t 
@@ -1036,7 +1423,6 @@ class Database:
         """,
             (tech_id,),
         )
-        result = self.cur.fetchone()
         if result:
             tech_data = {
                 "tech_id": result["tech_id"],
@@ -1058,7 +1444,7 @@ class Database:
 
     def get_attributes_by_tech(self, tech_id: int):
         """Récupère les attributs d'une technologie par son ID."""
-        self.cur.execute(
+        attributes = self.fetch_all(
             """
             SELECT attribute_name, attribute_value 
             FROM TechnologyAttributes 
@@ -1066,7 +1452,6 @@ class Database:
         """,
             (tech_id,),
         )
-        attributes = self.cur.fetchall()
         # Return as list of dictionaries for compatibility with get_infos command
         return [
             {"attribute_name": attr[0], "attribute_value": attr[1]}
@@ -1079,30 +1464,111 @@ class Database:
 
     def get_players_government(self, player_id: int) -> str:
         """Récupère le gouvernement d'un joueur."""
-        self.cur.execute(
-            "SELECT country_id FROM Governments WHERE player_id = ?", (player_id,)
-        )
-        result = self.cur.fetchone()
-        return result[0] if result else None
+        return self.identities.country_of_player(player_id)
 
     def get_population_by_country(self, country_id: str) -> int:
         """Récupère la population totale d'un pays."""
-        self.cur.execute(
-            "SELECT IFNULL(SUM(population),0) as pop FROM Regions WHERE country_id = ?",
-            (country_id,),
-        )
-        result = self.cur.fetchone()
-        return int(result[0]) if result and result[0] is not None else 0
+        return self.get_country_aggregates(country_id)["population"]
 
     def get_population_capacity_by_country(self, country_id: str) -> int:
         """Récupère la capacité d'accueil totale d'un pays."""
-        self.cur.execute(
-            "SELECT IFNULL(SUM(s.capacity),0) as cap FROM Structures s JOIN Regions r ON s.region_id = r.region_id WHERE r.country_id = ? AND s.type = 'Logement'",
-            (country_id,),
+        return self.get_country_aggregates(country_id)["housing_capacity"]
+
+    def get_country_aggregates(self, country_id) -> dict:
+        """Population, capacité, bâtiments par type et production électrique d'un pays.
+
+        Lu dans CountryAggregates, que les triggers de views.sql tiennent à jour.
+        """
+        row = self.fetch_one(
+            "SELECT * FROM CountryAggregates WHERE country_id = ?", (country_id,)
         )
-        result = self.cur.fetchone()
-        return int(result[0]) if result and result[0] is not None else 0
+        if row:
+            return dict(row)
+        return {"country_id": country_id, **dict.fromkeys(AGGREGATE_COLUMNS, 0)}
+
+    def _compute_country_aggregates(self) -> dict:
+        """CountryAggregates recalculés depuis Regions, Structures et PowerPlants."""
+        aggregates = {}
+
+        def country(country_id):
+            return aggregates.setdefault(
+                country_id, dict.fromkeys(AGGREGATE_COLUMNS, 0)
+            )
+
+        for row in self.fetch_all(
+            "SELECT country_id, SUM(population), COUNT(*) FROM Regions "
+            "WHERE country_id IS NOT NULL GROUP BY country_id"
+        ):
+            country(row[0]).update(population=row[1], region_count=row[2])
+        for row in self.fetch_all(
+            "SELECT country_id, type, COUNT(*), SUM(capacity) FROM Structures "
+            "WHERE country_id IS NOT NULL GROUP BY country_id, type"
+        ):
+            totals = country(row[0])
+            totals[f"{row[1].lower()}_count"] = row[2]
+            if row[1] == "Logement":
+                totals["housing_capacity"] = row[3]
+        for row in self.fetch_all(
+            """
+            SELECT p.country_id, COUNT(*), IFNULL(SUM(ppd.production_mwh), 0)
+            FROM PowerPlants p
+            LEFT JOIN PowerPlantsDatas ppd ON p.type = ppd.type AND p.level = ppd.level
+            WHERE p.country_id IS NOT NULL
+            GROUP BY p.country_id
+            """
+        ):
+            country(row[0]).update(power_plant_count=row[1], power_production=row[2])
+        return aggregates
 
+    def check_country_aggregates(self, repair: bool = False) -> dict:
+        """Compare CountryAggregates to a full recount; `repair` rewrites the table.
+
+        Returns the countries whose stored aggregates were wrong, with the
+        expected and stored values.
+        """
+        try:
+            with self.transaction():
+                expected = self._compute_country_aggregates()
+                stored = {
+                    row["country_id"]: {
+                        column: row[column] for column in AGGREGATE_COLUMNS
+                    }
+                    for row in self.fetch_all("SELECT * FROM CountryAggregates")
+                }
+                empty = dict.fromkeys(AGGREGATE_COLUMNS, 0)
+                mismatches = [
+                    {
+                        "country_id": country_id,
+                        "expected": expected.get(country_id, empty),
+                        "stored": stored.get(country_id, empty),
+                    }
+                    for country_id in sorted(expected.keys() | stored.keys())
+                    if expected.get(country_id, empty) != stored.get(country_id, empty)
+                ]
+                if repair and mismatches:
+                    self.cur.execute("DELETE FROM CountryAggregates")
+                    self.cur.executemany(
+                        f"INSERT INTO CountryAggregates (country_id, {', '.join(AGGREGATE_COLUMNS)}) "
+                        f"VALUES (?{', ?' * len(AGGREGATE_COLUMNS)})",
+                        [
+                            (
+                                country_id,
+                                *(totals[column] for column in AGGREGATE_COLUMNS),
+                            )
+                            for country_id, totals in expected.items()
+                        ],
+                    )
+        except sqlite3.Error as e:
+            print(f"Error checking country aggregates: {e}")
+            return {"success": False, "error": str(e)}
+        return {
+            "success": True,
+            "countries": len(expected),
+            "mismatches": mismatches,
+            "repaired": bool(repair and mismatches),
+        }
+
+    @locked_write
     def set_paused(self, is_paused: bool):
         """Met à jour l'état de pause du temps RP."""
         paused_value = 1 if is_paused else 0
@@ -1115,29 +1581,36 @@ class Database:
             "UPDATE ServerSettings SET value = ? WHERE key = 'is_paused'",
             (paused_value,),
         )
-        self.conn.commit()
+        self._commit()
+        self.settings.set_local("is_paused", paused_value)
+
+    @locked_write
+    def set_setting(self, key: str, value) -> None:
+        """Crée ou met à jour un paramètre du serveur."""
+        self.cur.execute(
+            "INSERT INTO ServerSettings (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, str(value)),
+        )
+        self._commit()
+        self.settings.set_local(key, value)
 
     def get_setting(self, key: str) -> str:
-        """Récupère une valeur de paramètre du serveur."""
-        self.cur.execute("SELECT value FROM ServerSettings WHERE key = ?", (key,))
-        result = self.cur.fetchone()
-        if result:
-            return result[0]
-        return None
+        """Récupère une valeur de paramètre du serveur (depuis le cache)."""
+        return self.settings.get(key)
 
     def is_paused(self) -> bool:
         """Vérifie si le temps RP est en pause."""
-        return self.get_setting("is_paused") == "1"
+        return self.settings.get_bool("is_paused")
 
     def get_stats_by_country(self, country_id: str) -> dict:
         """Récupère les stats d'un pays."""
         # Build stats from canonical tables to avoid depending on fragile views
-        self.cur.execute(
+        base = self.fetch_one(
             "SELECT c.country_id, c.name, IFNULL(s.gdp, 0) as gdp "
             "FROM Countries c LEFT JOIN Stats s ON c.country_id = s.country_id WHERE c.country_id = ?",
             (country_id,),
         )
-        base = self.cur.fetchone()
 
         if not base:
             return {
@@ -1149,19 +1622,8 @@ class Database:
                 "gdp": 0,
             }
 
-        # population: sum Regions.population where country_id
-        self.cur.execute(
-            "SELECT IFNULL(SUM(population),0) FROM Regions WHERE country_id = ?",
-            (country_id,),
-        )
-        population = self.cur.fetchone()[0]
-
-        # population capacity: sum Structures.capacity joined to Regions
-        self.cur.execute(
-            "SELECT IFNULL(SUM(s.capacity),0) FROM Structures s JOIN Regions r ON s.region_id = r.region_id WHERE r.country_id = ? AND s.type = 'Logement'",
-            (country_id,),
-        )
-        population_capacity = self.cur.fetchone()[0]
+        # population and housing capacity are kept up to date in CountryAggregates
+        aggregates = self.get_country_aggregates(country_id)
 
         # Get Global tech level as the default "tech_level" for backward compatibility
         global_tech_level = self.get_country_technology_level(country_id, "Global")
@@ -1169,12 +1631,13 @@ class Database:
         return {
             "country_id": base["country_id"],
             "name": base["name"],
-            "population": int(population),
-            "population_capacity": int(population_capacity),
+            "population": int(aggregates["population"]),
+            "population_capacity": int(aggregates["housing_capacity"]),
             "tech_level": global_tech_level,
             "gdp": int(base["gdp"]),
         }
 
+    @locked_write
     def add_technology(
         self,
         specialisation,
@@ -1235,22 +1698,18 @@ class Database:
             """,
                 (tech_id, key, value),
             )
-        self.conn.commit()
+        self._commit()
         return tech_id
 
     def get_current_date(self) -> dict:
-        """Récupère la date actuelle du jeu."""
-        self.cur.execute(
-            "SELECT year, month, playday FROM Dates ORDER BY real_date DESC LIMIT 1"
-        )
-        result = self.cur.fetchone()
-        if result:
-            return {
-                "year": result["year"],
-                "month": result["month"],
-                "playday": result["playday"],
-            }
-        return {"year": 2023, "month": 1, "playday": 0}
+        """Récupère la date actuelle du jeu (depuis l'horloge en mémoire)."""
+        self.settings.refresh_if_changed()
+        return self.clock.current.as_dict()
+
+    def get_current_month_index(self) -> int:
+        """Mois de jeu courant sous forme absolue (year * 12 + month - 1)."""
+        self.settings.refresh_if_changed()
+        return self.clock.current.month_index
 
     def get_date_from_irl(self, date_str: str) -> dict:
         """Récupère la date du jeu à partir d'une date IRL."""
@@ -1268,17 +1727,10 @@ class Database:
 
     def get_playdays_in_month(self, month: int) -> int:
         """Récupère le nombre de playdays dans un mois donné."""
-        self.cur.execute(
-            "SELECT playdays FROM PlaydaysPerMonth WHERE month_number = ?", (month,)
-        )
-        result = self.cur.fetchone()
-        return result["playdays"] if result else 2
+        self.settings.refresh_if_changed()
+        return self.clock.playdays_in_month(month)
 
     async def advance_playday(self, bot):
-        # Récupère la dernière date enregistrée
-        self.cur.execute("SELECT * FROM Dates ORDER BY real_date DESC LIMIT 1")
-        row = self.cur.fetchone()
-
         today = datetime.now(timezone.utc)
         today_str = today.isoformat()  # Convert to ISO string format for comparison
 
@@ -1289,64 +1741,39 @@ class Database:
             print("⏸️ Temps RP en pause. Rien à faire.", flush=True)
             return
 
-        if row:
-            year, month, playday = row["year"], row["month"], row["playday"]
-        else:
-            year, month, playday = 2023, 1, 0
-
-        # Récupérer le nombre de playdays max pour le mois
-        self.cur.execute(
-            "SELECT playdays FROM PlaydaysPerMonth WHERE month_number = ?", (month,)
-        )
-        playdays_result = self.cur.fetchone()
-        if not playdays_result:
+        # Date courante et calendrier : depuis l'horloge en mémoire
+        self.settings.refresh_if_changed()
+        current_month = self.clock.current.month
+        if not self.clock.is_configured(current_month):
             print(
-                f"⚠️ Aucune configuration trouvée pour le mois {month}, utilisation de 2 playdays par défaut",
+                f"⚠️ Aucune configuration trouvée pour le mois {current_month}, utilisation de 2 playdays par défaut",
                 flush=True,
             )
-            playdays_in_month = 2
-        else:
-            playdays_in_month = playdays_result["playdays"]
+        year, month, playday = self.clock.next_date()
 
-        if playday < playdays_in_month:
-            playday += 1
-        else:
-            playday = 1
-            if month == 12:
-                year += 1
-                month = 1
-                self.set_paused(True)  # Pause le temps RP à la fin de l'année
-                is_paused = True
-                await self.pay_everyones_maintenance(bot)
-            else:
-                month += 1
+        if month == 1 and playday == 1 and current_month == 12:
+            self.set_paused(True)  # Pause le temps RP à la fin de l'année
+            is_paused = True
+            await self.pay_everyones_maintenance(bot)
 
-        # Vérifier si cette date existe déjà avant d'insérer
-        self.cur.execute(
-            """
-            SELECT 1 FROM Dates
-            WHERE year = ? AND month = ? AND playday = ?
-        """,
-            (year, month, playday),
-        )
-
-        if self.cur.fetchone():
+        # Insérer la nouvelle ligne (une date déjà présente n'est pas réinsérée) ;
+        # l'horloge n'avance qu'une fois la ligne validée
+        with self.transaction():
+            self.cur.execute(
+                """
+                INSERT OR IGNORE INTO Dates (year, month, playday, real_date)
+                VALUES (?, ?, ?, ?)
+            """,
+                (year, month, playday, today_str),
+            )
+            inserted = self.cur.rowcount
+        if not inserted:
             print(
                 f"⚠️ Date {year}-{month}-{playday} existe déjà, pas d'insertion",
                 flush=True,
             )
             return
-
-        # Insérer la nouvelle ligne
-        self.cur.execute(
-            """
-            INSERT INTO Dates (year, month, playday, real_date)
-            VALUES (?, ?, ?, ?)
-        """,
-            (year, month, playday, today_str),
-        )
-
-        self.conn.commit()
+        self.clock.set_current((year, month, playday))
 
         try:
             locale.setlocale(locale.LC_TIME, "fr_FR.UTF-8")  # Système Unix/Linux
@@ -1372,14 +1799,24 @@ class Database:
 
         print(f"📅 Avancé à {year}-{month}-{playday} (pause: {is_paused})", flush=True)
 
-    async def pay_everyones_maintenance(self, bot):
-        """Fait payer la maintenance à tous les pays."""
+    async def pay_everyones_maintenance(self, bot, max_concurrency: int = 5):
+        """Fait payer la maintenance à tous les pays.
+
+        Trois étapes : préparation des récapitulatifs, débit de tous les pays
+        dans une seule transaction, puis envoi des messages en parallèle
+        (au plus `max_concurrency` salons à la fois). Les messages d'un même
+        pays partent dans l'ordre ; discord.py gère les buckets de rate limit
+        par salon et attend de lui-même en cas de 429.
+        """
+        timings = {}
+        stage_start = time.perf_counter()
         maintenance_dict = await self.get_all_salaries()
         embed_datas = {
             "title": "Paiement de la maintenance des soldats pour {country}",
             "color": discord.Color.green(),
             "description": "Voici le récapitulatif des paiements de maintenance.",
         }
+        payments = []
         for country_id, salary_data in maintenance_dict.items():
             country_data = self.get_country_datas(country_id)
             if not country_data:
@@ -1389,15 +1826,15 @@ class Database:
             country_secret_channel = bot.get_channel(
                 int(country_data["secret_channel_id"])
             )
+            if not country_secret_channel:
+                print(f"Canal secret introuvable pour le pays {country_id}.")
+                continue
             country_role = country_secret_channel.guild.get_role(
                 int(country_data["role_id"])
             )
             if not country_role:
                 print(f"Rôle introuvable pour le pays {country_id}.")
                 continue
-            if not country_secret_channel:
-                print(f"Canal secret introuvable pour le pays {country_id}.")
-                continue
             embed = discord.Embed(**embed_datas)
             embed.title = embed.title.format(country=country_data["name"])
 
@@ -1414,87 +1851,92 @@ class Database:
             embed.description += f"\n\nTotal: {convert(str(total_price))}€"
             if total_price <= 0:
                 continue
-            await country_secret_channel.send(embed=embed)
-            if not self.has_enough_balance(country_id, total_price):
-                embed_error = discord.Embed(
+            payments.append(
+                (country_id, country_data, country_secret_channel, embed, total_price)
+            )
+
+        timings["preparation"] = time.perf_counter() - stage_start
+
+        # Debit every country in one commit, without awaiting in between
+        stage_start = time.perf_counter()
+        paid = set()
+        with self.transaction():
+            for country_id, _, _, _, total_price in payments:
+                if self.has_enough_balance(country_id, total_price):
+                    self.take_balance(country_id, total_price, reason="maintenance")
+                    paid.add(country_id)
+        timings["debit"] = time.perf_counter() - stage_start
+
+        # Notify every country, a bounded number of channels at a time
+        stage_start = time.perf_counter()
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def notify(country_id, country_data, channel, embed, total_price):
+            if country_id in paid:
+                result_embed = discord.Embed(
+                    title="Salaires payés",
+                    description=f"Les salaires de maintenance pour {country_data['name']} ont été payés avec succès ({convert(str(total_price))}€).",
+                    color=discord.Color.green(),
+                )
+            else:
+                result_embed = discord.Embed(
                     title="Solde insuffisant",
                     description=f"⚠️ {country_data['name']} n'a pas assez de fonds pour payer la maintenance ({total_price}€).",
                     color=discord.Color.red(),
                 )
-                await country_secret_channel.send(embed=embed_error)
-                continue
-            self.take_balance(country_id, total_price)
-            embed_success = discord.Embed(
-                title="Salaires payés",
-                description=f"Les salaires de maintenance pour {country_data['name']} ont été payés avec succès ({convert(str(total_price))}€).",
-                color=discord.Color.green(),
-            )
-            await country_secret_channel.send(embed=embed_success)
+            async with semaphore:
+                try:
+                    await channel.send(embed=embed)
+                    await channel.send(embed=result_embed)
+                except discord.HTTPException as e:
+                    print(
+                        f"Erreur lors de l'envoi de la maintenance au pays {country_id}: {e}"
+                    )
+
+        await asyncio.gather(*(notify(*payment) for payment in payments))
+        timings["notification"] = time.perf_counter() - stage_start
+
+        print(
+            f"💰 Maintenance : {len(paid)}/{len(payments)} pays débités - "
+            + ", ".join(
+                f"{name} {value * 1000:.0f} ms" for name, value in timings.items()
+            ),
+            flush=True,
+        )
+        return timings
 
     def get_country_by_name(self, country_name: str) -> str:
         """Récupère l'ID d'un pays par son nom."""
-        self.cur.execute(
-            "SELECT country_id FROM Countries WHERE name = ?", (country_name,)
-        )
-        result = self.cur.fetchone()
-        return result[0] if result else None
+        return self.identities.country_of_name(country_name)
 
     def get_country_secret_channel(self, country_id: str) -> str:
         """Récupère le canal secret d'un pays."""
-        self.cur.execute(
-            "SELECT secret_channel_id FROM Countries WHERE country_id = ?",
-            (country_id,),
-        )
-        result = self.cur.fetchone()
-        return result[0] if result else None
+        country = self.identities.country(country_id)
+        return country["secret_channel_id"] if country else None
 
     def get_players_country(self, player_id: str) -> str:
         """Récupère le pays d'un joueur."""
-        self.cur.execute(
-            "SELECT country_id FROM Governments WHERE player_id = ?", (player_id,)
-        )
-        result = self.cur.fetchone()
-        return result[0] if result else None
+        return self.identities.country_of_player(player_id)
 
     def get_country_by_role(self, role_id: str) -> str:
         """Récupère le pays associé à un rôle Discord."""
-        self.cur.execute(
-            "SELECT country_id FROM Countries WHERE role_id = ?", (role_id,)
-        )
-        result = self.cur.fetchone()
-        return result[0] if result else None
+        return self.identities.country_of_role(role_id)
 
     def get_country_by_id(self, country_id: str) -> str:
         """Récupère le nom d'un pays par son ID."""
-        self.cur.execute(
-            "SELECT name FROM Countries WHERE country_id = ?", (country_id,)
-        )
-        result = self.cur.fetchone()
-        return result[0] if result else None
+        country = self.identities.country(country_id)
+        return country["name"] if country else None
 
     def get_country_role_with_id(self, country_id: str) -> str:
         """Récupère le rôle associé à un pays par son ID."""
-        self.cur.execute(
-            "SELECT role_id FROM Countries WHERE country_id = ?", (country_id,)
-        )
-        result = self.cur.fetchone()
-        return result[0] if result else None
+        country = self.identities.country(country_id)
+        return country["role_id"] if country else None
 
     def get_country_datas(self, country_id: str) -> dict:
-        """Récupère les données d'un pays."""
-        self.cur.execute("SELECT * FROM Countries WHERE country_id = ?", (country_id,))
-        result = self.cur.fetchone()
-        if result:
-            return {
-                "country_id": result["country_id"],
-                "name": result["name"],
-                "role_id": result["role_id"],
-                "public_channel_id": result["public_channel_id"],
-                "secret_channel_id": result["secret_channel_id"],
-                "last_bilan": result["last_bilan"],
-            }
-        return None
+        """Récupère les données d'un pays (depuis le cache des identités)."""
+        return self.identities.country(country_id)
 
+    @locked_write
     def add_units(self, country_id: str, unit_type: str, quantity: int):
         """Ajoute des unités à un pays."""
         if quantity <= 0:
@@ -1518,41 +1960,42 @@ class Database:
                 """,
                 (country_id, unit_type, quantity),
             )
-        self.conn.commit()
+        self._commit()
 
     def get_units(self, country_id: str, unit_type: str = None) -> int:
         """Récupère le nombre d'unités d'un type spécifique pour un pays."""
         if unit_type:
-            self.cur.execute(
+            result = self.fetch_one(
                 "SELECT quantity FROM InventoryUnits WHERE country_id = ? AND unit_type = ?",
                 (country_id, unit_type),
             )
-            result = self.cur.fetchone()
             return result[0] if result else 0
         return 0
 
+    @locked_write
     def execute_script(self, script: str):
         """Execute a SQL script."""
         try:
             self.cur.executescript(script)
-            self.conn.commit()
+            self._commit()
         except sqlite3.Error as e:
             print(f"Erreur lors de l'exécution du script : {e}")
-            self.conn.rollback()
+            self._rollback()
 
     def get_structure_informations(self, structure_id: int) -> dict:
-        # Retrieve full structure information (join Regions to get country ownership)
-        return self.cur.execute(
+        # Retrieve full structure information (join Regions for the region name)
+        return self.fetch_one(
             """
             SELECT s.id as structure_id, s.type, s.specialisation, s.level, s.capacity, s.population,
-                   r.region_id, r.country_id, r.name as region_name
+                   s.region_id, s.country_id, r.name as region_name
             FROM Structures s
             JOIN Regions r ON s.region_id = r.region_id
             WHERE s.id = ?
             """,
             (structure_id,),
-        ).fetchone()
+        )
 
+    @locked_write
     def start_production(
         self, structure_id: int, tech_id: int, quantity: int, country_id: int
     ) -> dict:
@@ -1622,8 +2065,10 @@ class Database:
             tech_type_lower = tech["type"].lower()
             production_time = production_delays.get(tech_type_lower, base_time)
 
+            completion_month = self.get_current_month_index() + production_time
+
             # Start production
-            self.take_balance(country_id, total_cost)
+            self.take_balance(country_id, total_cost, reason="production")
 
             # Add to StructureProduction table (concatenate quantity if exists)
             self.cur.execute(
@@ -1639,13 +2084,15 @@ class Database:
                 self.cur.execute(
                     """
                     UPDATE StructureProduction
-                    SET quantity = ?, months_remaining = ?, started_at = ?
+                    SET quantity = ?, months_remaining = ?, started_at = ?,
+                        completion_month = ?
                     WHERE structure_id = ? AND tech_id = ?
                     """,
                     (
                         new_quantity,
                         production_time,
                         datetime.now().isoformat(),
+                        completion_month,
                         structure_id,
                         tech_id,
                     ),
@@ -1654,8 +2101,9 @@ class Database:
                 self.cur.execute(
                     """
                     INSERT INTO StructureProduction 
-                    (structure_id, tech_id, quantity, months_remaining, started_at)
-                    VALUES (?, ?, ?, ?, ?)
+                    (structure_id, tech_id, quantity, months_remaining, started_at,
+                     completion_month)
+                    VALUES (?, ?, ?, ?, ?, ?)
                     """,
                     (
                         structure_id,
@@ -1663,10 +2111,11 @@ class Database:
                         quantity,
                         production_time,
                         datetime.now().isoformat(),
+                        completion_month,
                     ),
                 )
 
-            self.conn.commit()
+            self._commit()
             slots_remaining = capacity_info["remaining_capacity"] - slots_needed
 
             return {
@@ -1683,7 +2132,7 @@ class Database:
     def has_technology_access(self, country_id: int, tech_id: int) -> bool:
         """Check if country has access to technology (owns it or has license)."""
         # Check if country developed it
-        self.cur.execute(
+        result = self.fetch_one(
             """
             SELECT 1 FROM Technologies 
             WHERE tech_id = ? AND developed_by = ?
@@ -1691,11 +2140,11 @@ class Database:
             (tech_id, country_id),
         )
 
-        if self.cur.fetchone():
+        if result:
             return True
 
         # Check if country has license
-        self.cur.execute(
+        result = self.fetch_one(
             """
             SELECT 1 FROM TechnologyLicenses 
             WHERE tech_id = ? AND country_id = ?
@@ -1703,8 +2152,9 @@ class Database:
             (tech_id, country_id),
         )
 
-        return self.cur.fetchone() is not None
+        return result is not None
 
+    @locked_write
     def sell_technology_inventory(
         self,
         seller_country_id: int,
@@ -1756,34 +2206,33 @@ class Database:
             if not self.has_enough_balance(buyer_country_id, final_price):
                 return {"success": False, "error": "Buyer has insufficient balance"}
 
-            # Execute transfer
-            # Remove from seller inventory
-            self.cur.execute(
-                """
-                UPDATE CountryTechnologyInventory 
-                SET quantity = quantity - ? 
-                WHERE country_id = ? AND tech_id = ?
-            """,
-                (quantity, seller_country_id, tech_id),
-            )
-
-            # Add to buyer inventory
-            self.cur.execute(
-                """
-                INSERT OR REPLACE INTO CountryTechnologyInventory 
-                (country_id, tech_id, quantity)
-                VALUES (?, ?, 
-                    COALESCE((SELECT quantity FROM CountryTechnologyInventory 
-                             WHERE country_id = ? AND tech_id = ?), 0) + ?)
-            """,
-                (buyer_country_id, tech_id, buyer_country_id, tech_id, quantity),
-            )
+            # Execute transfer in a single commit
+            with self.transaction():
+                # Remove from seller inventory
+                self.cur.execute(
+                    """
+                    UPDATE CountryTechnologyInventory 
+                    SET quantity = quantity - ? 
+                    WHERE country_id = ? AND tech_id = ?
+                """,
+                    (quantity, seller_country_id, tech_id),
+                )
 
-            # Transfer money
-            self.take_balance(buyer_country_id, final_price)
-            self.give_balance(seller_country_id, final_price)
+                # Add to buyer inventory
+                self.cur.execute(
+                    """
+                    INSERT OR REPLACE INTO CountryTechnologyInventory 
+                    (country_id, tech_id, quantity)
+                    VALUES (?, ?, 
+                        COALESCE((SELECT quantity FROM CountryTechnologyInventory 
+                                 WHERE country_id = ? AND tech_id = ?), 0) + ?)
+                """,
+                    (buyer_country_id, tech_id, buyer_country_id, tech_id, quantity),
+                )
 
-            self.conn.commit()
+                # Transfer money
+                self.take_balance(buyer_country_id, final_price, reason="tech_sale")
+                self.give_balance(seller_country_id, final_price, reason="tech_sale")
 
             return {
                 "success": True,
@@ -1795,86 +2244,63 @@ class Database:
         except Exception as e:
             return {"success": False, "error": f"Database error: {str(e)}"}
 
+    @locked_write
     def process_production_cycle(self) -> list:
-        """Process all ongoing productions and complete those that are ready."""
-        completed_productions = []
-
+        """Complete every production whose completion month has been reached."""
         try:
-            # Get all ongoing productions
-            self.cur.execute(
-                """
-                SELECT sp.*, t.name as tech_name, t.type as tech_type
-                FROM StructureProduction sp
-                JOIN Technologies t ON sp.tech_id = t.tech_id
-                WHERE sp.months_remaining > 0
-            """
-            )
-
-            productions = self.cur.fetchall()
-
-            for production in productions:
-                # Decrease remaining time
-                new_months_remaining = production["months_remaining"] - 1
-
-                if new_months_remaining <= 0:
-                    # Production complete - add to inventory
-                    structure_info = self.get_structure_informations(
-                        production["structure_id"]
-                    )
-                    country_id = structure_info["country_id"]
+            current_month = self.get_current_month_index()
+            with self.transaction():
+                # Only the due orders are read, through idx_structure_production_completion
+                self.cur.execute(
+                    """
+                    SELECT sp.structure_id, sp.tech_id, sp.quantity, s.country_id,
+                           t.name as tech_name, t.type as tech_type
+                    FROM StructureProduction sp
+                    JOIN Technologies t ON sp.tech_id = t.tech_id
+                    JOIN Structures s ON sp.structure_id = s.id
+                    WHERE sp.completion_month <= ? AND s.country_id IS NOT NULL
+                """,
+                    (current_month,),
+                )
+                completed_productions = [
+                    {
+                        "country_id": production["country_id"],
+                        "tech_name": production["tech_name"],
+                        "tech_type": production["tech_type"],
+                        "quantity": production["quantity"],
+                        "structure_id": production["structure_id"],
+                        "tech_id": production["tech_id"],
+                    }
+                    for production in self.cur.fetchall()
+                ]
 
-                    # Add to country inventory
-                    self.cur.execute(
-                        """
-                        INSERT OR REPLACE INTO CountryTechnologyInventory 
+                # Add every completed order to its country's inventory at once
+                totals = {}
+                for production in completed_productions:
+                    key = (production["country_id"], production["tech_id"])
+                    totals[key] = totals.get(key, 0) + production["quantity"]
+                self.cur.executemany(
+                    """
+                    INSERT INTO CountryTechnologyInventory (country_id, tech_id, quantity)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(country_id, tech_id)
+                    DO UPDATE SET quantity = quantity + excluded.quantity
+                """,
+                    [
                         (country_id, tech_id, quantity)
-                        VALUES (?, ?, 
-                            COALESCE((SELECT quantity FROM CountryTechnologyInventory 
-                                     WHERE country_id = ? AND tech_id = ?), 0) + ?)
-                    """,
-                        (
-                            country_id,
-                            production["tech_id"],
-                            country_id,
-                            production["tech_id"],
-                            production["quantity"],
-                        ),
-                    )
-
-                    # Remove from production queue
-                    self.cur.execute(
-                        """
-                        DELETE FROM StructureProduction 
-                        WHERE structure_id = ? AND tech_id = ?
-                    """,
-                        (production["structure_id"], production["tech_id"]),
-                    )
-
-                    completed_productions.append(
-                        {
-                            "country_id": country_id,
-                            "tech_name": production["tech_name"],
-                            "tech_type": production["tech_type"],
-                            "quantity": production["quantity"],
-                            "structure_id": production["structure_id"],
-                        }
-                    )
-                else:
-                    # Update remaining time
-                    self.cur.execute(
-                        """
-                        UPDATE StructureProduction 
-                        SET months_remaining = ? 
-                        WHERE structure_id = ? AND tech_id = ?
-                    """,
-                        (
-                            new_months_remaining,
-                            production["structure_id"],
-                            production["tech_id"],
-                        ),
-                    )
+                        for (country_id, tech_id), quantity in totals.items()
+                    ],
+                )
 
-            self.conn.commit()
+                # Remove them from the production queue. Orders of a factory
+                # whose region has no owner stay queued until it gets one
+                self.cur.executemany(
+                    "DELETE FROM StructureProduction WHERE structure_id = ? AND tech_id = ?",
+                    [
+                        (production["structure_id"], production["tech_id"])
+                        for production in completed_productions
+                    ],
+                )
             return completed_productions
 
         except Exception as e:
@@ -1884,21 +2310,33 @@ class Database:
     def get_country_productions(self, country_id: int) -> list:
         """Get all ongoing productions for a country."""
         try:
-            self.cur.execute(
+            rows = self.fetch_all(
                 """
-                SELECT sp.*, t.name as tech_name, t.type as tech_type, 
+                SELECT sp.structure_id, sp.tech_id, sp.quantity,
+                       MAX(sp.completion_month - ?, 0) as months_remaining,
+                       sp.started_at, sp.completion_month,
+                       t.name as tech_name, t.type as tech_type, 
                        s.type as structure_type, r.name as region_name
                 FROM StructureProduction sp
                 JOIN Technologies t ON sp.tech_id = t.tech_id
                 JOIN Structures s ON sp.structure_id = s.id
                 JOIN Regions r ON s.region_id = r.region_id
-                WHERE r.country_id = ?
-                ORDER BY sp.months_remaining ASC
+                WHERE s.country_id = ?
+                ORDER BY sp.completion_month ASC
             """,
-                (country_id,),
+                (self.get_current_month_index(), country_id),
             )
 
-            return [dict(row) for row in self.cur.fetchall()]
+            # ETA in playdays: completed on the first playday of completion_month
+            return [
+                {
+                    **dict(row),
+                    "playdays_remaining": self.clock.playdays_until_month(
+                        row["completion_month"]
+                    ),
+                }
+                for row in rows
+            ]
 
         except Exception as e:
             print(f"Error getting country productions: {e}")
@@ -1907,7 +2345,7 @@ class Database:
     def get_country_technology_inventory(self, country_id: int) -> list:
         """Get all technology inventory for a country."""
         try:
-            self.cur.execute(
+            rows = self.fetch_all(
                 """
                 SELECT cti.quantity, t.name, t.type, t.specialisation, t.technology_level,
                        t.image_url, t.tech_id
@@ -1919,44 +2357,46 @@ class Database:
                 (country_id,),
             )
 
-            return [dict(row) for row in self.cur.fetchall()]
+            return [dict(row) for row in rows]
 
         except Exception as e:
             print(f"Error getting country technology inventory: {e}")
             return []
 
+    def _get_units_with_pricings(self, country_id: int = None) -> list:
+        """Non-public units of every country (or one) joined with their pricing.
+
+        One query for all countries: rows are ordered by country then unit,
+        and carry the country's yearly maintenance total.
+        """
+        query = """
+            SELECT iu.country_id, iu.unit_type, iu.quantity,
+                   COALESCE(ip.price, 0) AS price,
+                   COALESCE(ip.maintenance, 0) AS maintenance,
+                   SUM(COALESCE(ip.maintenance, 0) * 12 * iu.quantity)
+                       OVER (PARTITION BY iu.country_id) AS total_maintenance
+            FROM InventoryUnits iu
+            LEFT JOIN InventoryPricings ip ON ip.item = iu.unit_type
+            WHERE substr(iu.unit_type, 1, 7) != 'public_'
+        """
+        params = ()
+        if country_id is not None:
+            query += " AND iu.country_id = ?"
+            params = (country_id,)
+        query += " ORDER BY iu.country_id, iu.unit_type"
+        return self.fetch_all(query, params)
+
     def get_country_units_inventory(self, country_id: int) -> dict:
         """Get all units inventory for a country, formatted like in maintenance."""
         try:
             return_value = {}
-
-            self.cur.execute(
-                "SELECT * FROM InventoryUnits WHERE country_id = ?", (country_id,)
-            )
-            for row in self.cur.fetchall():
-                unit_id = row[1]
-                quantity = row[2]
-                if unit_id.startswith("public_"):
-                    continue
-
-                self.cur.execute(
-                    "SELECT price, maintenance FROM InventoryPricings WHERE item = ?",
-                    (unit_id,),
-                )
-                pricing_result = self.cur.fetchone()
-                price = pricing_result[0] if pricing_result else 0
-                maintenance = pricing_result[1] if pricing_result else 0
-
-                # Get unit name from unit_types, fallback to unit_id if not found
-                unit_name_list = [
-                    name for name, id in unit_types.items() if id == unit_id
-                ]
-                unit_name = unit_name_list[0] if unit_name_list else unit_id
-
+            for row in self._get_units_with_pricings(country_id):
+                unit_id = row["unit_type"]
+                unit_name = unit_names.get(unit_id, unit_id)
                 return_value[unit_name] = {
-                    "quantity": quantity,
-                    "price": price or 0,
-                    "maintenance": maintenance or 0,
+                    "quantity": row["quantity"],
+                    "price": row["price"],
+                    "maintenance": row["maintenance"],
                     "unit_id": unit_id,
                 }
 
@@ -1990,6 +2430,7 @@ class Database:
         else:
             return 0
 
+    @locked_write
     def update_country_stat(self, country_id: str, stat_name: str, value: int):
         """Met à jour une statistique d'un pays."""
         self.cur.execute(
@@ -2000,14 +2441,16 @@ class Database:
         """,
             (country_id, value, value),
         )
-        self.conn.commit()
+        self._commit()
         return True
 
     def get_personne_with_name(self, pseudo: str):
         """Récupère une personne par son pseudo."""
-        self.cur.execute("SELECT * FROM Personne WHERE nom_commun LIKE ?", (pseudo,))
-        return self.cur.fetchone()
+        return self.fetch_one(
+            "SELECT * FROM Personne WHERE nom_commun LIKE ?", (pseudo,)
+        )
 
+    @locked_write
     def create_personne(self, pseudo: str, raison: str, gravite: int):
         """Crée une nouvelle personne."""
         if gravite < 1 or gravite > 3:
@@ -2016,128 +2459,96 @@ class Database:
             "INSERT INTO Personne (nom_commun, raison, gravite) VALUES (?, ?, ?)",
             (pseudo, raison, gravite),
         )
-        self.conn.commit()
+        self._commit()
+        self.reload_watchlist()
 
+    @locked_write
     def create_user_intel(self, user_id: int, username: str, personne_id: int):
         """Crée une nouvelle entrée d'intelligence pour un utilisateur."""
         self.cur.execute(
             "INSERT INTO Compte (id_discord, username, id_personne) VALUES (?, ?, ?)",
             (user_id, username, personne_id),
         )
-        self.conn.commit()
+        self._commit()
+        self.reload_watchlist()
 
     def get_personne_info(self, id_personne: int):
         """Récupère les informations d'une personne."""
-        self.cur.execute("SELECT * FROM Personne WHERE id = ?", (id_personne,))
-        return self.cur.fetchone()
+        return self.fetch_one("SELECT * FROM Personne WHERE id = ?", (id_personne,))
 
     def get_accounts_from_personne(self, id_personne: int):
         """Récupère les comptes d'une personne."""
-        self.cur.execute("SELECT * FROM Compte WHERE id_personne = ?", (id_personne,))
-        return self.cur.fetchall()
+        return self.fetch_all(
+            "SELECT * FROM Compte WHERE id_personne = ?", (id_personne,)
+        )
 
     def get_all_accounts_with_type(self, id_personne: int, gravite_list: list[int]):
         """Récupère tous les comptes d'une personne avec un niveau de gravité spécifique."""
-        self.cur.execute(
+        return self.fetch_all(
             "SELECT * FROM Compte WHERE id_personne = ? AND gravite IN ({seq})".format(
                 seq=",".join(["?"] * len(gravite_list))
             ),
             (id_personne, *gravite_list),
         )
-        return self.cur.fetchall()
 
-    def get_gravite_for_member_id(self, id_personne: str):
-        """Récupère le niveau de gravité d'un membre."""
-        self.cur.execute(
-            "SELECT p.gravite FROM Personne p JOIN Compte c ON p.id = c.id_personne WHERE c.id_discord = ?",
-            (id_personne,),
+    def reload_watchlist(self):
+        """Rebuild the Discord ID -> gravité map of the Fiche S and swap it in."""
+        rows = self.fetch_all(
+            "SELECT c.id_discord, p.gravite FROM Compte c JOIN Personne p ON p.id = c.id_personne"
         )
-        result = self.cur.fetchone()
-        return result[0] if result else None
+        self._watchlist = {int(row[0]): row[1] for row in rows}
+
+    def get_gravite_for_member_id(self, id_personne: str):
+        """Récupère le niveau de gravité d'un membre (None s'il n'est pas surveillé).
+
+        Appelé pour chaque événement Discord : servi depuis la mémoire, les
+        comptes non surveillés ne coûtent aucune requête.
+        """
+        self.settings.refresh_if_changed()
+        return self._watchlist.get(int(id_personne))
 
     def get_personne_from_account_id(self, discord_id: int):
         """Récupère la personne associée à un compte Discord."""
-        self.cur.execute(
+        return self.fetch_one(
             "SELECT p.* FROM Personne p JOIN Compte c ON p.id = c.id_personne WHERE c.id_discord = ?",
             (discord_id,),
         )
-        return self.cur.fetchone()
 
     def get_sanctions_for_personne(self, id_personne: str):
         """Récupère les sanctions d'une personne."""
-        self.cur.execute(
+        return self.fetch_all(
             "SELECT * FROM Sanctions WHERE id_personne = ?", (id_personne,)
         )
-        return self.cur.fetchall()
 
     # New methods for the updated structure system
 
     def get_technology_boost(self, tech_level: int) -> float:
         """Get technology boost coefficient for a given tech level."""
-        self.cur.execute(
-            "SELECT boost_coefficient FROM TechnologyBoosts WHERE tech_level = ?",
-            (tech_level,),
-        )
-        result = self.cur.fetchone()
-        return result[0] if result else 1.0
+        return self.reference.tech_boosts.get(tech_level, 1.0)
 
     def get_country_technology_level(
         self, country_id: int, domain: str = "Global"
     ) -> int:
         """Get the technology level of a country for a specific domain."""
-        # Tech levels are now stored per-domain in CountryTechnologies
+        # Tech levels are stored per-domain in CountryTechnologies, served from
+        # the cached matrix (domain -> 'Global' -> 1 fallbacks already resolved)
         # Valid domains: 'Terrestre', 'Aerospatial', 'Maritime', 'Global'
-        self.cur.execute(
-            "SELECT level FROM CountryTechnologies WHERE country_id = ? AND tech_field = ?",
-            (country_id, domain),
-        )
-        result = self.cur.fetchone()
-        if result:
-            return int(result[0])
-
-        # If no specific domain level found, try Global as fallback
-        if domain != "Global":
-            self.cur.execute(
-                "SELECT level FROM CountryTechnologies WHERE country_id = ? AND tech_field = 'Global'",
-                (country_id,),
-            )
-            result = self.cur.fetchone()
-            if result:
-                return int(result[0])
-
-        # Default to level 1 if no tech levels found
-        return 1
+        return self.tech_levels.level(country_id, domain)
 
     def get_structure_data(
         self, structure_type: str, specialisation: str, level: int
     ) -> dict:
         """Get complete structure data for given type, specialisation, and level."""
-        self.cur.execute(
-            """
-            SELECT capacity, population, cout_construction
-            FROM StructuresDatas 
-            WHERE type = ? AND specialisation = ? AND level = ?
-        """,
-            (structure_type, specialisation, level),
-        )
-        result = self.cur.fetchone()
+        result = self.reference.get_structure(structure_type, specialisation, level)
         if result:
-            return {
-                "capacity": result[0],
-                "required_population": result[1],
-                "construction_cost": result[2],
-            }
+            return dict(result)
         return None
 
     def get_infrastructure_cost(self, infrastructure_type: str) -> int:
         """Get cost per kilometer for an infrastructure type."""
-        self.cur.execute(
-            "SELECT cost_per_km FROM InfrastructureTypes WHERE type = ?",
-            (infrastructure_type,),
-        )
-        result = self.cur.fetchone()
-        return result[0] if result else 0
+        return self.reference.infrastructure_costs.get(infrastructure_type, 0)
 
+    @locked_write
     def construct_infrastructure(
         self,
         country_id: int,
@@ -2167,7 +2578,7 @@ class Database:
                 return False
 
             # Deduct cost
-            self.take_balance(country_id, total_cost)
+            self.take_balance(country_id, total_cost, reason="construction")
 
             # Insert infrastructure
             self.cur.execute(
@@ -2178,42 +2589,26 @@ class Database:
                 (region_id, infrastructure_type, length_km, cost_per_km, total_cost),
             )
 
-            self.conn.commit()
+            self._commit()
             return True
 
         except Exception as e:
             print(f"Error constructing infrastructure: {e}")
-            self.conn.rollback()
+            self._rollback()
             return False
 
     def get_power_plant_data(self, plant_type: str, level: int) -> dict:
         """Get power plant data for given type and level."""
-        self.cur.execute(
-            """
-            SELECT production_mwh, construction_cost, danger_rate, 
-                   resource_type, resource_consumption, price_per_mwh
-            FROM PowerPlantsDatas 
-            WHERE type = ? AND level = ?
-        """,
-            (plant_type, level),
-        )
-        result = self.cur.fetchone()
+        result = self.reference.get_power_plant(plant_type, level)
         if result:
-            return {
-                "production_mwh": result[0],
-                "construction_cost": result[1],
-                "danger_rate": result[2],
-                "resource_type": result[3],
-                "resource_consumption": result[4],
-                "price_per_mwh": result[5],
-            }
+            return dict(result)
         return None
 
     def get_housing_cost(
         self, density_type: str, style_type: str, quality_type: str
     ) -> dict:
         """Get housing cost calculation based on density, style, and quality."""
-        self.cur.execute(
+        result = self.fetch_one(
             """
             SELECT density_multiplier, style_multiplier, quality_multiplier, base_cost_per_person
             FROM HousingDatas 
@@ -2221,7 +2616,6 @@ class Database:
         """,
             (density_type, style_type, quality_type),
         )
-        result = self.cur.fetchone()
         if result:
             base_cost = result[3]
             total_multiplier = result[1] * result[2]  # style * quality
@@ -2236,6 +2630,7 @@ class Database:
         return None
 
     # Power Plant management methods
+    @locked_write
     def construct_power_plant(
         self, country_id: int, plant_type: str, amount: int, level: int, region_id: int
     ) -> bool:
@@ -2258,7 +2653,7 @@ class Database:
                 return False
 
             # Deduct cost
-            self.take_balance(country_id, cost)
+            self.take_balance(country_id, cost, reason="construction")
 
             for _ in range(amount):
                 # Create power plant (only store instance-specific data)
@@ -2269,44 +2664,28 @@ class Database:
                 """,
                     (region_id, plant_type, level),
                 )
-            self.conn.commit()
+            self._commit()
             return True
         except Exception as e:
             print(f"Error constructing power plant: {e}")
-            self.conn.rollback()
+            self._rollback()
             return False
 
     def get_power_plant_cost(self, plant_type: str, level: int) -> int:
         """Get construction cost for a power plant."""
-        self.cur.execute(
-            """
-            SELECT construction_cost
-            FROM PowerPlantsDatas 
-            WHERE type = ? AND level = ?
-        """,
-            (plant_type, level),
-        )
-        result = self.cur.fetchone()
-        return result[0] if result else 0
+        result = self.reference.get_power_plant(plant_type, level)
+        return result["construction_cost"] if result else 0
 
     def get_power_plant_available_levels(self, plant_type: str) -> dict:
         """Get available levels for a specific power plant type."""
-        self.cur.execute(
-            """
-            SELECT MIN(level) as min_level, MAX(level) as max_level
-            FROM PowerPlantsDatas 
-            WHERE type = ? AND construction_cost > 0
-        """,
-            (plant_type,),
-        )
-        result = self.cur.fetchone()
-        if result and result[0] is not None:
-            return {"min_level": result[0], "max_level": result[1]}
+        levels = self.reference.power_plant_levels(plant_type, buildable_only=True)
+        if levels:
+            return {"min_level": levels[0], "max_level": levels[-1]}
         return {"min_level": None, "max_level": None}
 
     def get_power_plants_by_country(self, country_id: int) -> list:
         """Get all power plants owned by a country."""
-        self.cur.execute(
+        rows = self.fetch_all(
             """
             SELECT p.id, p.type, p.level, ppd.production_mwh, ppd.danger_rate, 
                    ppd.construction_cost, ppd.resource_type, ppd.resource_consumption, ppd.price_per_mwh,
@@ -2314,18 +2693,19 @@ class Database:
             FROM PowerPlants p
             JOIN Regions r ON p.region_id = r.region_id
             JOIN PowerPlantsDatas ppd ON p.type = ppd.type AND p.level = ppd.level
-            WHERE r.country_id = ?
+            WHERE p.country_id = ?
             ORDER BY p.type, p.level
         """,
             (country_id,),
         )
-        return [dict(row) for row in self.cur.fetchall()]
+        return [dict(row) for row in rows]
 
+    @locked_write
     def remove_power_plant(self, plant_id: int) -> bool:
         """Remove a power plant by ID."""
         try:
             self.cur.execute("DELETE FROM PowerPlants WHERE id = ?", (plant_id,))
-            self.conn.commit()
+            self._commit()
             return self.cur.rowcount > 0
         except Exception as e:
             print(f"Error removing power plant: {e}")
@@ -2333,18 +2713,14 @@ class Database:
 
     def get_available_power_plant_types(self) -> list:
         """Get all available power plant types."""
-        self.cur.execute("SELECT DISTINCT type FROM PowerPlantsDatas ORDER BY type")
-        return [row[0] for row in self.cur.fetchall()]
+        return self.reference.power_plant_types()
 
     def get_power_plant_levels(self, plant_type: str) -> list:
         """Get available levels for a power plant type."""
-        self.cur.execute(
-            "SELECT DISTINCT level FROM PowerPlantsDatas WHERE type = ? ORDER BY level",
-            (plant_type,),
-        )
-        return [row[0] for row in self.cur.fetchall()]
+        return self.reference.power_plant_levels(plant_type)
 
     # Infrastructure management methods
+    @locked_write
     def construct_infrastructure(
         self, country_id: int, infra_type: str, length_km: float, region_id: int
     ) -> bool:
@@ -2366,7 +2742,7 @@ class Database:
                 return False
 
             # Deduct cost
-            self.take_balance(country_id, total_cost)
+            self.take_balance(country_id, total_cost, reason="construction")
 
             # Create infrastructure
             self.cur.execute(
@@ -2376,46 +2752,38 @@ class Database:
             """,
                 (region_id, infra_type, length_km, cost_per_km, total_cost),
             )
-            self.conn.commit()
+            self._commit()
             return True
         except Exception as e:
             print(f"Error constructing infrastructure: {e}")
-            self.conn.rollback()
+            self._rollback()
             return False
 
     def get_infrastructure_cost_per_km(self, infra_type: str) -> int:
         """Get cost per kilometer for an infrastructure type."""
-        self.cur.execute(
-            """
-            SELECT cost_per_km
-            FROM InfrastructureTypes 
-            WHERE type = ?
-        """,
-            (infra_type,),
-        )
-        result = self.cur.fetchone()
-        return result[0] if result else 0
+        return self.reference.infrastructure_costs.get(infra_type, 0)
 
     def get_infrastructures_by_country(self, country_id: int) -> list:
         """Get all infrastructures owned by a country."""
-        self.cur.execute(
+        rows = self.fetch_all(
             """
             SELECT i.id, i.type, i.length_km, i.total_cost, 
                    r.name as region_name, r.region_id
             FROM Infrastructure i
             JOIN Regions r ON i.region_id = r.region_id
-            WHERE r.country_id = ?
+            WHERE i.country_id = ?
             ORDER BY i.type
         """,
             (country_id,),
         )
-        return [dict(row) for row in self.cur.fetchall()]
+        return [dict(row) for row in rows]
 
+    @locked_write
     def remove_infrastructure(self, infra_id: int) -> bool:
         """Remove infrastructure by ID."""
         try:
             self.cur.execute("DELETE FROM Infrastructure WHERE id = ?", (infra_id,))
-            self.conn.commit()
+            self._commit()
             return self.cur.rowcount > 0
         except Exception as e:
             print(f"Error removing infrastructure: {e}")
@@ -2423,18 +2791,17 @@ class Database:
 
     def get_available_infrastructure_types(self) -> list:
         """Get all available infrastructure types."""
-        self.cur.execute("SELECT DISTINCT type FROM InfrastructureTypes ORDER BY type")
-        return [row[0] for row in self.cur.fetchall()]
+        return sorted(self.reference.infrastructure_costs)
 
     def verify_region_ownership(self, country_id: int, region_id: int) -> bool:
         """Verify that a region belongs to a country."""
-        self.cur.execute(
+        result = self.fetch_one(
             "SELECT country_id FROM Regions WHERE region_id = ?", (region_id,)
         )
-        result = self.cur.fetchone()
         return result and result[0] == country_id
 
     # Technology Development Methods
+    @locked_write
     def start_technology_development(
         self,
         structure_id: int,
@@ -2448,10 +2815,9 @@ class Database:
             # Check if structure is a technocentre and belongs to the country
             self.cur.execute(
                 """
-                SELECT s.type, r.country_id 
-                FROM Structures s 
-                JOIN Regions r ON s.region_id = r.region_id 
-                WHERE s.id = ?
+                SELECT type, country_id
+                FROM Structures
+                WHERE id = ?
             """,
                 (structure_id,),
             )
@@ -2478,21 +2844,24 @@ class Database:
                     structure_id,
                     tech_id,
                     country_id,
-                    "2024-02-01",  # FOR FUTURE REFERENCE. TO UPDATE.
+                    # Game date (YYYY-MM-playday) development_time playdays from now
+                    "{:04d}-{:02d}-{:02d}".format(
+                        *self.clock.date_after(development_time)
+                    ),
                     development_time,
                     development_cost,
                 ),
             )
-            self.conn.commit()
+            self._commit()
             return True
         except Exception as e:
             print(f"Error starting technology development: {e}")
-            self.conn.rollback()
+            self._rollback()
             return False
 
     def get_technocentre_development(self, structure_id: int) -> dict:
         """Get current development at a technocentre."""
-        self.cur.execute(
+        result = self.fetch_one(
             """
             SELECT td.*, t.name, t.specialisation 
             FROM TechnocentreDevelopment td
@@ -2501,7 +2870,6 @@ class Database:
         """,
             (structure_id,),
         )
-        result = self.cur.fetchone()
         if result:
             return {
                 "development_id": result[0],
@@ -2531,9 +2899,9 @@ class Database:
             query += " WHERE td.country_id = ?"
             params = (country_id,)
 
-        self.cur.execute(query, params)
+        rows = self.fetch_all(query, params)
         results = []
-        for row in self.cur.fetchall():
+        for row in rows:
             results.append(
                 {
                     "development_id": row[0],
@@ -2551,6 +2919,7 @@ class Database:
             )
         return results
 
+    @locked_write
     def complete_technology_development(self, development_id: int) -> bool:
         """Complete a technology development and add it to the country's technologies."""
         try:
@@ -2594,13 +2963,14 @@ class Database:
                 (development_id,),
             )
 
-            self.conn.commit()
+            self._commit()
             return True
         except Exception as e:
             print(f"Error completing technology development: {e}")
-            self.conn.rollback()
+            self._rollback()
             return False
 
+    @locked_write
     def cancel_technology_development(self, development_id: int) -> bool:
         """Cancel an ongoing technology development."""
         try:
@@ -2608,11 +2978,11 @@ class Database:
                 "DELETE FROM TechnocentreDevelopment WHERE development_id = ?",
                 (development_id,),
             )
-            self.conn.commit()
+            self._commit()
             return True
         except Exception as e:
             print(f"Error canceling technology development: {e}")
-            self.conn.rollback()
+            self._rollback()
             return False
 
     def get_available_technocentres(
@@ -2625,7 +2995,7 @@ class Database:
             JOIN Regions r ON s.region_id = r.region_id
             LEFT JOIN TechnocentreDevelopment td ON s.id = td.structure_id
             WHERE s.type = 'Technocentre' 
-            AND r.country_id = ? 
+            AND s.country_id = ? 
             AND td.structure_id IS NULL
         """
         params = [country_id]
@@ -2634,10 +3004,10 @@ class Database:
             query += " AND s.specialisation = ?"
             params.append(specialisation)
 
-        self.cur.execute(query, params)
+        rows = self.fetch_all(query, params)
 
         results = []
-        for row in self.cur.fetchall():
+        for row in rows:
             results.append(
                 {
                     "structure_id": row[0],
@@ -2650,47 +3020,25 @@ class Database:
 
     async def get_all_salaries(self):
         """Get all salaries in a dict with the country_id as key, and a nested dict as value with the unit_ids and 'total' keys, and the maintenance price as values"""
-
-        self.cur.execute("SELECT country_id FROM Countries")
-        return_value = {}
-        for country in self.cur.fetchall():
-            country_id = country[0]
-            return_value[country_id] = {}
-            total_maintenance = 0
-
-            self.cur.execute(
-                "SELECT * FROM InventoryUnits WHERE country_id = ?", (country_id,)
-            )
-            for row in self.cur.fetchall():
-                unit_id = row[1]
-                quantity = row[2]
-                if unit_id.startswith("public_"):
-                    continue
-                self.cur.execute(
-                    "SELECT maintenance FROM InventoryPricings WHERE item = ?",
-                    (unit_id,),
-                )
-                maintenance_result = self.cur.fetchone()
-                maintenance = maintenance_result[0] if maintenance_result else 0
-                maintenance = (maintenance * 12) or 0
-
-                # Get unit name from unit_types, fallback to unit_id if not found
-                unit_name_list = [
-                    name for name, id in unit_types.items() if id == unit_id
-                ]
-                unit_name = unit_name_list[0] if unit_name_list else unit_id
-
-                return_value[country_id][unit_name] = {
-                    "maintenance": maintenance * quantity,
-                    "quantity": quantity,
-                }
-                total_maintenance += maintenance * quantity
-
-            return_value[country_id]["total"] = total_maintenance
+        return_value = {
+            row["country_id"]: {"total": 0}
+            for row in self.fetch_all("SELECT country_id FROM Countries")
+        }
+        for row in self._get_units_with_pricings():
+            country_salaries = return_value.get(row["country_id"])
+            if country_salaries is None:
+                continue
+            unit_name = unit_names.get(row["unit_type"], row["unit_type"])
+            country_salaries[unit_name] = {
+                "maintenance": row["maintenance"] * 12 * row["quantity"],
+                "quantity": row["quantity"],
+            }
+            country_salaries["total"] = row["total_maintenance"]
         return return_value
 
     # --- Debt management methods ---
 
+    @locked_write
     def create_debt(
         self,
         debt_reference: str,
@@ -2715,7 +3063,7 @@ class Database:
                     max_years,
                 ),
             )
-            self.conn.commit()
+            self._commit()
             return True
         except sqlite3.IntegrityError as e:
             print(f"Error creating debt: {e}")
@@ -2723,7 +3071,7 @@ class Database:
 
     def get_debt_by_reference(self, debt_reference: str) -> dict:
         """Get debt information by reference number."""
-        self.cur.execute(
+        result = self.fetch_one(
             """SELECT d.debt_id, d.debt_reference, d.country_id, c.name as country_name,
                d.original_amount, d.remaining_amount, d.interest_rate, d.max_years,
                d.created_at
@@ -2732,12 +3080,11 @@ class Database:
                WHERE d.debt_reference = ?""",
             (debt_reference,),
         )
-        result = self.cur.fetchone()
         return dict(result) if result else None
 
     def get_debts_by_country(self, country_id: int) -> list:
         """Get all debts for a specific country."""
-        self.cur.execute(
+        results = self.fetch_all(
             """SELECT debt_id, debt_reference, original_amount, remaining_amount,
                interest_rate, max_years, created_at
                FROM Debts 
@@ -2745,12 +3092,11 @@ class Database:
                ORDER BY remaining_amount DESC""",
             (country_id,),
         )
-        results = self.cur.fetchall()
         return [dict(row) for row in results]
 
     def get_total_debt_by_country(self, country_id: int) -> dict:
         """Get total debt statistics for a country."""
-        self.cur.execute(
+        result = self.fetch_one(
             """SELECT COUNT(*) as debt_count, 
                COALESCE(SUM(original_amount), 0) as total_borrowed,
                COALESCE(SUM(remaining_amount), 0) as total_remaining
@@ -2758,13 +3104,13 @@ class Database:
                WHERE country_id = ?""",
             (country_id,),
         )
-        result = self.cur.fetchone()
         return (
             dict(result)
             if result
             else {"debt_count": 0, "total_borrowed": 0, "total_remaining": 0}
         )
 
+    @locked_write
     def update_debt_amount(self, debt_reference: str, amount_paid: int) -> bool:
         """Update the remaining debt amount after a payment."""
         try:
@@ -2787,7 +3133,7 @@ class Database:
                     (new_remaining, debt_reference),
                 )
 
-            self.conn.commit()
+            self._commit()
             return True
         except Exception as e:
             print(f"Error updating debt: {e}")
@@ -2795,10 +3141,10 @@ class Database:
 
     def debt_reference_exists(self, debt_reference: str) -> bool:
         """Check if a debt reference already exists."""
-        self.cur.execute(
+        result = self.fetch_one(
             "SELECT 1 FROM Debts WHERE debt_reference = ?", (debt_reference,)
         )
-        return self.cur.fetchone() is not None
+        return result is not None
 
     def generate_debt_reference(self, country_id: int) -> str:
         """Generate a unique debt reference number."""
@@ -2823,8 +3169,9 @@ class Database:
 
     def get_country_gdp(self, country_id: int) -> int:
         """Get GDP for debt calculation purposes."""
-        self.cur.execute("SELECT gdp FROM Stats WHERE country_id = ?", (country_id,))
-        result = self.cur.fetchone()
+        result = self.fetch_one(
+            "SELECT gdp FROM Stats WHERE country_id = ?", (country_id,)
+        )
         if result and result[0]:
             return result[0]
 
@@ -2858,6 +3205,7 @@ class Database:
             return "Non Puissance"
 
     # Country creation helper methods
+    @locked_write
     def insert_country(
         self,
         name: str,
@@ -2881,13 +3229,15 @@ class Database:
                 (country_id,),
             )
 
-            self.conn.commit()
+            self._commit()
+            self._invalidate_identities()
             return country_id
         except Exception as e:
             print(f"Error inserting country: {e}")
-            self.conn.rollback()
+            self._rollback()
             return None
 
+    @locked_write
     def insert_government_leader(self, country_id: int, player_id: str) -> bool:
         """Insert a player as the leader (slot 1) of a government with full permissions."""
         try:
@@ -2898,13 +3248,15 @@ class Database:
                    VALUES (?, 1, ?, ?, ?, ?, ?, ?, ?, ?)""",
                 (country_id, player_id, True, True, True, True, True, True, True),
             )
-            self.conn.commit()
+            self._commit()
+            self._invalidate_identities()
             return True
         except Exception as e:
             print(f"Error inserting government leader: {e}")
-            self.conn.rollback()
+            self._rollback()
             return False
 
+    @locked_write
     def insert_country_stats(self, country_id: int, initial_gdp: int = 0) -> bool:
         """Insert initial stats for a new country."""
         try:
@@ -2912,24 +3264,23 @@ class Database:
                 """INSERT INTO Stats (country_id, gdp) VALUES (?, ?)""",
                 (country_id, initial_gdp),
             )
-            self.conn.commit()
+            self._commit()
             return True
         except Exception as e:
             print(f"Error inserting country stats: {e}")
-            self.conn.rollback()
+            self._rollback()
             return False
-        
+
     def get_countries_doctrines(self, country_id: int) -> list:
         """Get all doctrines associated with a country."""
         try:
-            self.cur.execute(
+            results = self.fetch_all(
                 """SELECT d.doctrine_id, d.name, d.category, d.description, d.discord_role_id
                    FROM Doctrines d
                    JOIN CountryDoctrines cd ON d.doctrine_id = cd.doctrine_id
                    WHERE cd.country_id = ?""",
                 (country_id,),
             )
-            results = self.cur.fetchall()
             return [
                 {
                     "doctrine_id": row[0],
@@ -2944,6 +3295,7 @@ class Database:
             print(f"Error getting country doctrines: {e}")
             return []
 
+    @locked_write
     def update_region_owner(self, region_id: int, country_id: int) -> bool:
         """Update the owner of a region."""
         try:
@@ -2951,13 +3303,14 @@ class Database:
                 """UPDATE Regions SET country_id = ? WHERE region_id = ?""",
                 (country_id, region_id),
             )
-            self.conn.commit()
+            self._commit()
             return True
         except Exception as e:
             print(f"Error updating region owner: {e}")
-            self.conn.rollback()
+            self._rollback()
             return False
 
+    @locked_write
     def add_country_doctrine(self, country_id: int, doctrine_id: int) -> bool:
         """Add a doctrine to a country."""
         try:
@@ -2966,22 +3319,21 @@ class Database:
                    VALUES (?, ?)""",
                 (country_id, doctrine_id),
             )
-            self.conn.commit()
+            self._commit()
             return True
         except Exception as e:
             print(f"Error adding country doctrine: {e}")
-            self.conn.rollback()
+            self._rollback()
             return False
 
     def get_doctrine_by_id(self, doctrine_id: int) -> dict:
         """Get doctrine information by ID."""
         try:
-            self.cur.execute(
+            result = self.fetch_one(
                 """SELECT doctrine_id, name, category, description, discord_role_id
                    FROM Doctrines WHERE doctrine_id = ?""",
                 (doctrine_id,),
             )
-            result = self.cur.fetchone()
             if result:
                 return {
                     "doctrine_id": result[0],
@@ -2998,7 +3350,7 @@ class Database:
     def get_region_by_id_detailed(self, region_id: int) -> dict:
         """Get detailed region information by ID."""
         try:
-            self.cur.execute(
+            result = self.fetch_one(
                 """SELECT r.region_id, r.name, r.population, r.continent, 
                           g.name as geographical_area_name
                    FROM Regions r 
@@ -3006,7 +3358,6 @@ class Database:
                    WHERE r.region_id = ?""",
                 (region_id,),
             )
-            result = self.cur.fetchone()
             if result:
                 return {
                     "region_id": result[0],
@@ -0,0 +1,141 @@
+"""
+Awaitable facade over the Database class.
+Every Database method is run on a dedicated database thread so that blocking
+sqlite3 calls never stall the discord.py event loop. Cogs can migrate one call
+at a time: `await adb.get_balance(country_id)` mirrors `db.get_balance(country_id)`.
+The database thread shares the writer connection with the event loop: every
+Database write holds the pool's write lock up to its commit (see
+Database.write_scope), so calls made from either side never commit or roll
+back each other's changes. Several writes that must commit together go
+through `run_in_transaction`.
+"""
+
+import asyncio
+import functools
+import inspect
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Scopes bound to the thread that enters them: they cannot be proxied
+THREAD_BOUND = ("transaction", "write_scope", "read_cursor", "cur")
+
+
+class DatabaseExecutor:
+    """Runs Database methods on a single dedicated thread and returns awaitables."""
+
+    def __init__(self, db, history_size: int = 1000):
+        self._db = db
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="nebot-db"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._max_pending = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._waits = deque(maxlen=history_size)
+        self._runs = deque(maxlen=history_size)
+
+    @property
+    def db(self):
+        """The wrapped synchronous Database instance."""
+        return self._db
+
+    def __getattr__(self, name):
+        if name in THREAD_BOUND:
+            raise AttributeError(
+                f"DatabaseExecutor.{name} is bound to the database thread, "
+                "use run_in_transaction() or run()"
+            )
+        attr = getattr(self._db, name)
+        if not callable(attr):
+            return attr
+        if inspect.iscoroutinefunction(attr):
+            # Already async (they await Discord), keep them on the event loop
+            return attr
+
+        @functools.wraps(attr)
+        async def wrapper(*args, **kwargs):
+            return await self.run(attr, *args, **kwargs)
+
+        return wrapper
+
+    async def run(self, func, *args, **kwargs):
+        """Run any callable on the database thread and await its result."""
+        loop = asyncio.get_running_loop()
+        submitted_at = time.perf_counter()
+        with self._lock:
+            self._pending += 1
+            self._submitted += 1
+            self._max_pending = max(self._max_pending, self._pending)
+
+        def job():
+            started_at = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                finished_at = time.perf_counter()
+                with self._lock:
+                    self._pending -= 1
+                    self._waits.append(started_at - submitted_at)
+                    self._runs.append(finished_at - started_at)
+
+        try:
+            result = await loop.run_in_executor(self._executor, job)
+        except Exception:
+            with self._lock:
+                self._failed += 1
+            raise
+        with self._lock:
+            self._completed += 1
+        return result
+
+    async def run_in_transaction(self, func, *args, **kwargs):
+        """Run `func` inside `db.transaction()` on the database thread.
+
+        The writes `func` makes are committed together, or not at all.
+        """
+
+        def unit_of_work():
+            with self._db.transaction():
+                return func(*args, **kwargs)
+
+        return await self.run(unit_of_work)
+
+    def get_metrics(self) -> dict:
+        """Return queue-depth and wait-time metrics (times in milliseconds)."""
+        with self._lock:
+            waits = sorted(self._waits)
+            runs = sorted(self._runs)
+            metrics = {
+                "queue_depth": self._pending,
+                "max_queue_depth": self._max_pending,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+            }
+
+        def percentile(values, pct):
+            if not values:
+                return 0.0
+            index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+            return values[index] * 1000
+
+        metrics.update(
+            {
+                "wait_avg_ms": (sum(waits) / len(waits) * 1000) if waits else 0.0,
+                "wait_p95_ms": percentile(waits, 95),
+                "wait_max_ms": percentile(waits, 100),
+                "run_avg_ms": (sum(runs) / len(runs) * 1000) if runs else 0.0,
+                "run_p95_ms": percentile(runs, 95),
+            }
+        )
+        return metrics
+
+    def shutdown(self, wait: bool = True):
+        """Stop the database thread once queued calls are done."""
+        self._executor.shutdown(wait=wait)
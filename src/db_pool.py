@@ -0,0 +1,96 @@
+"""
+SQLite connection pool used by the Database class.
+Holds a single writer connection and a small set of WAL reader connections,
+so that concurrent read paths never share (and interleave) the same cursor.
+Readers are opened read-only (`mode=ro`): in WAL mode they read the last
+committed snapshot and never wait behind the writer, nor make it wait.
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from urllib.parse import quote
+
+
+class ConnectionPool:
+    """One writer connection plus N reader connections on the same SQLite file."""
+
+    def __init__(
+        self,
+        db_path: str = "datas/rts.db",
+        readers: int = 4,
+        timeout: float = 30.0,
+        factory=sqlite3.Connection,
+    ):
+        self.db_path = db_path
+        self.timeout = timeout
+        self.factory = factory
+        self.size = max(1, readers)
+
+        # The writer is opened first so WAL is enabled before any reader exists
+        self.writer = self._connect()
+        self.writer.execute("PRAGMA journal_mode=WAL")
+        self.writer.execute("PRAGMA synchronous=NORMAL")
+        self.write_lock = threading.RLock()
+
+        self._readers = queue.LifoQueue()
+        self._connections = []
+        for _ in range(self.size):
+            conn = self._connect(read_only=True)
+            conn.execute("PRAGMA query_only=ON")
+            self._connections.append(conn)
+            self._readers.put(conn)
+        self._closed = False
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        database, uri = self.db_path, False
+        if read_only:
+            database, uri = f"file:{quote(self.db_path)}?mode=ro", True
+        conn = sqlite3.connect(
+            database,
+            timeout=self.timeout,
+            check_same_thread=False,
+            factory=self.factory,
+            uri=uri,
+        )
+        conn.row_factory = sqlite3.Row  # Enable row factory for dict-like access
+        return conn
+
+    @contextmanager
+    def reader(self):
+        """Borrow a reader connection and yield a fresh cursor on it."""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection pool is closed.")
+        conn = self._readers.get(timeout=self.timeout)
+        cur = conn.cursor()
+        try:
+            yield cur
+        finally:
+            cur.close()
+            self._readers.put(conn)
+
+    @contextmanager
+    def writer_cursor(self):
+        """Yield a fresh cursor on the writer connection, holding the write lock."""
+        with self.write_lock:
+            cur = self.writer.cursor()
+            try:
+                yield cur
+            finally:
+                cur.close()
+
+    def close(self):
+        """Close every connection of the pool."""
+        if self._closed:
+            return
+        self._closed = True
+        for conn in self._connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        try:
+            self.writer.close()
+        except sqlite3.Error:
+            pass
@@ -0,0 +1,143 @@
+"""
+In-memory RP game clock.
+The current game date is the latest row of Dates and the length of each month
+comes from PlaydaysPerMonth. Both only change when the bot advances the date
+(or an admin edits them), so GameClock keeps the current date and a
+precomputed calendar in memory: reading the date costs nothing, and date
+arithmetic goes through playday ordinals (number of playdays since year 0)
+computed in constant time from the cumulative month lengths.
+"""
+
+from bisect import bisect_right
+from typing import NamedTuple
+
+DEFAULT_DATE = (2023, 1, 0)
+# Months missing from PlaydaysPerMonth
+DEFAULT_PLAYDAYS = 2
+
+
+class GameDate(NamedTuple):
+    year: int
+    month: int
+    playday: int
+
+    def as_dict(self) -> dict:
+        return {"year": self.year, "month": self.month, "playday": self.playday}
+
+    @property
+    def month_index(self) -> int:
+        """Absolute game month (year * 12 + month - 1), as in StructureProduction."""
+        return self.year * 12 + self.month - 1
+
+
+class Calendar:
+    """Immutable playdays-per-month table with its cumulative sums."""
+
+    __slots__ = ("playdays", "configured", "month_starts", "year_length")
+
+    def __init__(self, playdays_per_month: dict):
+        # Index 1..12; index 0 unused
+        self.playdays = (0,) + tuple(
+            playdays_per_month.get(month, DEFAULT_PLAYDAYS) for month in range(1, 13)
+        )
+        self.configured = frozenset(playdays_per_month)
+        # The daily advance still spends playday 1 in a month set to 0 playdays
+        starts = [0]
+        for month in range(1, 13):
+            starts.append(starts[-1] + max(self.playdays[month], 1))
+        # month_starts[m - 1]: playdays of the year before month m
+        self.month_starts = tuple(starts)
+        self.year_length = starts[-1]
+
+    def ordinal(self, date: GameDate) -> int:
+        """Playdays elapsed since the start of year 0 at `date`."""
+        return (
+            date.year * self.year_length
+            + self.month_starts[date.month - 1]
+            + date.playday
+        )
+
+    def from_ordinal(self, ordinal: int) -> GameDate:
+        """Inverse of `ordinal` (playday >= 1)."""
+        year, offset = divmod(ordinal - 1, self.year_length)
+        # 12 entries: constant-time lookup of the month containing the offset
+        month = bisect_right(self.month_starts, offset, 1, 12)
+        return GameDate(year, month, offset - self.month_starts[month - 1] + 1)
+
+
+class GameClock:
+    """Current game date and calendar, kept in sync with Dates by Database."""
+
+    def __init__(self, current=None, playdays_per_month: dict = None):
+        self._current = GameDate(*(current or DEFAULT_DATE))
+        self._calendar = Calendar(playdays_per_month or {})
+
+    @classmethod
+    def load(cls, conn) -> "GameClock":
+        """Read the latest Dates row and PlaydaysPerMonth from `conn`."""
+        clock = cls()
+        clock.reload(conn)
+        return clock
+
+    def reload(self, conn):
+        """Re-read both tables (after an external change)."""
+        row = conn.execute(
+            "SELECT year, month, playday FROM Dates ORDER BY real_date DESC LIMIT 1"
+        ).fetchone()
+        calendar = Calendar(
+            {
+                month: playdays
+                for month, playdays in conn.execute(
+                    "SELECT month_number, playdays FROM PlaydaysPerMonth"
+                )
+            }
+        )
+        # Two attribute swaps: readers see either the old or the new state
+        self._calendar = calendar
+        self._current = GameDate(*row) if row else GameDate(*DEFAULT_DATE)
+
+    @property
+    def current(self) -> GameDate:
+        return self._current
+
+    @property
+    def calendar(self) -> Calendar:
+        return self._calendar
+
+    def set_current(self, date):
+        """Move the clock once the matching Dates row is committed."""
+        self._current = GameDate(*date)
+
+    def playdays_in_month(self, month: int) -> int:
+        return self._calendar.playdays[month]
+
+    def is_configured(self, month: int) -> bool:
+        """False when the month is missing from PlaydaysPerMonth (default length)."""
+        return month in self._calendar.configured
+
+    def next_date(self) -> GameDate:
+        """Date the next daily advance moves to (same rules as advance_playday)."""
+        year, month, playday = self._current
+        if playday < self._calendar.playdays[month]:
+            return GameDate(year, month, playday + 1)
+        if month == 12:
+            return GameDate(year + 1, 1, 1)
+        return GameDate(year, month + 1, 1)
+
+    def date_after(self, playdays: int, start=None) -> GameDate:
+        """Game date `playdays` playdays after `start` (default: now)."""
+        calendar = self._calendar
+        start = GameDate(*start) if start else self._current
+        return calendar.from_ordinal(calendar.ordinal(start) + playdays)
+
+    def playdays_between(self, start, end) -> int:
+        """Signed number of playdays from `start` to `end`."""
+        calendar = self._calendar
+        return calendar.ordinal(GameDate(*end)) - calendar.ordinal(GameDate(*start))
+
+    def playdays_until_month(self, month_index: int) -> int:
+        """Playdays from now until the first playday of an absolute game month."""
+        year, month = divmod(month_index, 12)
+        return max(
+            self.playdays_between(self._current, GameDate(year, month + 1, 1)), 0
+        )
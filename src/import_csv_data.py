@@ -1,14 +1,20 @@
 #!/usr/bin/env python3
 """
 Fixed CSV Data Importer for New Structure System
-Properly imports all structure, infrastructure, and power plant data from CSV files
+Properly imports all structure, infrastructure, and power plant data from CSV files.
+The import is incremental: each file's hash is stored in SchemaMeta, only
+changed files are parsed, and their rows are diffed against the database.
 """
 
 import sqlite3
 import csv
-import re
+import hashlib
 import os
-from pathlib import Path
+import time
+from migrations import ensure_meta_tables, get_meta, set_meta
+
+DB_PATH = "datas/rts.db"
+DATA_DIR = "datas"
 
 
 def clean_numeric_value(value_str):
@@ -47,15 +53,16 @@ def clean_numeric_value(value_str):
         return 0
 
 
-def import_factory_data(cursor):
-    """Import factory/usine data from usines.csv"""
-    print("Importing factory data...")
+def _read_csv(path):
+    with open(path, "r", encoding="utf-8") as file:
+        return list(csv.reader(file))
+
 
-    with open(
-        "/home/ubuntu/Bots/NEBot/datas/csvs/usines.csv", "r", encoding="utf-8"
-    ) as file:
-        reader = csv.reader(file)
-        lines = list(reader)
+def parse_factory_data(path):
+    """Factory/usine data and technology boosts from usines.csv"""
+    lines = _read_csv(path)
+    structures = []
+    tech_boosts = []
 
     # Find section starts
     terrestre_start = None
@@ -74,92 +81,43 @@ def import_factory_data(cursor):
         elif "Niv tech" in row_text and "Coef boost" in row_text:
             tech_boost_start = i + 1
 
-    # Import Terrestre factories
-    if terrestre_start:
-        for i in range(terrestre_start, min(terrestre_start + 7, len(lines))):
-            row = lines[i]
-            if len(row) >= 6 and row[2].strip():
-                level = clean_numeric_value(row[2])
-                production = clean_numeric_value(row[3])
-                employees = clean_numeric_value(row[4])
-                cost = clean_numeric_value(row[5])
-
-                cursor.execute(
-                    """
-                    INSERT OR REPLACE INTO StructuresDatas 
-                    (type, specialisation, level, capacity, population, cout_construction)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                    ("Usine", "Terrestre", level, production, employees, cost),
-                )
-
-    # Import Naval factories (Chantier Naval)
-    if naval_start:
-        for i in range(naval_start, min(naval_start + 7, len(lines))):
-            row = lines[i]
-            if len(row) >= 6 and row[2].strip():
-                level = clean_numeric_value(row[2])
-                production = clean_numeric_value(row[3])
-                employees = clean_numeric_value(row[4])
-                cost = clean_numeric_value(row[5])
-
-                cursor.execute(
-                    """
-                    INSERT OR REPLACE INTO StructuresDatas 
-                    (type, specialisation, level, capacity, population, cout_construction)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                    ("Usine", "Navale", level, production, employees, cost),
-                )
-
-    # Import Aerospace factories
-    if aerospace_start:
-        for i in range(aerospace_start, min(aerospace_start + 7, len(lines))):
+    # Terrestre factories, Naval factories (Chantier Naval), Aerospace factories
+    for start, specialisation in (
+        (terrestre_start, "Terrestre"),
+        (naval_start, "Navale"),
+        (aerospace_start, "Aerienne"),
+    ):
+        if not start:
+            continue
+        for i in range(start, min(start + 7, len(lines))):
             row = lines[i]
             if len(row) >= 6 and row[2].strip():
                 level = clean_numeric_value(row[2])
                 production = clean_numeric_value(row[3])
                 employees = clean_numeric_value(row[4])
                 cost = clean_numeric_value(row[5])
-
-                cursor.execute(
-                    """
-                    INSERT OR REPLACE INTO StructuresDatas 
-                    (type, specialisation, level, capacity, population, cout_construction)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                    ("Usine", "Aerienne", level, production, employees, cost),
+                structures.append(
+                    ("Usine", specialisation, level, production, employees, cost)
                 )
 
-    # Import technology boost coefficients
+    # Technology boost coefficients
     if tech_boost_start:
         for i in range(tech_boost_start, min(tech_boost_start + 12, len(lines))):
             row = lines[i]
             if len(row) >= 4 and row[2].strip():
                 tech_level = clean_numeric_value(row[2])
                 boost_coeff = clean_numeric_value(row[3])
+                tech_boosts.append((tech_level, boost_coeff))
 
-                cursor.execute(
-                    """
-                    INSERT OR REPLACE INTO TechnologyBoosts 
-                    (tech_level, boost_coefficient)
-                    VALUES (?, ?)
-                """,
-                    (tech_level, boost_coeff),
-                )
-
+    return {"StructuresDatas": structures, "TechnologyBoosts": tech_boosts}
 
-def import_military_base_data(cursor):
-    """Import military base and school data from bases_militaires.csv"""
-    print("Importing military base data...")
 
-    with open(
-        "/home/ubuntu/Bots/NEBot/datas/csvs/bases_militaires.csv", "r", encoding="utf-8"
-    ) as file:
-        reader = csv.reader(file)
-        lines = list(reader)
+def parse_military_base_data(path):
+    """Military base and school data from bases_militaires.csv"""
+    lines = _read_csv(path)
+    structures = []
 
-    # Import military bases (first section)
+    # Military bases (first section)
     for i in range(2, 9):  # Skip headers, import 7 levels
         if i < len(lines):
             row = lines[i]
@@ -167,17 +125,9 @@ def import_military_base_data(cursor):
                 level = clean_numeric_value(row[0])
                 capacity = clean_numeric_value(row[1])
                 cost = clean_numeric_value(row[2])
+                structures.append(("Base", "NA", level, capacity, 0, cost))
 
-                cursor.execute(
-                    """
-                    INSERT OR REPLACE INTO StructuresDatas 
-                    (type, specialisation, level, capacity, population, cout_construction)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                    ("Base", "NA", level, capacity, 0, cost),
-                )
-
-    # Import military schools (second section)
+    # Military schools (second section)
     for i in range(2, 9):  # Skip headers, import 7 levels
         if i < len(lines):
             row = lines[i]
@@ -185,26 +135,15 @@ def import_military_base_data(cursor):
                 level = clean_numeric_value(row[5])
                 capacity = clean_numeric_value(row[6])
                 cost = clean_numeric_value(row[7])
+                structures.append(("Ecole", "NA", level, capacity, 0, cost))
 
-                cursor.execute(
-                    """
-                    INSERT OR REPLACE INTO StructuresDatas 
-                    (type, specialisation, level, capacity, population, cout_construction)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                    ("Ecole", "NA", level, capacity, 0, cost),
-                )
-
+    return {"StructuresDatas": structures}
 
-def import_technocentre_data(cursor):
-    """Import technocentre data from technocentres.csv"""
-    print("Importing technocentre data...")
 
-    with open(
-        "/home/ubuntu/Bots/NEBot/datas/csvs/technocentres.csv", "r", encoding="utf-8"
-    ) as file:
-        reader = csv.reader(file)
-        lines = list(reader)
+def parse_technocentre_data(path):
+    """Technocentre data from technocentres.csv"""
+    lines = _read_csv(path)
+    structures = []
 
     # Start from row 3 (skip headers)
     for i in range(3, min(15, len(lines))):  # Import up to 12 levels
@@ -212,27 +151,16 @@ def import_technocentre_data(cursor):
         if len(row) >= 3 and row[2].strip():
             level = clean_numeric_value(row[2])
             cost = clean_numeric_value(row[3])
-
             for spec in ["Terrestre", "Aerienne", "Navale"]:
-                cursor.execute(
-                    """
-                    INSERT OR REPLACE INTO StructuresDatas 
-                    (type, specialisation, level, capacity, population, cout_construction)
-                    VALUES (?, ?, ?, ?, ?, ?)
-            """,
-                    ("Technocentre", spec, level, 1, 0, cost),
-                )
+                structures.append(("Technocentre", spec, level, 1, 0, cost))
 
+    return {"StructuresDatas": structures}
 
-def import_infrastructure_data(cursor):
-    """Import infrastructure data from infrastructures.csv"""
-    print("Importing infrastructure data...")
 
-    with open(
-        "/home/ubuntu/Bots/NEBot/datas/csvs/infrastructures.csv", "r", encoding="utf-8"
-    ) as file:
-        reader = csv.reader(file)
-        lines = list(reader)
+def parse_infrastructure_data(path):
+    """Infrastructure data from infrastructures.csv"""
+    lines = _read_csv(path)
+    infrastructure_types = []
 
     # Start from row 5 (skip headers)
     for i in range(5, len(lines)):
@@ -240,28 +168,15 @@ def import_infrastructure_data(cursor):
         if len(row) >= 5 and row[3].strip():
             name = row[3].strip()
             cost_per_km = clean_numeric_value(row[4])
+            infrastructure_types.append((name, cost_per_km))
 
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO InfrastructureTypes 
-                (type, cost_per_km)
-                VALUES (?, ?)
-            """,
-                (name, cost_per_km),
-            )
-
+    return {"InfrastructureTypes": infrastructure_types}
 
-def import_power_plants_data(cursor):
-    """Import power plant data from centrales_electriques.csv"""
-    print("Importing power plant data...")
 
-    with open(
-        "/home/ubuntu/Bots/NEBot/datas/csvs/centrales_electriques.csv",
-        "r",
-        encoding="utf-8",
-    ) as file:
-        reader = csv.reader(file)
-        lines = list(reader)
+def parse_power_plants_data(path):
+    """Power plant data from centrales_electriques.csv"""
+    lines = _read_csv(path)
+    power_plants = []
 
     # Start from row 2 (skip headers)
     for i in range(2, len(lines)):
@@ -275,13 +190,7 @@ def import_power_plants_data(cursor):
             resource = row[8] if len(row) > 8 and row[8] != "N/A" else None
             resource_consumption = clean_numeric_value(row[9]) if len(row) > 9 else 0
             price_per_mwh = clean_numeric_value(row[10]) if len(row) > 10 else 100
-
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO PowerPlantsDatas 
-                (type, level, production_mwh, construction_cost, danger_rate, resource_type, resource_consumption, price_per_mwh)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+            power_plants.append(
                 (
                     plant_type,
                     level,
@@ -291,188 +200,324 @@ def import_power_plants_data(cursor):
                     resource,
                     resource_consumption,
                     price_per_mwh,
-                ),
+                )
             )
 
+    return {"PowerPlantsDatas": power_plants}
 
-def import_housing_data(cursor):
-    """Import housing data from logements.csv"""
-    print("Importing housing data...")
 
+def parse_housing_data(path=None):
+    """Housing data (logements.csv is not parsed yet)"""
     # Housing data is complex with density/style/quality multipliers
     # For now, create basic housing entries
+    structures = []
     for level in range(1, 8):
         # Basic housing costs (these would need to be calculated from the complex CSV)
         base_cost = 50000 * level * level
+        structures.append(("Logement", "NA", level, 1000 * level, 0, base_cost))
+    return {"StructuresDatas": structures}
+
+
+def parse_regions_data(path):
+    """Geographical areas and regions from region_list.csv"""
+    with open(path, "r", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+
+    areas = {}
+    regions = {}
+    for row in rows:
+        geographical_area_name = row["Pays/Region"].strip()
+        hex_color = row["Code couleur HEX"].strip()
+
+        # Ensure hex color is properly formatted
+        if not hex_color.startswith("#"):
+            hex_color = "#" + hex_color
+
+        areas.setdefault(geographical_area_name, ())
+        # First occurrence wins, like the former INSERT OR IGNORE
+        regions.setdefault(
+            hex_color,
+            (
+                row["Nom region"].strip(),
+                row["Continent"].strip(),
+                geographical_area_name,
+            ),
+        )
 
-        cursor.execute(
+    return {
+        "GeographicalAreas": [(name,) for name in areas],
+        "Regions": [(hex_color, *values) for hex_color, values in regions.items()],
+    }
+
+
+# table -> (key columns, value columns). Rows produced by the parsers are
+# key + values, in that order.
+TABLES = {
+    "StructuresDatas": (
+        ("type", "specialisation", "level"),
+        ("capacity", "population", "cout_construction"),
+    ),
+    "TechnologyBoosts": (("tech_level",), ("boost_coefficient",)),
+    "InfrastructureTypes": (("type",), ("cost_per_km",)),
+    "PowerPlantsDatas": (
+        ("type", "level"),
+        (
+            "production_mwh",
+            "construction_cost",
+            "danger_rate",
+            "resource_type",
+            "resource_consumption",
+            "price_per_mwh",
+        ),
+    ),
+    "GeographicalAreas": (("name",), ()),
+}
+
+# Each source owns a slice of the tables it feeds: rows of that slice that are
+# no longer in the file are deleted. (name, path relative to the data
+# directory or None, parser, {table: (scope SQL, params)})
+SOURCES = [
+    (
+        "usines",
+        "csvs/usines.csv",
+        parse_factory_data,
+        {
+            "StructuresDatas": ("type = ?", ("Usine",)),
+            "TechnologyBoosts": ("1", ()),
+        },
+    ),
+    (
+        "bases_militaires",
+        "csvs/bases_militaires.csv",
+        parse_military_base_data,
+        {"StructuresDatas": ("type IN (?, ?)", ("Base", "Ecole"))},
+    ),
+    (
+        "technocentres",
+        "csvs/technocentres.csv",
+        parse_technocentre_data,
+        {"StructuresDatas": ("type = ?", ("Technocentre",))},
+    ),
+    (
+        "infrastructures",
+        "csvs/infrastructures.csv",
+        parse_infrastructure_data,
+        {"InfrastructureTypes": ("1", ())},
+    ),
+    (
+        "centrales_electriques",
+        "csvs/centrales_electriques.csv",
+        parse_power_plants_data,
+        {"PowerPlantsDatas": ("1", ())},
+    ),
+    (
+        "logements",
+        None,
+        parse_housing_data,
+        {"StructuresDatas": ("type = ?", ("Logement",))},
+    ),
+    # Regions carry game state (owner, population): never deleted
+    ("regions", "mapping/region_list.csv", parse_regions_data, {}),
+]
+
+
+def source_hash(path, parser) -> str:
+    """Content hash of a source file. Sources without a file hash their rows."""
+    if path is None:
+        return hashlib.sha256(repr(parser()).encode("utf-8")).hexdigest()
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def sync_rows(cursor, table, rows, scope=None) -> dict:
+    """Make `table` match `rows`, touching only the rows that differ.
+
+    Rows are matched on the table's key columns (see TABLES). When `scope`
+    (a WHERE clause and its parameters) is given, existing rows of that slice
+    that are absent from `rows` are deleted; otherwise nothing is deleted.
+    """
+    key_columns, value_columns = TABLES[table]
+    size = len(key_columns)
+    desired = {}
+    for row in rows:
+        desired[tuple(row[:size])] = tuple(row[size:])  # Last row wins
+
+    where, params = scope or ("1", ())
+    existing = {
+        tuple(row[:size]): tuple(row[size:])
+        for row in cursor.execute(
+            f"SELECT {', '.join(key_columns + value_columns)} FROM {table} WHERE {where}",
+            params,
+        )
+    }
+    if scope is None:
+        existing = {key: existing[key] for key in desired if key in existing}
+
+    inserts = [key + values for key, values in desired.items() if key not in existing]
+    updates = [
+        values + key
+        for key, values in desired.items()
+        if key in existing and existing[key] != values
+    ]
+    deletes = [key for key in existing if key not in desired] if scope else []
+
+    key_match = " AND ".join(f"{column} = ?" for column in key_columns)
+    if inserts:
+        columns = key_columns + value_columns
+        cursor.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})",
+            inserts,
+        )
+    if updates:
+        cursor.executemany(
+            f"UPDATE {table} SET {', '.join(f'{column} = ?' for column in value_columns)} "
+            f"WHERE {key_match}",
+            updates,
+        )
+    if deletes:
+        cursor.executemany(f"DELETE FROM {table} WHERE {key_match}", deletes)
+    return {"inserted": len(inserts), "updated": len(updates), "deleted": len(deletes)}
+
+
+def sync_regions(cursor, tables) -> dict:
+    """Insert new geographical areas and regions, update renamed ones."""
+    counts = sync_rows(cursor, "GeographicalAreas", tables["GeographicalAreas"])
+    area_ids = {
+        name: area_id
+        for area_id, name in cursor.execute(
+            "SELECT geographical_area_id, name FROM GeographicalAreas"
+        )
+    }
+    existing = {
+        row[0]: tuple(row[1:])
+        for row in cursor.execute(
+            "SELECT region_color_hex, name, continent, geographical_area_id FROM Regions"
+        )
+    }
+    inserts = []
+    updates = []
+    for hex_color, name, continent, area_name in tables["Regions"]:
+        area_id = area_ids.get(area_name)
+        if hex_color not in existing:
+            # country_id NULL for unoccupied regions, default population
+            inserts.append((None, name, hex_color, 0, continent, area_id))
+        elif existing[hex_color] != (name, continent, area_id):
+            updates.append((name, continent, area_id, hex_color))
+    if inserts:
+        cursor.executemany(
             """
-            INSERT OR REPLACE INTO StructuresDatas 
-            (type, specialisation, level, capacity, population, cout_construction)
+            INSERT INTO Regions
+            (country_id, name, region_color_hex, population, continent, geographical_area_id)
             VALUES (?, ?, ?, ?, ?, ?)
-        """,
-            ("Logement", "NA", level, 1000 * level, 0, base_cost),
+            """,
+            inserts,
         )
-
-
-def import_regions_data(cursor):
-    """Import regions data from region_list.csv"""
-    print("Importing regions data from region_list.csv...")
-
-    try:
-        region_csv_path = "/home/ubuntu/Bots/NEBot/datas/mapping/region_list.csv"
-
-        with open(region_csv_path, "r", encoding="utf-8") as file:
-            reader = csv.DictReader(file)
-
-            geographical_areas = {}
-            regions_data = []
-
-            for row in reader:
-                geographical_area_name = row["Pays/Region"].strip()
-                continent = row["Continent"].strip()
-                region_name = row["Nom region"].strip()
-                hex_color = row["Code couleur HEX"].strip()
-
-                # Ensure hex color is properly formatted
-                if not hex_color.startswith("#"):
-                    hex_color = "#" + hex_color
-
-                # Store geographical area for later insertion
-                if geographical_area_name not in geographical_areas:
-                    geographical_areas[geographical_area_name] = True
-
-                regions_data.append(
-                    {
-                        "geographical_area": geographical_area_name,
-                        "continent": continent,
-                        "name": region_name,
-                        "hex_color": hex_color,
-                    }
-                )
-
-            # Insert geographical areas first
-            print(f"Inserting {len(geographical_areas)} geographical areas...")
-            for area_name in geographical_areas.keys():
-                cursor.execute(
-                    """
-                    INSERT OR IGNORE INTO GeographicalAreas (name)
-                    VALUES (?)
-                    """,
-                    (area_name,),
-                )
-
-            # Get geographical area IDs for foreign key references
-            area_id_map = {}
-            cursor.execute("SELECT geographical_area_id, name FROM GeographicalAreas")
-            for area_id, area_name in cursor.fetchall():
-                area_id_map[area_name] = area_id
-
-            # Insert regions with references to geographical areas
-            print(f"Inserting {len(regions_data)} regions...")
-            for region in regions_data:
-                geographical_area_id = area_id_map.get(region["geographical_area"])
-
-                cursor.execute(
-                    """
-                    INSERT OR IGNORE INTO Regions 
-                    (country_id, name, region_color_hex, population, continent, geographical_area_id)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        None,  # country_id - NULL for unoccupied regions
-                        region["name"],
-                        region["hex_color"],
-                        0,  # Default population
-                        region["continent"],
-                        geographical_area_id,
-                    ),
-                )
-
-            print(
-                f"✅ Successfully imported {len(regions_data)} regions and {len(geographical_areas)} geographical areas"
-            )
-
-    except FileNotFoundError:
-        print(f"⚠️  Warning: region_list.csv not found at {region_csv_path}")
-    except Exception as e:
-        print(f"❌ Error importing regions data: {e}")
-        import traceback
-
-        traceback.print_exc()
-
-
-def import_all_datas():
-    """Main function to import all CSV data"""
-    db_path = "/home/ubuntu/Bots/NEBot/datas/rts.db"
+    if updates:
+        cursor.executemany(
+            "UPDATE Regions SET name = ?, continent = ?, geographical_area_id = ? "
+            "WHERE region_color_hex = ?",
+            updates,
+        )
+    counts["inserted"] += len(inserts)
+    counts["updated"] += len(updates)
+    return counts
+
+
+def import_all_datas(
+    conn=None, db_path: str = DB_PATH, data_dir: str = DATA_DIR, force: bool = False
+) -> dict:
+    """Import the CSV files that changed since the last import.
+
+    Each source file is hashed; only changed files are parsed, and their rows
+    are diffed against the database so unchanged rows are left alone. Every
+    change, and the new hashes, are written in a single transaction.
+    Pass `conn` to import through an existing connection (the bot's writer),
+    `force=True` to re-import every file regardless of its hash.
+    Returns {"success", "changed", "counts", "timings"}; a failed import is
+    rolled back and reports no change.
+    """
+    started = time.perf_counter()
+    own_connection = conn is None
+    if own_connection:
+        conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    ensure_meta_tables(cursor)
+    result = {"success": True, "changed": [], "counts": {}, "timings": {}}
 
     try:
-        # Connect to database
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        # Clear existing data
-        print("Clearing existing data...")
-        cursor.execute("DELETE FROM StructuresDatas")
-        cursor.execute("DELETE FROM TechnologyBoosts")
-        cursor.execute("DELETE FROM InfrastructureTypes")
-        cursor.execute("DELETE FROM PowerPlantsDatas")
-
-        # Import all data
-        import_factory_data(cursor)
-        import_military_base_data(cursor)
-        import_technocentre_data(cursor)
-        import_infrastructure_data(cursor)
-        import_power_plants_data(cursor)
-        import_housing_data(cursor)
-        import_regions_data(cursor)
-
-        # Commit changes
+        pending = []
+        for name, relative_path, parser, scopes in SOURCES:
+            source_started = time.perf_counter()
+            path = os.path.join(data_dir, relative_path) if relative_path else None
+            try:
+                digest = source_hash(path, parser)
+            except FileNotFoundError:
+                print(f"⚠️  Warning: {relative_path} not found in {data_dir}")
+                continue
+            if not force and digest == get_meta(cursor, f"csv_hash:{name}"):
+                continue
+            tables = parser(path) if path else parser()
+            pending.append((name, digest, tables, scopes))
+            result["timings"][name] = time.perf_counter() - source_started
+
+        for name, digest, tables, scopes in pending:
+            sync_started = time.perf_counter()
+            if name == "regions":
+                counts = sync_regions(cursor, tables)
+            else:
+                counts = {"inserted": 0, "updated": 0, "deleted": 0}
+                for table, rows in tables.items():
+                    table_counts = sync_rows(cursor, table, rows, scopes[table])
+                    for key, value in table_counts.items():
+                        counts[key] += value
+            set_meta(cursor, f"csv_hash:{name}", digest)
+            result["changed"].append(name)
+            result["counts"][name] = counts
+            result["timings"][name] += time.perf_counter() - sync_started
         conn.commit()
-        print("✅ All data imported successfully!")
-
-        # Display summary
-        cursor.execute("SELECT COUNT(*) FROM StructuresDatas")
-        structures_count = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM TechnologyBoosts")
-        tech_boosts_count = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM InfrastructureTypes")
-        infra_count = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM PowerPlantsDatas")
-        power_plants_count = cursor.fetchone()[0]
-
-        print(f"\nImport Summary:")
-        print(f"- Structures Data: {structures_count} entries")
-        print(f"- Technology Boosts: {tech_boosts_count} entries")
-        print(f"- Infrastructure Types: {infra_count} entries")
-        print(f"- Power Plants Data: {power_plants_count} entries")
-
-        # Show some sample costs to verify
-        print(f"\nSample Structure Costs:")
-        cursor.execute(
-            "SELECT type, specialisation, level, cout_construction FROM StructuresDatas WHERE cout_construction > 0 LIMIT 5"
-        )
-        for row in cursor.fetchall():
-            print(f"- {row[0]} {row[1]} Level {row[2]}: {row[3]:,}")
-
-        print(f"\nSample Power Plant Costs:")
-        cursor.execute(
-            "SELECT type, level, construction_cost FROM PowerPlantsDatas WHERE construction_cost > 0 LIMIT 5"
-        )
-        for row in cursor.fetchall():
-            print(f"- {row[0]} Level {row[1]}: {row[2]:,}")
-
-        conn.close()
 
     except Exception as e:
+        conn.rollback()
         print(f"❌ Error importing data: {e}")
         import traceback
 
         traceback.print_exc()
+        # Nothing was imported: the rolled-back changes must not be reported
+        result["success"] = False
+        result["changed"] = []
+        result["counts"] = {}
+
+    finally:
+        if own_connection:
+            conn.close()
+
+    total = (time.perf_counter() - started) * 1000
+    if result["changed"]:
+        print(f"\nImport Summary ({total:.1f} ms):")
+        for name in result["changed"]:
+            counts = result["counts"][name]
+            print(
+                f"- {name}: {counts['inserted']} inserted, {counts['updated']} updated, "
+                f"{counts['deleted']} deleted ({result['timings'][name] * 1000:.1f} ms)"
+            )
+    elif not result["success"]:
+        print(f"CSV import failed, nothing imported ({total:.1f} ms).")
+    else:
+        print(f"CSV data unchanged, import skipped ({total:.1f} ms).")
+    return result
 
 
 if __name__ == "__main__":
-    import_all_datas()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Import the game CSV data.")
+    parser.add_argument("--db", default=DB_PATH, help="SQLite database path")
+    parser.add_argument(
+        "--data-dir", default=DATA_DIR, help="directory holding csvs/ and mapping/"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="re-import files even if unchanged"
+    )
+    args = parser.parse_args()
+    import_all_datas(db_path=args.db, data_dir=args.data_dir, force=args.force)
@@ -0,0 +1,227 @@
+"""
+Append-only economic ledger.
+Every money/points movement made through Database (give/take/set balance and
+points) is appended to the Ledger table as a signed delta, on the bot's writer
+connection and in the same commit as the balance change: an entry exists if
+and only if its movement was committed, and it costs an INSERT, not a commit.
+The bot never commits from a second connection, so its ledger writes are not
+mistaken for admin panel edits (see SettingsCache).
+BalanceSnapshots periodically store every country's totals together with the
+last entry they include; "balance as of X" is then the latest snapshot before
+X plus a short replay of the entries that follow it.
+"""
+
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+KINDS = ("balance", "pol_points", "diplo_points")
+
+
+def _timestamp(when) -> float:
+    return when.timestamp() if isinstance(when, datetime) else float(when)
+
+
+class Ledger:
+    """
+    Reads and writes the Ledger and BalanceSnapshots tables through Database's
+    scopes. Entries are inserted in the caller's write scope and committed with
+    it; the only thread is the one taking the periodic snapshots.
+    """
+
+    def __init__(
+        self,
+        write_scope,
+        read_cursor,
+        snapshot_interval: float = 3600.0,
+    ):
+        # `write_scope()` / `read_cursor()` are Database's: writes join the
+        # caller's unit of work on the writer connection, reads see committed
+        # state on a pooled reader
+        self._write_scope = write_scope
+        self._read_cursor = read_cursor
+        self.snapshot_interval = snapshot_interval
+        self._stop = threading.Event()
+        self.stats = {"entries": 0, "snapshots": 0, "errors": 0}
+        self._thread = None
+        if snapshot_interval:
+            self._thread = threading.Thread(
+                target=self._run, name="nebot-ledger", daemon=True
+            )
+            self._thread.start()
+
+    def record_many(self, entries):
+        """Insert (country_id, kind, delta, reason, created_at) entries, in order.
+
+        Joins the caller's write scope: the entries are committed (or rolled
+        back) together with the movement they describe.
+        """
+        entries = [entry for entry in entries if entry[2]]
+        if not entries:
+            return
+        with self._write_scope() as cur:
+            cur.executemany(
+                "INSERT INTO Ledger (country_id, kind, delta, reason, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                entries,
+            )
+        self.stats["entries"] += len(entries)
+
+    def _run(self):
+        while not self._stop.wait(self.snapshot_interval):
+            self.take_snapshot()
+
+    def ensure_opening_snapshot(self):
+        """First start with a ledger: snapshot the current Inventory as the baseline."""
+        with self._write_scope() as cur:
+            if cur.execute("SELECT 1 FROM BalanceSnapshots LIMIT 1").fetchone():
+                return
+            cur.execute(
+                """
+                INSERT INTO BalanceSnapshots
+                    (country_id, balance, pol_points, diplo_points, last_entry_id, taken_at)
+                SELECT country_id, balance, pol_points, diplo_points,
+                       (SELECT COALESCE(MAX(entry_id), 0) FROM Ledger), ?
+                FROM Inventory
+                """,
+                (time.time(),),
+            )
+
+    def take_snapshot(self) -> int:
+        """Roll the latest snapshots forward over the new entries.
+
+        Only countries with new entries get a new row; the others' latest
+        snapshot is still current. Returns the number of rows written.
+        """
+        try:
+            with self._write_scope() as cur:
+                last_entry_id = cur.execute(
+                    "SELECT COALESCE(MAX(entry_id), 0) FROM Ledger"
+                ).fetchone()[0]
+                watermark = cur.execute(
+                    "SELECT COALESCE(MAX(last_entry_id), 0) FROM BalanceSnapshots"
+                ).fetchone()[0]
+                if last_entry_id <= watermark:
+                    return 0
+                totals = {}
+                for country_id, kind, delta in cur.execute(
+                    """
+                    SELECT country_id, kind, SUM(delta) FROM Ledger
+                    WHERE entry_id > ? AND entry_id <= ?
+                    GROUP BY country_id, kind
+                    """,
+                    (watermark, last_entry_id),
+                ).fetchall():
+                    totals.setdefault(country_id, dict.fromkeys(KINDS, 0))[
+                        kind
+                    ] += delta
+                now = time.time()
+                rows = []
+                for country_id, deltas in totals.items():
+                    base = (
+                        cur.execute(
+                            """
+                        SELECT balance, pol_points, diplo_points FROM BalanceSnapshots
+                        WHERE country_id = ? ORDER BY taken_at DESC LIMIT 1
+                        """,
+                            (country_id,),
+                        ).fetchone()
+                        or (0, 0, 0)
+                    )
+                    rows.append(
+                        (
+                            country_id,
+                            *(value + deltas[kind] for value, kind in zip(base, KINDS)),
+                            last_entry_id,
+                            now,
+                        )
+                    )
+                cur.executemany(
+                    """
+                    INSERT INTO BalanceSnapshots
+                        (country_id, balance, pol_points, diplo_points, last_entry_id, taken_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    rows,
+                )
+        except sqlite3.Error as e:
+            print(f"Error taking balance snapshot: {e}")
+            self.stats["errors"] += 1
+            return 0
+        self.stats["snapshots"] += 1
+        return len(rows)
+
+    def balance_as_of(self, country_id, when) -> dict:
+        """Balance and points of a country at `when` (datetime or Unix timestamp).
+
+        Before the ledger existed, only the movements recorded since are known:
+        dates prior to the opening snapshot replay the entries from zero.
+        """
+        when = _timestamp(when)
+        with self._read_cursor() as cur:
+            snapshot = cur.execute(
+                """
+                SELECT balance, pol_points, diplo_points, last_entry_id
+                FROM BalanceSnapshots
+                WHERE country_id = ? AND taken_at <= ?
+                ORDER BY taken_at DESC LIMIT 1
+                """,
+                (country_id, when),
+            ).fetchone()
+            result = dict(zip(KINDS, snapshot[:3] if snapshot else (0, 0, 0)))
+            for kind, delta in cur.execute(
+                """
+                SELECT kind, SUM(delta) FROM Ledger
+                WHERE country_id = ? AND entry_id > ? AND created_at <= ?
+                GROUP BY kind
+                """,
+                (country_id, snapshot[3] if snapshot else 0, when),
+            ):
+                result[kind] += delta
+        return result
+
+    def history(
+        self,
+        country_id,
+        kind: str = None,
+        since=None,
+        until=None,
+        limit: int = 50,
+    ) -> list:
+        """Latest movements of a country, newest first."""
+        query = "SELECT entry_id, kind, delta, reason, created_at FROM Ledger WHERE country_id = ?"
+        params = [country_id]
+        if kind is not None:
+            query += " AND kind = ?"
+            params.append(kind)
+        if since is not None:
+            query += " AND created_at >= ?"
+            params.append(_timestamp(since))
+        if until is not None:
+            query += " AND created_at <= ?"
+            params.append(_timestamp(until))
+        query += " ORDER BY entry_id DESC LIMIT ?"
+        params.append(limit)
+        with self._read_cursor() as cur:
+            rows = cur.execute(query, params).fetchall()
+        return [
+            {
+                "entry_id": entry_id,
+                "kind": kind,
+                "delta": delta,
+                "reason": reason,
+                "created_at": created_at,
+            }
+            for entry_id, kind, delta, reason, created_at in rows
+        ]
+
+    def get_stats(self) -> dict:
+        """Entries written and snapshot counters."""
+        return dict(self.stats)
+
+    def close(self, timeout: float = 10.0):
+        """Stop the snapshot thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
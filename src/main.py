@@ -38,6 +38,7 @@ import gc
 
 # Import async database
 from asyncdb import AsyncDatabase
+from sql_trace import enable_tracing
 
 # Import centralized utilities
 from shared_utils import (
@@ -86,6 +87,16 @@ removebg_apikey = dotenv_values(".env")["REMOVEBG_API_KEY"]
 groq_api_key = dotenv_values(".env")["GROQ_API_KEY"]
 notion_token = dotenv_values(".env")["NOTION_TOKEN"]
 
+# Opt-in SQL tracing: SQL_TRACE=1 (and SLOW_QUERY_MS=<ms>) in .env
+if dotenv_values(".env").get("SQL_TRACE", "0").lower() in ("1", "true", "yes"):
+    enable_tracing(
+        slow_threshold_ms=float(dotenv_values(".env").get("SLOW_QUERY_MS", 100))
+    )
+
+# Online backups: BACKUP_INTERVAL_HOURS (0 = disabled) and BACKUP_KEEP in .env
+BACKUP_INTERVAL_HOURS = float(dotenv_values(".env").get("BACKUP_INTERVAL_HOURS", 6))
+BACKUP_KEEP = int(dotenv_values(".env").get("BACKUP_KEEP", 7))
+
 _orig_print = print
 
 def print(*args, **kwargs):
@@ -173,6 +184,8 @@ async def on_ready():
     await bot.tree.sync()
     polling_notion.start()
     update_rp_date.start()
+    if BACKUP_INTERVAL_HOURS > 0:
+        scheduled_backup.start()
     # await update_rp_date()
     #polling_ovh.start()
 
@@ -208,6 +221,8 @@ usefulDatas = UsefulDatas(bat_types, bat_buffs, unit_types)
 initialize_utilities(bot, bat_types, bat_buffs, unit_types)
 set_eco_logger_bot(bot)  # Set bot instance for eco_logger
 db = get_db()
+async_db = AsyncDatabase()  # Shared pool of read-only async connections
+db.backups.keep = BACKUP_KEEP
 dUtils = get_discord_utils(bot, db)
 notion_handler = NotionHandler(notion_token, bot)
 
@@ -262,6 +277,17 @@ async def polling_notion():
         print(f"Erreur lors du polling Notion: {e}")
 
 
+@tasks.loop(hours=BACKUP_INTERVAL_HOURS or 6)
+async def scheduled_backup():
+    """Rotated snapshot of the database, taken without blocking the bot."""
+    result = await db.backups.run()
+    if result["success"]:
+        print(
+            f"[Backup] {result['path']} ({result['size'] / 1_000_000:.1f} MB) "
+            f"in {result['duration_ms']:.0f} ms"
+        )
+
+
 URL = "https://www.ovhcloud.com/fr/vps/configurator/?planCode=vps-2025-model3&brick=VPS%2BModel%2B3&pricing=upfront12&processor=%20&vcore=8__vCore&storage=200__SSD__NVMe"
 TARGET_LOCATIONS = [
     "France - Gravelines",
@@ -380,7 +406,6 @@ async def update_map():
 async def get_continental_statistics(continent: str) -> dict:
     """Get statistics for a specific continent using async database."""
     try:
-        async_db = AsyncDatabase()
         return await async_db.get_continental_statistics_async(continent)
     except Exception as e:
         print(f"Error getting continental statistics for {continent}: {e}")
@@ -399,7 +424,6 @@ async def get_continental_statistics(continent: str) -> dict:
 async def get_world_statistics() -> dict:
     """Get global world statistics using async database."""
     try:
-        async_db = AsyncDatabase()
         return await async_db.get_world_statistics_async()
     except Exception as e:
         print(f"Error getting world statistics: {e}")
@@ -418,7 +442,6 @@ async def get_world_statistics() -> dict:
 async def get_continent_country_count(continent: str) -> int:
     """Get the number of countries in a specific continent using async database."""
     try:
-        async_db = AsyncDatabase()
         return await async_db.get_continent_country_count_async(continent)
     except Exception as e:
         print(f"Error getting country count for {continent}: {e}")
@@ -1173,7 +1196,13 @@ async def lead(ctx):
             title=f"Classement des pays (de {offset + 1} à {offset + len(leaderboard)})",
             color=0x00FF00,
         )
-        for i, (role_id, balance, pp, pd) in enumerate(leaderboard, offset + 1):
+        for i, row in enumerate(leaderboard, offset + 1):
+            role_id, balance, pp, pd = (
+                row["role_id"],
+                row["balance"],
+                row["pol_points"],
+                row["diplo_points"],
+            )
             role = ctx.guild.get_role(int(role_id))
             if role:
                 rolename = role.name + f" - {str(role_id)}"
@@ -1186,7 +1215,8 @@ async def lead(ctx):
             )
         return embed
 
-    leaderboard = await db.get_leaderboard()
+    page_size = 10
+    leaderboard = await db.get_leaderboard(limit=page_size)
 
     if len(leaderboard) == 0:
         return await ctx.send("Le classement est vide.")
@@ -1194,21 +1224,33 @@ async def lead(ctx):
     view = View()
     max_entries = 100  # Limite maximum du nombre d'utilisateurs à afficher
 
+    # Pagination par clé : on repart de la dernière / première ligne affichée
     async def next_callback(interaction):
-        nonlocal offset
-        offset += 10
-        leaderboard = await db.get_leaderboard(offset)
-        if len(leaderboard) > 0:
+        nonlocal offset, leaderboard
+        # Page vide ou incomplète : c'est la dernière, pas de curseur à suivre
+        if len(leaderboard) < page_size:
+            return
+        last = leaderboard[-1]
+        page = await db.get_leaderboard(
+            after=(last["score"], last["country_id"]), limit=page_size
+        )
+        if len(page) > 0:
+            offset += len(leaderboard)
+            leaderboard = page
             embed = await create_lead_embed(leaderboard, offset)
             await interaction.response.edit_message(embed=embed, view=view)
-        else:
-            offset -= 10
 
     async def prev_callback(interaction):
-        nonlocal offset
-        if offset > 0:
-            offset -= 10
-            leaderboard = await db.get_leaderboard(offset)
+        nonlocal offset, leaderboard
+        if offset > 0 and len(leaderboard) > 0:
+            first = leaderboard[0]
+            page = await db.get_leaderboard(
+                before=(first["score"], first["country_id"]), limit=page_size
+            )
+            if len(page) == 0:
+                return
+            leaderboard = page
+            offset = max(0, offset - len(leaderboard))
             embed = await create_lead_embed(leaderboard, offset)
             await interaction.response.edit_message(embed=embed, view=view)
 
@@ -1617,9 +1659,13 @@ async def _create_country_database_entries(
 
 async def _initialize_country_resources(country_id: int) -> None:
     """Initialize starting resources for the new country."""
-    db.set_balance(country_id, starting_amounts["money"])
-    db.set_points(country_id, starting_amounts["pol_points"], 1)  # Political points
-    db.set_points(country_id, starting_amounts["diplo_points"], 2)  # Diplomatic points
+    db.set_balance(country_id, starting_amounts["money"], reason="starting_amounts")
+    db.set_points(
+        country_id, starting_amounts["pol_points"], 1, reason="starting_amounts"
+    )  # Political points
+    db.set_points(
+        country_id, starting_amounts["diplo_points"], 2, reason="starting_amounts"
+    )  # Diplomatic points
 
 
 async def _send_creation_success(
@@ -1849,40 +1895,45 @@ async def delete_country(ctx, country: CountryConverter):
 
     # Step 3: Free all regions owned by this country
     try:
-        # Get all regions owned by this country
-        db.cur.execute("SELECT region_id, name FROM Regions WHERE country_id = ?", (country_id,))
-        regions = db.cur.fetchall()
-        freed_regions = 0
-        
-        for region in regions:
-            db.cur.execute(
-                "UPDATE Regions SET country_id = NULL WHERE region_id = ? AND country_id = ?",
-                (region["region_id"], country_id)
-            )
-            freed_regions += 1
-        
+        # Writes on the shared writer connection hold the write lock
+        with db.write_scope():
+            # Get all regions owned by this country
+            db.cur.execute("SELECT region_id, name FROM Regions WHERE country_id = ?", (country_id,))
+            regions = db.cur.fetchall()
+            freed_regions = 0
+
+            for region in regions:
+                db.cur.execute(
+                    "UPDATE Regions SET country_id = NULL WHERE region_id = ? AND country_id = ?",
+                    (region["region_id"], country_id)
+                )
+                freed_regions += 1
+
+            db.conn.commit()
+
         if freed_regions > 0:
             deletion_log.append(f"✅ {freed_regions} région(s) libérée(s)")
         else:
             deletion_log.append("ℹ️ Aucune région à libérer")
-            
-        db.conn.commit()
     except Exception as e:
         deletion_log.append(f"❌ Erreur lors de la libération des régions: {e}")
 
     # Step 4: Delete all country data from database
     try:
         # Most tables have CASCADE DELETE, so deleting from Countries table should handle most
-        db.cur.execute("DELETE FROM Countries WHERE country_id = ?", (country_id,))
-        db.cur.execute("DELETE FROM Governments WHERE country_id = ?", (country_id,))
-        db.cur.execute("DELETE FROM CountryDoctrines WHERE country_id = ?", (country_id,))
-        db.cur.execute("DELETE FROM Inventory WHERE country_id = ?", (country_id,))
-        db.cur.execute("DELETE FROM Stats WHERE country_id = ?", (country_id,))
-        db.conn.commit()
+        # (the write scope rolls back on error)
+        with db.write_scope():
+            db.cur.execute("DELETE FROM Countries WHERE country_id = ?", (country_id,))
+            db.cur.execute("DELETE FROM Governments WHERE country_id = ?", (country_id,))
+            db.cur.execute("DELETE FROM CountryDoctrines WHERE country_id = ?", (country_id,))
+            db.cur.execute("DELETE FROM Inventory WHERE country_id = ?", (country_id,))
+            db.cur.execute("DELETE FROM Stats WHERE country_id = ?", (country_id,))
+            db.conn.commit()
         deletion_log.append("✅ Toutes les données du pays supprimées de la base")
     except Exception as e:
         deletion_log.append(f"❌ Erreur lors de la suppression des données: {e}")
-        db.conn.rollback()
+    # Its role and players no longer resolve to a country
+    db.identities.invalidate()
 
     # Send final report
     embed = discord.Embed(
@@ -2455,7 +2506,7 @@ Le coût total est de {convert(str(cost))}.\n\n"
         return
     if not db.has_enough_balance(country.get("id"), cost):
         return await ctx.send("Fonds insuffisants.")
-    db.take_balance(country.get("id"), cost)
+    db.take_balance(country.get("id"), cost, reason="recruitment")
     confirmed = await dUtils.ask_confirmation(
         ctx,
         country.get("id"),
@@ -0,0 +1,164 @@
+"""
+Versioned schema migrations for the game database.
+The .sql files in datas/db_schemas describe the current schema and are enough
+to create a fresh database. MIGRATIONS bring an existing database up to the
+shape those files expect (new columns, data conversions...) and are applied
+once, in order, their version being recorded in the schema_version table.
+The schema files themselves are only re-executed when their content changes.
+"""
+
+import hashlib
+import os
+from datetime import datetime, timezone
+
+SCHEMA_DIR = "datas/db_schemas"
+
+
+def _add_production_completion_month(cur):
+    """StructureProduction: countdown (months_remaining) -> absolute completion month."""
+    columns = [row[1] for row in cur.execute("PRAGMA table_info(StructureProduction)")]
+    if not columns or "completion_month" in columns:
+        return
+    row = cur.execute(
+        "SELECT year * 12 + month - 1 FROM Dates ORDER BY real_date DESC LIMIT 1"
+    ).fetchone()
+    current_month = row[0] if row else 2023 * 12
+    cur.execute("ALTER TABLE StructureProduction ADD COLUMN completion_month INTEGER")
+    cur.execute(
+        "UPDATE StructureProduction SET completion_month = ? + months_remaining",
+        (current_month,),
+    )
+
+
+def _add_structures_owner(cur):
+    """Structures/Infrastructure/PowerPlants: copy of their region's country_id."""
+    for table in ("Structures", "Infrastructure", "PowerPlants"):
+        columns = [row[1] for row in cur.execute(f"PRAGMA table_info({table})")]
+        if not columns or "country_id" in columns:
+            continue
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN country_id INTEGER")
+        cur.execute(
+            f"""
+            UPDATE {table} SET country_id = (
+                SELECT country_id FROM Regions WHERE Regions.region_id = {table}.region_id
+            )
+            """
+        )
+
+
+# (version, description, function(cursor)) — append only, never renumber
+MIGRATIONS = [
+    (1, "StructureProduction.completion_month", _add_production_completion_month),
+    (2, "Structures/Infrastructure/PowerPlants.country_id", _add_structures_owner),
+]
+
+
+def files_hash(paths) -> str:
+    """SHA-256 over the names and contents of the given files (missing files included)."""
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(os.path.basename(path).encode("utf-8"))
+        try:
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        except FileNotFoundError:
+            digest.update(b"<missing>")
+    return digest.hexdigest()
+
+
+def schema_files(schema_dir: str = SCHEMA_DIR) -> list:
+    """Schema files, in the order they are executed."""
+    return [
+        os.path.join(schema_dir, filename)
+        for filename in sorted(os.listdir(schema_dir))
+        if filename.endswith(".sql")
+    ]
+
+
+def ensure_meta_tables(cur):
+    """Create the schema_version and SchemaMeta tables if needed."""
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS SchemaMeta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        )
+        """
+    )
+
+
+def get_meta(cur, key: str):
+    row = cur.execute("SELECT value FROM SchemaMeta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def set_meta(cur, key: str, value: str):
+    cur.execute(
+        "INSERT INTO SchemaMeta (key, value) VALUES (?, ?) "
+        "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        (key, value),
+    )
+
+
+def get_schema_version(cur) -> int:
+    row = cur.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def migrate(conn, schema_dir: str = SCHEMA_DIR) -> dict:
+    """Bring the database up to date. Returns what was done, for the startup log."""
+    cur = conn.cursor()
+    ensure_meta_tables(cur)
+    is_new_database = (
+        cur.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'Countries'"
+        ).fetchone()
+        is None
+    )
+    current_version = get_schema_version(cur)
+    now = datetime.now(timezone.utc).isoformat()
+
+    # Existing databases: run pending migrations before the schema files, so
+    # that indexes declared there on new columns can be created
+    applied = []
+    for version, description, migration in MIGRATIONS:
+        if version <= current_version:
+            continue
+        if not is_new_database:
+            migration(cur)
+            applied.append(version)
+        cur.execute(
+            "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+            (version, description, now),
+        )
+    conn.commit()
+
+    paths = schema_files(schema_dir)
+    schema_hash = files_hash(paths)
+    schema_applied = schema_hash != get_meta(cur, "schema_hash")
+    if schema_applied:
+        for path in paths:
+            with open(path, "r", encoding="utf-8") as f:
+                try:
+                    cur.executescript(f.read())
+                except Exception as e:
+                    print(f"Error executing {os.path.basename(path)}: {e}")
+                    raise e
+        set_meta(cur, "schema_hash", schema_hash)
+        conn.commit()
+
+    return {
+        "new_database": is_new_database,
+        "schema_applied": schema_applied,
+        "migrations": applied,
+        "version": get_schema_version(cur),
+    }
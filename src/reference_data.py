@@ -0,0 +1,115 @@
+"""
+Immutable in-memory snapshot of the game's reference tables.
+StructuresDatas, TechnologyBoosts, PowerPlantsDatas, InfrastructureTypes and
+InventoryPricings only change when the CSV import runs (or an admin edits them),
+so cost/capacity lookups are served from dictionaries instead of SQLite.
+A snapshot is never mutated: a new one is built and swapped in as a whole.
+"""
+
+from types import MappingProxyType
+
+
+class ReferenceData:
+    """Read-only lookups over the reference tables, keyed like their UNIQUE constraints."""
+
+    __slots__ = (
+        "structures",
+        "tech_boosts",
+        "power_plants",
+        "infrastructure_costs",
+        "pricings",
+    )
+
+    def __init__(
+        self,
+        structures: dict,
+        tech_boosts: dict,
+        power_plants: dict,
+        infrastructure_costs: dict,
+        pricings: dict,
+    ):
+        # (type, specialisation, level) -> {"capacity", "required_population", "construction_cost"}
+        self.structures = MappingProxyType(structures)
+        # tech_level -> boost_coefficient
+        self.tech_boosts = MappingProxyType(tech_boosts)
+        # (type, level) -> PowerPlantsDatas row as a dict
+        self.power_plants = MappingProxyType(power_plants)
+        # infrastructure type -> cost_per_km
+        self.infrastructure_costs = MappingProxyType(infrastructure_costs)
+        # item -> {"price", "maintenance"}
+        self.pricings = MappingProxyType(pricings)
+
+    @classmethod
+    def load(cls, conn) -> "ReferenceData":
+        """Build a snapshot from the reference tables of `conn`."""
+        structures = {
+            (row[0], row[1], row[2]): MappingProxyType(
+                {
+                    "capacity": row[3],
+                    "required_population": row[4],
+                    "construction_cost": row[5],
+                }
+            )
+            for row in conn.execute(
+                "SELECT type, specialisation, level, capacity, population, cout_construction FROM StructuresDatas"
+            )
+        }
+        tech_boosts = {
+            row[0]: row[1]
+            for row in conn.execute(
+                "SELECT tech_level, boost_coefficient FROM TechnologyBoosts"
+            )
+        }
+        power_plants = {
+            (row[0], row[1]): MappingProxyType(
+                {
+                    "production_mwh": row[2],
+                    "construction_cost": row[3],
+                    "danger_rate": row[4],
+                    "resource_type": row[5],
+                    "resource_consumption": row[6],
+                    "price_per_mwh": row[7],
+                }
+            )
+            for row in conn.execute(
+                """
+                SELECT type, level, production_mwh, construction_cost, danger_rate,
+                       resource_type, resource_consumption, price_per_mwh
+                FROM PowerPlantsDatas
+                """
+            )
+        }
+        infrastructure_costs = {
+            row[0]: row[1]
+            for row in conn.execute("SELECT type, cost_per_km FROM InfrastructureTypes")
+        }
+        pricings = {
+            row[0]: MappingProxyType({"price": row[1], "maintenance": row[2]})
+            for row in conn.execute(
+                "SELECT item, price, maintenance FROM InventoryPricings"
+            )
+        }
+        return cls(
+            structures, tech_boosts, power_plants, infrastructure_costs, pricings
+        )
+
+    def get_structure(self, structure_type: str, specialisation: str, level: int):
+        """StructuresDatas row for a type/specialisation/level, or None."""
+        return self.structures.get((structure_type, specialisation, level))
+
+    def get_power_plant(self, plant_type: str, level: int):
+        """PowerPlantsDatas row for a type/level, or None."""
+        return self.power_plants.get((plant_type, level))
+
+    def power_plant_levels(self, plant_type: str, buildable_only: bool = False) -> list:
+        """Sorted levels defined for a power plant type."""
+        return sorted(
+            level
+            for (type_, level), data in self.power_plants.items()
+            if type_ == plant_type
+            and (not buildable_only or data["construction_cost"] > 0)
+        )
+
+    def power_plant_types(self) -> list:
+        """Sorted distinct power plant types."""
+        return sorted({type_ for type_, _ in self.power_plants})
@@ -0,0 +1,113 @@
+"""
+In-process cache of the ServerSettings table.
+Settings are loaded once at startup and served from memory. Writes made by the
+bot go through the cache (write-through); writes made by another process (the
+Flask admin panel) are detected with `PRAGMA data_version`, which changes on a
+connection whenever a *different* connection commits to the database file.
+"""
+
+import threading
+import time
+
+
+class SettingsCache:
+    """Typed, thread-safe view of ServerSettings with external change detection."""
+
+    def __init__(self, conn, lock=None, check_interval: float = 2.0):
+        # `conn` must be the connection the bot writes with: its data_version
+        # then only moves when someone else (the admin panel) commits.
+        self._conn = conn
+        self._lock = lock or threading.RLock()
+        self.check_interval = check_interval
+        self._values = {}
+        self._data_version = None
+        self._last_check = 0.0
+        self._listeners = []
+        self.reloads = 0
+
+    def add_listener(self, callback):
+        """Call `callback()` whenever an external commit is detected.
+
+        Lets other in-memory caches (reference data...) piggyback on the same
+        data_version check instead of polling the database themselves.
+        """
+        self._listeners.append(callback)
+
+    def _read_data_version(self) -> int:
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def load(self):
+        """(Re)load every setting from the database."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM ServerSettings"
+            ).fetchall()
+            self._values = {row[0]: row[1] for row in rows}
+            self._data_version = self._read_data_version()
+            self._last_check = time.monotonic()
+            self.reloads += 1
+
+    def refresh_if_changed(self, force: bool = False) -> bool:
+        """Reload if another process committed since the last check.
+
+        The check itself is throttled to once every `check_interval` seconds,
+        so hot paths only pay for a dictionary lookup.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_check < self.check_interval:
+            return False
+        with self._lock:
+            self._last_check = now
+            if self._read_data_version() == self._data_version:
+                return False
+            self.load()
+        for callback in self._listeners:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error refreshing cache after external change: {e}")
+        return True
+
+    def get(self, key: str, default: str = None) -> str:
+        """Raw string value of a setting."""
+        self.refresh_if_changed()
+        return self._values.get(key, default)
+
+    def get_int(self, key: str, default: int = None) -> int:
+        """Integer value of a setting (IDs, amounts)."""
+        value = self.get(key)
+        try:
+            return int(value) if value is not None else default
+        except (TypeError, ValueError):
+            return default
+
+    def get_bool(self, key: str, default: bool = False) -> bool:
+        """Boolean value of a setting stored as '0'/'1'."""
+        value = self.get(key)
+        if value is None:
+            return default
+        return str(value).strip().lower() in ("1", "true", "yes", "on")
+
+    def get_color(self, key: str, default: int = 0) -> int:
+        """Colour setting stored as a hexadecimal string."""
+        value = self.get(key)
+        try:
+            return int(value, 16) if value is not None else default
+        except (TypeError, ValueError):
+            return default
+
+    def set_local(self, key: str, value):
+        """Write-through: record a value the bot just wrote to the database."""
+        with self._lock:
+            self._values[key] = str(value)
+
+    def remove_local(self, key: str):
+        """Write-through for a deleted setting."""
+        with self._lock:
+            self._values.pop(key, None)
+
+    def as_dict(self) -> dict:
+        """Snapshot of every cached setting."""
+        self.refresh_if_changed()
+        with self._lock:
+            return dict(self._values)
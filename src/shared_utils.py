@@ -10,6 +10,7 @@ from typing import Union, List
 
 # Import the base classes
 from db import Database, UsefulDatas
+from db_executor import DatabaseExecutor
 from discord_utils import discordUtils
 from currency import convert, amount_converter
 
@@ -17,14 +18,16 @@ import re
 
 # Global instances (will be initialized when bot is ready)
 db = None
+adb = None
 dUtils = None
 
 
 def initialize_utilities(bot, bat_types, bat_buffs, unit_types):
     """Initialize all utility instances with the bot instance."""
-    global db, dUtils
+    global db, adb, dUtils
     uDatas = UsefulDatas(bat_types, bat_buffs, unit_types)
     db = Database("datas/rts.db", uDatas)
+    adb = DatabaseExecutor(db)
     dUtils = discordUtils(bot, db)
 
 
@@ -36,6 +39,14 @@ def get_db():
     return db
 
 
+def get_db_executor():
+    """Get the global awaitable database facade (runs queries off the event loop)."""
+    global adb
+    if adb is None:
+        adb = DatabaseExecutor(get_db())
+    return adb
+
+
 def get_discord_utils(bot=None, db=None):
     """Get the global discord utils instance."""
     global dUtils
@@ -203,9 +214,9 @@ async def country_autocomplete(
 
     try:
         # Get all countries by querying the Countries table directly
-        cursor = db_instance.cur
-        cursor.execute("SELECT country_id, name, role_id FROM Countries ORDER BY name")
-        countries = cursor.fetchall()
+        countries = db_instance.fetch_all(
+            "SELECT country_id, name, role_id FROM Countries ORDER BY name"
+        )
 
         # Add country roles first (prioritized)
         for country in countries:
@@ -227,8 +238,12 @@ async def country_autocomplete(
         # Add users/members if there's still space and current input looks like a user search
         if len(choices) < 20 and len(current) >= 2:
             # Get members who have government positions (are country players)
-            cursor.execute("SELECT DISTINCT player_id FROM Governments")
-            government_players = [row[0] for row in cursor.fetchall()]
+            government_players = [
+                row[0]
+                for row in db_instance.fetch_all(
+                    "SELECT DISTINCT player_id FROM Governments"
+                )
+            ]
 
             for player_id in government_players:
                 if len(choices) >= 25:  # Discord limit
@@ -349,9 +364,12 @@ async def power_plant_type_autocomplete(
 
     try:
         # Get all distinct power plant types from the database
-        cursor = db_instance.cur
-        cursor.execute("SELECT DISTINCT type FROM PowerPlantsDatas ORDER BY type")
-        power_plant_types = [row[0] for row in cursor.fetchall()]
+        power_plant_types = [
+            row[0]
+            for row in db_instance.fetch_all(
+                "SELECT DISTINCT type FROM PowerPlantsDatas ORDER BY type"
+            )
+        ]
 
         power_plant_emojis = {
             "éolien onshore": "🌬️",
@@ -403,9 +421,12 @@ async def infrastructure_type_autocomplete(
 
     try:
         # Get all infrastructure types from the database
-        cursor = db_instance.cur
-        cursor.execute("SELECT DISTINCT type FROM InfrastructureTypes ORDER BY type")
-        infrastructure_types = [row[0] for row in cursor.fetchall()]
+        infrastructure_types = [
+            row[0]
+            for row in db_instance.fetch_all(
+                "SELECT DISTINCT type FROM InfrastructureTypes ORDER BY type"
+            )
+        ]
 
         infrastructure_emojis = {
             "Route sommaire": "🛤️",
@@ -494,19 +515,17 @@ async def structure_autocomplete(
             return choices
 
         # Get only traditional structures for this country
-        cursor = db_instance.cur
-        cursor.execute(
+        structures = db_instance.fetch_all(
             """
             SELECT s.id, s.type, s.specialisation, s.level, r.name as region_name
             FROM Structures s
             JOIN Regions r ON s.region_id = r.region_id
-            WHERE r.country_id = ?
+            WHERE s.country_id = ?
             ORDER BY s.type, s.level DESC
             LIMIT 25
         """,
             (country_id,),
         )
-        structures = cursor.fetchall()
 
         # Process traditional structures
         for structure in structures:
@@ -555,21 +574,18 @@ async def power_plant_autocomplete(
             return choices
 
         # Get power plants for this country
-        cursor = db_instance.cur
-        cursor.execute(
-            """
-            SELECT p.id, p.type, p.level, r.name as region_name
-            FROM PowerPlants p
-            JOIN Regions r ON p.region_id = r.region_id
-            WHERE r.country_id = ?
-            ORDER BY p.type, p.level DESC
-            LIMIT 25
-        """,
-            (country_id,),
-        )
-
         try:
-            power_plants = cursor.fetchall()
+            power_plants = db_instance.fetch_all(
+                """
+                SELECT p.id, p.type, p.level, r.name as region_name
+                FROM PowerPlants p
+                JOIN Regions r ON p.region_id = r.region_id
+                WHERE p.country_id = ?
+                ORDER BY p.type, p.level DESC
+                LIMIT 25
+            """,
+                (country_id,),
+            )
         except:
             power_plants = []  # Table might not exist yet
 
@@ -620,21 +636,18 @@ async def infrastructure_autocomplete(
             return choices
 
         # Get infrastructures for this country
-        cursor = db_instance.cur
-        cursor.execute(
-            """
-            SELECT i.id, i.type, i.length_km, r.name as region_name
-            FROM Infrastructure i
-            JOIN Regions r ON i.region_id = r.region_id
-            WHERE r.country_id = ?
-            ORDER BY i.type
-            LIMIT 25
-        """,
-            (country_id,),
-        )
-
         try:
-            infrastructures = cursor.fetchall()
+            infrastructures = db_instance.fetch_all(
+                """
+                SELECT i.id, i.type, i.length_km, r.name as region_name
+                FROM Infrastructure i
+                JOIN Regions r ON i.region_id = r.region_id
+                WHERE i.country_id = ?
+                ORDER BY i.type
+                LIMIT 25
+            """,
+                (country_id,),
+            )
         except:
             infrastructures = []  # Table might not exist yet
 
@@ -684,8 +697,7 @@ async def region_autocomplete(
             return choices
 
         # Get regions for this country
-        cursor = db_instance.cur
-        cursor.execute(
+        regions = db_instance.fetch_all(
             """
             SELECT region_id, name, population
             FROM Regions
@@ -696,8 +708,6 @@ async def region_autocomplete(
             (country_id,),
         )
 
-        regions = cursor.fetchall()
-
         for region in regions:
             region_id, region_name, population = region
 
@@ -734,9 +744,8 @@ async def free_region_autocomplete(
         return choices
 
     try:
-        cursor = db_instance.cur
         if current_lower:
-            cursor.execute(
+            regions = db_instance.fetch_all(
                 """
             SELECT r.region_id, r.name, r.population, r.geographical_area_id
             FROM Regions r
@@ -749,7 +758,7 @@ async def free_region_autocomplete(
                 (f"{current_lower}%", f"{current_lower}%"),
             )
         else:
-            cursor.execute(
+            regions = db_instance.fetch_all(
                 """
             SELECT r.region_id, r.name, r.population, r.geographical_area_id
             FROM Regions r
@@ -758,7 +767,6 @@ async def free_region_autocomplete(
             LIMIT 25
             """
             )
-        regions = cursor.fetchall()
 
         for region in regions:
             region_id, region_name, population, geographical_area_id = region
@@ -809,19 +817,20 @@ async def factory_autocomplete(
             return choices
 
         # Get only factories (Usine) for this country
-        cursor = db_instance.cur
-        cursor.execute(
+        factories = db_instance.fetch_all(
             """
             SELECT s.id, s.specialisation, s.level, r.name as region_name
             FROM Structures s
             JOIN Regions r ON s.region_id = r.region_id
-            WHERE r.country_id = ? AND s.type = 'Usine'
+            WHERE s.country_id = ? AND s.type = 'Usine'
             ORDER BY s.specialisation, s.level DESC
             LIMIT 25
         """,
             (country_id,),
         )
-        factories = cursor.fetchall()
+
+        # Free production slots of all the country's factories, in one pass
+        slots = db_instance.get_country_production_slots(country_id)
 
         # Process factories
         for factory in factories:
@@ -829,9 +838,10 @@ async def factory_autocomplete(
             search_text = f"usine {specialisation} {region_name}".lower()
 
             if not current_lower or current_lower in search_text:
+                free = slots.get(factory_id, {}).get("remaining_capacity", 0)
                 choices.append(
                     app_commands.Choice(
-                        name=f"🏭 Usine {specialisation} Niv.{level} ({region_name})",
+                        name=f"🏭 Usine {specialisation} Niv.{level} ({region_name}) - {free:.0f} slots libres",
                         value=factory_id,  # Return integer ID directly
                     )
                 )
@@ -870,19 +880,17 @@ async def technocentre_autocomplete(
             return choices
 
         # Get only technocentres for this country
-        cursor = db_instance.cur
-        cursor.execute(
+        technocentres = db_instance.fetch_all(
             """
             SELECT s.id, s.specialisation, s.level, r.name as region_name
             FROM Structures s
             JOIN Regions r ON s.region_id = r.region_id
-            WHERE r.country_id = ? AND s.type = 'Technocentre'
+            WHERE s.country_id = ? AND s.type = 'Technocentre'
             ORDER BY s.specialisation, s.level DESC
             LIMIT 25
         """,
             (country_id,),
         )
-        technocentres = cursor.fetchall()
 
         # Process technocentres
         for technocentre in technocentres:
@@ -945,19 +953,17 @@ async def technology_autocomplete(
 
             if is_military_admin:
                 # Military admin sees ALL technologies
-                cursor = db_instance.cur
-                cursor.execute(
+                secret_channel_techs = db_instance.fetch_all(
                     """
                     SELECT name FROM Countries
                     WHERE secret_channel_id = ?
                 """,
                     (interaction.channel_id,),
                 )
-                secret_channel_techs = cursor.fetchall()
                 print(
                     f"technology_autocomplete: Military admin found {len(secret_channel_techs)} secret channel technologies"
                 )
-                cursor.execute(
+                technologies = db_instance.fetch_all(
                     """
                     SELECT tech_id, name, developed_by, specialisation, technology_level, type, is_secret
                     FROM Technologies
@@ -968,7 +974,6 @@ async def technology_autocomplete(
                 """,
                     (f"%{current}%", 1 if len(secret_channel_techs) > 0 else 0),
                 )
-                technologies = cursor.fetchall()
                 print(
                     f"technology_autocomplete: Military admin found {len(technologies)} technologies"
                 )
@@ -1038,25 +1043,23 @@ async def technology_autocomplete(
         )
 
         # Get technologies based on context
-        cursor = db_instance.cur
 
         # Debug: First check if there are ANY technologies in the database
-        cursor.execute("SELECT COUNT(*) FROM Technologies")
-        total_techs = cursor.fetchone()[0]
+        total_techs = db_instance.fetch_one("SELECT COUNT(*) FROM Technologies")[0]
         f.write(
             f"technology_autocomplete: Total technologies in database: {total_techs}"
         )
 
         # Debug: Check if there are exported technologies
-        cursor.execute("SELECT COUNT(*) FROM Technologies WHERE exported = 1")
-        exported_techs = cursor.fetchone()[0]
+        exported_techs = db_instance.fetch_one(
+            "SELECT COUNT(*) FROM Technologies WHERE exported = 1"
+        )[0]
         f.write(f"technology_autocomplete: Exported technologies: {exported_techs}")
 
         # Debug: Check if there are technologies developed by this country
-        cursor.execute(
+        country_techs = db_instance.fetch_one(
             "SELECT COUNT(*) FROM Technologies WHERE developed_by = ?", (country_id,)
-        )
-        country_techs = cursor.fetchone()[0]
+        )[0]
         f.write(
             f"technology_autocomplete: Technologies developed by country {country_id}: {country_techs}"
         )
@@ -1085,8 +1088,7 @@ async def technology_autocomplete(
             params = ()
 
         f.write(f"technology_autocomplete: Executing query with params: {params}")
-        cursor.execute(query, params)
-        technologies = cursor.fetchall()
+        technologies = db_instance.fetch_all(query, params)
         f.write(
             f"technology_autocomplete: Player found {len(technologies)} technologies"
         )
@@ -1094,7 +1096,7 @@ async def technology_autocomplete(
         # Debug: If no results, try simpler query
         if not technologies:
             f.write(f"technology_autocomplete: No results, trying simpler query...")
-            cursor.execute(
+            all_matching = db_instance.fetch_all(
                 """
                 SELECT tech_id, name, specialisation, technology_level, type, 
                        COALESCE(is_secret, 0) as is_secret
@@ -1105,7 +1107,6 @@ async def technology_autocomplete(
             """,
                 (f"%{current}%",),
             )
-            all_matching = cursor.fetchall()
             f.write(
                 f"technology_autocomplete: All matching technologies (debug): {len(all_matching)}"
             )
@@ -1235,9 +1236,8 @@ async def economy_doctrines_autocomplete(
         return choices
 
     try:
-        cursor = db_instance.cur
         # Get ideologies from Doctrines table
-        cursor.execute(
+        doctrines = db_instance.fetch_all(
             """
             SELECT doctrine_id, name, category 
             FROM Doctrines 
@@ -1245,7 +1245,6 @@ async def economy_doctrines_autocomplete(
             ORDER BY category, name
         """
         )
-        doctrines = cursor.fetchall()
 
         for doctrine in doctrines:
             doctrine_id, name, category = doctrine
@@ -1253,9 +1252,7 @@ async def economy_doctrines_autocomplete(
             if current_lower in name.lower():
                 emoji = "💰"
                 choices.append(
-                    app_commands.Choice(
-                        name=f"{emoji} {name}", value=str(doctrine_id)
-                    )
+                    app_commands.Choice(name=f"{emoji} {name}", value=str(doctrine_id))
                 )
 
     except Exception as e:
@@ -1263,6 +1260,7 @@ async def economy_doctrines_autocomplete(
 
     return choices[:25]  # Discord limit
 
+
 async def ideology_doctrines_autocomplete(
     interaction: discord.Interaction,
     current: str,
@@ -1282,9 +1280,8 @@ async def ideology_doctrines_autocomplete(
         return choices
 
     try:
-        cursor = db_instance.cur
         # Get ideologies from Doctrines table
-        cursor.execute(
+        doctrines = db_instance.fetch_all(
             """
             SELECT doctrine_id, name, category 
             FROM Doctrines 
@@ -1292,7 +1289,6 @@ async def ideology_doctrines_autocomplete(
             ORDER BY category, name
         """
         )
-        doctrines = cursor.fetchall()
 
         for doctrine in doctrines:
             doctrine_id, name, category = doctrine
@@ -1300,9 +1296,7 @@ async def ideology_doctrines_autocomplete(
             if current_lower in name.lower():
                 emoji = "🏛️"
                 choices.append(
-                    app_commands.Choice(
-                        name=f"{emoji} {name}", value=str(doctrine_id)
-                    )
+                    app_commands.Choice(name=f"{emoji} {name}", value=str(doctrine_id))
                 )
 
     except Exception as e:
@@ -1310,6 +1304,7 @@ async def ideology_doctrines_autocomplete(
 
     return choices[:25]  # Discord limit
 
+
 async def continent_autocomplete(
     interaction: discord.Interaction,
     current: str,
@@ -0,0 +1,337 @@
+"""
+Opt-in SQL instrumentation shared by Database and AsyncDatabase.
+When enabled, connections are opened with a sqlite3.Connection subclass whose
+cursors time every statement (execute + the fetches that follow it) and count
+the rows returned, aggregated per normalized statement. Statements slower than
+a threshold are appended to a slow-query log. When disabled, plain sqlite3
+connections are used and nothing is measured.
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+def normalize_sql(sql: str) -> str:
+    """Statement key: collapsed whitespace, variable-length `(?, ?, ...)` lists folded."""
+    sql = _WHITESPACE.sub(" ", sql).strip()
+    return _PLACEHOLDER_LIST.sub("(?...)", sql)
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index] * 1000
+
+
+class _StatementStats:
+    __slots__ = ("count", "total", "max", "rows", "samples")
+
+    def __init__(self, history_size: int):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.samples = deque(maxlen=history_size)
+
+
+class SqlTracer:
+    """Per-statement latency/row statistics and slow-query log."""
+
+    def __init__(
+        self,
+        slow_threshold_ms: float = 100.0,
+        slow_log_path: str = "slow_queries.log",
+        history_size: int = 1000,
+    ):
+        self.slow_threshold_ms = slow_threshold_ms
+        self.slow_log_path = slow_log_path
+        self.history_size = history_size
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._slow_queries = 0
+        self._started_at = time.time()
+        self.connection_factory = self._make_connection_factory()
+
+    def record(self, sql: str, seconds: float, rows: int):
+        """Account one execution of `sql` (seconds spent, rows returned or changed)."""
+        key = normalize_sql(sql)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = _StatementStats(self.history_size)
+            stats.count += 1
+            stats.total += seconds
+            stats.max = max(stats.max, seconds)
+            stats.rows += rows
+            stats.samples.append(seconds)
+        if seconds * 1000 >= self.slow_threshold_ms:
+            self._log_slow_query(key, seconds, rows)
+
+    def record_fetch(self, sql: str, seconds: float, rows: int):
+        """Add rows fetched after an execution was recorded (totals only)."""
+        key = normalize_sql(sql)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is not None:
+                stats.total += seconds
+                stats.rows += rows
+
+    def _log_slow_query(self, sql: str, seconds: float, rows: int):
+        with self._lock:
+            self._slow_queries += 1
+        try:
+            with open(self.slow_log_path, "a", encoding="utf-8") as f:
+                f.write(
+                    f"{datetime.now(timezone.utc).isoformat()}\t{seconds * 1000:.1f} ms"
+                    f"\t{rows} rows\t[{threading.current_thread().name}]\t{sql}\n"
+                )
+        except OSError as e:
+            print(f"Error writing slow query log: {e}")
+
+    def get_top(self, n: int = 10, order_by: str = "total") -> list:
+        """The `n` heaviest statements, by "total", "count", "p95", "max" or "rows"."""
+        with self._lock:
+            snapshot = [
+                (
+                    sql,
+                    stats.count,
+                    stats.total,
+                    stats.max,
+                    stats.rows,
+                    sorted(stats.samples),
+                )
+                for sql, stats in self._stats.items()
+            ]
+        top = []
+        for sql, count, total, max_seconds, rows, samples in snapshot:
+            top.append(
+                {
+                    "sql": sql,
+                    "count": count,
+                    "total_ms": total * 1000,
+                    "avg_ms": total / count * 1000,
+                    "p50_ms": _percentile(samples, 50),
+                    "p95_ms": _percentile(samples, 95),
+                    "p99_ms": _percentile(samples, 99),
+                    "max_ms": max_seconds * 1000,
+                    "rows": rows,
+                }
+            )
+        sort_key = {
+            "total": "total_ms",
+            "count": "count",
+            "p95": "p95_ms",
+            "max": "max_ms",
+            "rows": "rows",
+        }.get(order_by, "total_ms")
+        top.sort(key=lambda entry: entry[sort_key], reverse=True)
+        return top[:n]
+
+    def get_summary(self) -> dict:
+        """Totals across every statement since the last reset."""
+        with self._lock:
+            return {
+                "statements": len(self._stats),
+                "executions": sum(s.count for s in self._stats.values()),
+                "total_ms": sum(s.total for s in self._stats.values()) * 1000,
+                "slow_queries": self._slow_queries,
+                "slow_threshold_ms": self.slow_threshold_ms,
+                "since": self._started_at,
+            }
+
+    def reset(self):
+        """Forget every statistic."""
+        with self._lock:
+            self._stats = {}
+            self._slow_queries = 0
+            self._started_at = time.time()
+
+    def _make_connection_factory(self):
+        tracer = self
+
+        class TracedCursor(sqlite3.Cursor):
+            """Cursor timing each statement and the fetches of its rows.
+
+            An execution is recorded once its first fetch returns (or at the
+            next execute/close), so single-row lookups and slow queries show
+            up immediately; rows fetched afterwards only add to the totals.
+            """
+
+            _pending = None
+            _sql = None
+
+            def _finish(self):
+                pending = self._pending
+                if pending is not None:
+                    self._pending = None
+                    tracer.record(*pending)
+
+            def _fetch(self, method, *args):
+                started = time.perf_counter()
+                result = method(*args)
+                seconds = time.perf_counter() - started
+                rows = len(result) if isinstance(result, list) else result is not None
+                if self._pending is not None:
+                    self._pending[1] += seconds
+                    self._pending[2] += rows
+                elif self._sql is not None:
+                    tracer.record_fetch(self._sql, seconds, rows)
+                return result
+
+            def _executed(self, sql, started, rows=None):
+                self._sql = sql
+                self._pending = [sql, time.perf_counter() - started, 0]
+                if rows is not None:
+                    # No result set: count the rows written
+                    self._pending[2] = max(rows, 0)
+                    self._finish()
+
+            def execute(self, sql, parameters=()):
+                self._finish()
+                started = time.perf_counter()
+                try:
+                    super().execute(sql, parameters)
+                except Exception:
+                    self._executed(sql, started, 0)
+                    raise
+                self._executed(
+                    sql, started, self.rowcount if self.description is None else None
+                )
+                return self
+
+            def executemany(self, sql, seq_of_parameters):
+                self._finish()
+                started = time.perf_counter()
+                try:
+                    super().executemany(sql, seq_of_parameters)
+                except Exception:
+                    self._executed(sql, started, 0)
+                    raise
+                self._executed(sql, started, self.rowcount)
+                return self
+
+            def fetchone(self):
+                row = self._fetch(super().fetchone)
+                self._finish()
+                return row
+
+            def fetchmany(self, size=None):
+                rows = self._fetch(
+                    super().fetchmany, self.arraysize if size is None else size
+                )
+                self._finish()
+                return rows
+
+            def fetchall(self):
+                rows = self._fetch(super().fetchall)
+                self._finish()
+                return rows
+
+            def __next__(self):
+                try:
+                    return self._fetch(super().__next__)
+                except StopIteration:
+                    self._finish()
+                    raise
+
+            def close(self):
+                self._finish()
+                super().close()
+
+            def __del__(self):
+                try:
+                    self._finish()
+                except Exception:
+                    pass
+
+        class TracedConnection(sqlite3.Connection):
+            """Connection whose cursors (and execute shortcuts) are traced."""
+
+            def cursor(self, factory=TracedCursor):
+                return super().cursor(factory)
+
+            # The C shortcuts create their cursor without calling cursor()
+            def execute(self, sql, parameters=()):
+                return self.cursor().execute(sql, parameters)
+
+            def executemany(self, sql, seq_of_parameters):
+                return self.cursor().executemany(sql, seq_of_parameters)
+
+        return TracedConnection
+
+
+# Discord rejects an embed whose title, description, fields and footer add up
+# to more than this many characters
+EMBED_MAX_LENGTH = 6000
+SQL_EXCERPT_LENGTH = 300
+# Below this, an excerpt no longer identifies the statement: the field is dropped
+SQL_EXCERPT_MIN_LENGTH = 60
+
+
+def format_stats_line(stat: dict) -> str:
+    """One-line summary of a get_top() entry."""
+    return (
+        f"{stat['count']}× · total {stat['total_ms']:.1f} ms · "
+        f"p50 {stat['p50_ms']:.2f} · p95 {stat['p95_ms']:.2f} · "
+        f"p99 {stat['p99_ms']:.2f} ms · {stat['rows']} lignes"
+    )
+
+
+def add_top_fields(embed, statements: list, reserve: int = 0) -> int:
+    """
+    Add one field per get_top() entry to a discord.Embed, keeping its total
+    length within EMBED_MAX_LENGTH minus `reserve` (room kept for a footer).
+    SQL excerpts are shortened once the budget runs low, and the remaining
+    statements are left out. Returns how many statements were added.
+    """
+    for index, stat in enumerate(statements, 1):
+        name = f"#{index}"
+        stats_line = format_stats_line(stat)
+        room = (
+            EMBED_MAX_LENGTH
+            - reserve
+            - len(embed)
+            - len(name)
+            - len(f"{stats_line}\n```sql\n\n```")
+        )
+        excerpt_length = min(SQL_EXCERPT_LENGTH, room)
+        if excerpt_length < min(SQL_EXCERPT_MIN_LENGTH, len(stat["sql"])):
+            return index - 1
+        sql = stat["sql"]
+        if len(sql) > excerpt_length:
+            sql = sql[: excerpt_length - 3] + "..."
+        embed.add_field(
+            name=name, value=f"{stats_line}\n```sql\n{sql}\n```", inline=False
+        )
+    return len(statements)
+
+
+# Process-wide tracer, None while tracing is disabled
+_tracer = None
+
+
+def enable_tracing(**kwargs) -> SqlTracer:
+    """Turn tracing on for connections opened from now on (see SqlTracer args)."""
+    global _tracer
+    if _tracer is None:
+        _tracer = SqlTracer(**kwargs)
+    return _tracer
+
+
+def get_tracer():
+    """The process-wide SqlTracer, or None if tracing is disabled."""
+    return _tracer
+
+
+def connect_kwargs(tracer=None) -> dict:
+    """Extra sqlite3.connect()/aiosqlite.connect() arguments for `tracer`."""
+    tracer = tracer or _tracer
+    return {"factory": tracer.connection_factory} if tracer else {}
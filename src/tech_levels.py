@@ -0,0 +1,115 @@
+"""
+In-memory country x domain matrix of technology levels.
+Factory capacity needs the owning country's level in the factory's domain
+(falling back to 'Global', then to 1) and the TechnologyBoosts coefficient of
+that level. CountryTechnologies is small, so it is loaded in one go with the
+fallbacks and the coefficients already resolved. The levels are edited from
+the admin panel: Database drops the snapshot on the settings data_version
+listener (and when the reference data is reloaded); the next lookup rebuilds it.
+"""
+
+import threading
+from types import MappingProxyType
+
+DOMAINS = ("Terrestre", "Aerospatial", "Maritime", "Global")
+
+# Structure/technology specialisation -> CountryTechnologies.tech_field
+SPECIALISATION_DOMAINS = {
+    "Terrestre": "Terrestre",
+    "Aerienne": "Aerospatial",
+    "Navale": "Maritime",
+}
+
+
+def domain_for(specialisation: str) -> str:
+    """Technology domain of a specialisation ('Global' for the others)."""
+    return SPECIALISATION_DOMAINS.get(specialisation, "Global")
+
+
+class TechLevelMatrix:
+    """Immutable snapshot: country_id -> domain -> level and boost coefficient."""
+
+    __slots__ = ("levels", "boosts")
+
+    def __init__(self, rows, tech_boosts):
+        fields = {}
+        for country_id, tech_field, level in rows:
+            fields.setdefault(country_id, {})[tech_field] = int(level)
+        levels, boosts = {}, {}
+        for country_id, known in fields.items():
+            fallback = known.get("Global", 1)
+            country_levels = {domain: known.get(domain, fallback) for domain in DOMAINS}
+            levels[country_id] = MappingProxyType(country_levels)
+            boosts[country_id] = MappingProxyType(
+                {
+                    domain: tech_boosts.get(level, 1.0)
+                    for domain, level in country_levels.items()
+                }
+            )
+        self.levels = MappingProxyType(levels)
+        self.boosts = MappingProxyType(boosts)
+
+
+class TechLevelCache:
+    """Lazily (re)built TechLevelMatrix."""
+
+    def __init__(self, fetch_all, tech_boosts, on_lookup=None):
+        # `tech_boosts()` returns the current level -> coefficient mapping;
+        # `on_lookup()` runs before each lookup (external change detection)
+        self._fetch_all = fetch_all
+        self._tech_boosts = tech_boosts
+        self._on_lookup = on_lookup
+        self._lock = threading.Lock()
+        self._matrix = None
+        self._generation = 0
+        self.reloads = 0
+
+    def invalidate(self):
+        """Forget the snapshot; the next lookup reloads CountryTechnologies."""
+        with self._lock:
+            self._generation += 1
+            self._matrix = None
+
+    def matrix(self) -> TechLevelMatrix:
+        """Current snapshot, loaded if needed."""
+        if self._on_lookup:
+            self._on_lookup()
+        matrix = self._matrix
+        if matrix is not None:
+            return matrix
+        with self._lock:
+            generation = self._generation
+        matrix = TechLevelMatrix(
+            self._fetch_all(
+                "SELECT country_id, tech_field, level FROM CountryTechnologies"
+            ),
+            self._tech_boosts(),
+        )
+        with self._lock:
+            # Built across an invalidation: serve it to this caller only
+            if generation == self._generation:
+                self._matrix = matrix
+                self.reloads += 1
+        return matrix
+
+    @staticmethod
+    def _key(country_id):
+        try:
+            return int(country_id)
+        except (TypeError, ValueError):
+            return None
+
+    def level(self, country_id, domain: str = "Global") -> int:
+        """Level of a country in `domain`, with the 'Global' then 1 fallbacks."""
+        levels = self.matrix().levels.get(self._key(country_id))
+        if not levels:
+            return 1
+        return levels.get(domain, levels["Global"])
+
+    def boost(self, country_id, domain: str = "Global") -> float:
+        """TechnologyBoosts coefficient of the country's level in `domain`."""
+        matrix = self.matrix()
+        boosts = matrix.boosts.get(self._key(country_id))
+        if not boosts:
+            return self._tech_boosts().get(1, 1.0)
+        return boosts.get(domain, boosts["Global"])